@@ -1,26 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
+import json
 import uuid
 
-from app.db.database import get_db
+from app.db.database import get_db, AsyncSessionLocal
 from app.db.models import QAHistory, Roadmap, User
 from app.schemas.chat import ChatRequest, ChatResponse, ChatHistoryResponse
 from app.core.security import get_current_user_id
-from app.services.ai_service import chat_response
+from app.services.admission import AdmissionTicket, ai_admission
+from app.services.ai_service import chat_response, stream_chat_response
 
 router = APIRouter()
 
 
-@router.post("/message", response_model=dict)
-async def send_message(
-    request: ChatRequest,
-    user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
-):
-    """Send a message to the AI assistant."""
-    
+async def _check_chat_quota(db: AsyncSession, user_id: str) -> User:
+    """Load the user and enforce the free tier daily message limit."""
     # Check user tier for chat limits
     user_result = await db.execute(select(User).where(User.id == user_id))
     user = user_result.scalar_one_or_none()
@@ -45,20 +43,59 @@ async def send_message(
                 detail="Free tier limited to 10 messages per day. Upgrade to Pro for unlimited."
             )
     
+    return user
+
+
+async def _get_roadmap_context(db: AsyncSession, user_id: str, roadmap_id: str = None) -> dict:
+    """Get roadmap context for the chat prompt if a roadmap was provided."""
+    if not roadmap_id:
+        return None
+    
+    roadmap_result = await db.execute(
+        select(Roadmap)
+        .where(Roadmap.id == roadmap_id, Roadmap.user_id == user_id)
+    )
+    roadmap = roadmap_result.scalar_one_or_none()
+    if not roadmap:
+        return None
+    
+    return {
+        "job_title": roadmap.job_title,
+        "completion_percentage": roadmap.completion_percentage,
+        "current_phase": "Active",
+    }
+
+
+async def _save_qa_entry(db: AsyncSession, user_id: str, request: ChatRequest, answer: str) -> QAHistory:
+    qa_entry = QAHistory(
+        user_id=user_id,
+        roadmap_id=request.roadmap_id if request.roadmap_id else None,
+        question=request.message,
+        answer=answer,
+    )
+    db.add(qa_entry)
+    await db.commit()
+    await db.refresh(qa_entry)
+    return qa_entry
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/message", response_model=dict, dependencies=[Depends(ai_admission)])
+async def send_message(
+    request: ChatRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Send a message to the AI assistant."""
+    
+    await _check_chat_quota(db, user_id)
+    
     # Get roadmap context if provided
-    roadmap_context = None
-    if request.roadmap_id:
-        roadmap_result = await db.execute(
-            select(Roadmap)
-            .where(Roadmap.id == request.roadmap_id, Roadmap.user_id == user_id)
-        )
-        roadmap = roadmap_result.scalar_one_or_none()
-        if roadmap:
-            roadmap_context = {
-                "job_title": roadmap.job_title,
-                "completion_percentage": roadmap.completion_percentage,
-                "current_phase": "Active",
-            }
+    roadmap_context = await _get_roadmap_context(db, user_id, request.roadmap_id)
     
     try:
         # Generate AI response
@@ -72,15 +109,7 @@ async def send_message(
         )
         
         # Save to history
-        qa_entry = QAHistory(
-            user_id=user_id,
-            roadmap_id=request.roadmap_id if request.roadmap_id else None,
-            question=request.message,
-            answer=response_text,
-        )
-        db.add(qa_entry)
-        await db.commit()
-        await db.refresh(qa_entry)
+        qa_entry = await _save_qa_entry(db, user_id, request, response_text)
         
         return {
             "success": True,
@@ -98,6 +127,63 @@ async def send_message(
         )
 
 
+@router.post("/message/stream")
+async def send_message_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_current_user_id),
+    admission: AdmissionTicket = Depends(ai_admission),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Send a message and stream the reply as server-sent events.
+
+    Emits `token` events as the model produces them and `done` with the saved
+    history entry once the reply is complete. If the client disconnects, the
+    stream is cancelled, the upstream completion is aborted and nothing is saved.
+    """
+    
+    await _check_chat_quota(db, user_id)
+    roadmap_context = await _get_roadmap_context(db, user_id, request.roadmap_id)
+    release_slot = admission.hold()
+    
+    async def event_stream():
+        tokens = []
+        try:
+            async for token in stream_chat_response(
+                message=request.message,
+                conversation_history=[
+                    {"role": msg.role, "content": msg.content}
+                    for msg in request.conversation_history
+                ],
+                roadmap_context=roadmap_context
+            ):
+                tokens.append(token)
+                yield _sse("token", {"content": token})
+            
+            response_text = "".join(tokens)
+            # The request-scoped session is closed once streaming starts
+            async with AsyncSessionLocal() as session:
+                qa_entry = await _save_qa_entry(session, user_id, request, response_text)
+            
+            yield _sse("done", {
+                "id": str(qa_entry.id),
+                "response": response_text,
+                "created_at": qa_entry.created_at.isoformat(),
+            })
+        except Exception as e:
+            yield _sse("error", {"detail": f"Failed to generate response: {str(e)}"})
+        finally:
+            release_slot()
+    
+    # The background task also releases the slot if the client leaves before streaming starts
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_slot),
+    )
+
+
 @router.get("/history", response_model=dict)
 async def get_chat_history(
     roadmap_id: str = None,
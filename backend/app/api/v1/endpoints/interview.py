@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
@@ -8,8 +8,12 @@ from datetime import datetime
 
 from app.db.database import get_db
 from app.core.security import get_current_user_id
+from app.services.admission import ai_admission
+from app.services.idempotency import idempotency_store
 from app.models.portfolio import InterviewSession
-from app.services.ai_service import generate_interview_questions, evaluate_interview_response
+from app.services.ai_service import evaluate_interview_response
+from app.services.interview_bank_service import get_session_questions
+from app.services.job_queue import job_queue, register_job
 
 router = APIRouter()
 
@@ -25,46 +29,55 @@ class SubmitResponseRequest(BaseModel):
     response: str
 
 
-@router.post("/start")
+@router.post("/start", dependencies=[Depends(ai_admission)])
 async def start_interview(
     request: StartInterviewRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Start a new interview simulation session"""
+    """Start a new interview simulation session (retries with the same Idempotency-Key reuse it)"""
     print(f"🎙️ Starting {request.session_type} interview for {request.target_role}")
     
-    # Generate interview questions using AI
-    questions = await generate_interview_questions(
-        session_type=request.session_type,
-        target_role=request.target_role,
-        difficulty=request.difficulty
-    )
+    async def start() -> dict:
+        # Sample from the question bank (live AI generation only for cold buckets)
+        questions = await get_session_questions(
+            db,
+            user_id,
+            session_type=request.session_type,
+            target_role=request.target_role,
+            difficulty=request.difficulty
+        )
+        
+        # Create interview session
+        session = InterviewSession(
+            user_id=uuid.UUID(user_id),
+            session_type=request.session_type,
+            target_role=request.target_role,
+            difficulty=request.difficulty,
+            questions=questions,
+            status="in_progress"
+        )
+        
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+        
+        print(f"✅ Interview session created: {session.id}")
+        
+        return {
+            "success": True,
+            "data": {
+                "session_id": str(session.id),
+                "questions": questions,
+                "duration_minutes": session.duration_minutes,
+            }
+        }
     
-    # Create interview session
-    session = InterviewSession(
-        user_id=uuid.UUID(user_id),
-        session_type=request.session_type,
-        target_role=request.target_role,
-        difficulty=request.difficulty,
-        questions=questions,
-        status="in_progress"
+    return await idempotency_store.run(
+        user_id, "interview.start", idempotency_key, request.model_dump(), response, start,
     )
-    
-    db.add(session)
-    await db.commit()
-    await db.refresh(session)
-    
-    print(f"✅ Interview session created: {session.id}")
-    
-    return {
-        "success": True,
-        "data": {
-            "session_id": str(session.id),
-            "questions": questions,
-            "duration_minutes": session.duration_minutes,
-        }
-    }
 
 
 @router.post("/{session_id}/submit")
@@ -107,13 +120,8 @@ async def submit_response(
     }
 
 
-@router.post("/{session_id}/complete")
-async def complete_interview(
-    session_id: str,
-    user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
-):
-    """Complete interview and get AI evaluation"""
+async def _evaluate_session(db: AsyncSession, user_id: str, session_id: str) -> dict:
+    """Run the AI evaluation for a session and store the results"""
     result = await db.execute(
         select(InterviewSession).where(
             InterviewSession.id == uuid.UUID(session_id),
@@ -151,13 +159,38 @@ async def complete_interview(
     print(f"✅ Interview evaluated. Score: {session.overall_score}/100")
     
     return {
-        "success": True,
-        "data": {
-            "overall_score": session.overall_score,
-            "feedback": session.feedback,
-            "strengths": session.strengths,
-            "improvements": session.improvements,
+        "overall_score": session.overall_score,
+        "feedback": session.feedback,
+        "strengths": session.strengths,
+        "improvements": session.improvements,
+    }
+
+
+@register_job("interview.evaluate")
+async def _run_evaluation_job(db: AsyncSession, user_id: str, payload: dict) -> dict:
+    return await _evaluate_session(db, user_id, payload["session_id"])
+
+
+@router.post("/{session_id}/complete", dependencies=[Depends(ai_admission)])
+async def complete_interview(
+    session_id: str,
+    response: Response,
+    background: bool = False,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Complete interview and get AI evaluation (queued as a job with ?background=true)"""
+    if background:
+        job = await job_queue.enqueue(db, user_id, "interview.evaluate", {"session_id": session_id})
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "success": True,
+            "data": {"job_id": str(job.id), "status": job.status}
         }
+    
+    return {
+        "success": True,
+        "data": await _evaluate_session(db, user_id, session_id)
     }
 
 
@@ -4,6 +4,7 @@ from typing import List, Dict
 from collections import Counter
 import re
 from app.core.security import get_current_user_id
+from app.services.skill_matcher import SkillMatcher
 
 router = APIRouter()
 
@@ -29,48 +30,49 @@ class JDAnalysisResponse(BaseModel):
     salary_insights: List[Dict[str, str]]
 
 
+# Common technical skills database
+JD_SKILLS = [
+    # Programming Languages
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP",
+    "Swift", "Kotlin", "Scala", "R", "MATLAB", "SQL",
+
+    # Frontend
+    "React", "Vue", "Angular", "Next.js", "Nuxt", "Svelte", "HTML", "CSS", "Tailwind",
+    "Bootstrap", "Material-UI", "Redux", "MobX", "jQuery",
+
+    # Backend
+    "Node.js", "Express", "FastAPI", "Django", "Flask", "Spring Boot", "ASP.NET",
+    "Ruby on Rails", "Laravel", "NestJS",
+
+    # Databases
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "DynamoDB",
+    "Cassandra", "Oracle", "SQL Server", "SQLite",
+
+    # Cloud & DevOps
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
+    "Terraform", "Ansible", "CircleCI", "Travis CI",
+
+    # Data & ML
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Spark", "Hadoop",
+    "Kafka", "Airflow", "MLflow",
+
+    # Tools & Others
+    "Git", "Linux", "REST API", "GraphQL", "gRPC", "WebSocket", "OAuth", "JWT",
+    "Microservices", "CI/CD", "Agile", "Scrum", "TDD", "Unit Testing",
+]
+
+# Compiled once; matches on word boundaries that keep "C++", "C#" and "Node.js" intact
+_jd_skill_matcher = SkillMatcher((skill, skill) for skill in JD_SKILLS)
+
+
 def extract_skills_from_jd(jd_text: str) -> List[str]:
     """Extract technical skills from job description."""
     
-    # Common technical skills database
-    skill_patterns = {
-        # Programming Languages
-        "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP",
-        "Swift", "Kotlin", "Scala", "R", "MATLAB", "SQL",
-        
-        # Frontend
-        "React", "Vue", "Angular", "Next.js", "Nuxt", "Svelte", "HTML", "CSS", "Tailwind",
-        "Bootstrap", "Material-UI", "Redux", "MobX", "jQuery",
-        
-        # Backend
-        "Node.js", "Express", "FastAPI", "Django", "Flask", "Spring Boot", "ASP.NET",
-        "Ruby on Rails", "Laravel", "NestJS",
-        
-        # Databases
-        "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "DynamoDB",
-        "Cassandra", "Oracle", "SQL Server", "SQLite",
-        
-        # Cloud & DevOps
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "GitLab CI", "GitHub Actions",
-        "Terraform", "Ansible", "CircleCI", "Travis CI",
-        
-        # Data & ML
-        "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Spark", "Hadoop",
-        "Kafka", "Airflow", "MLflow",
-        
-        # Tools & Others
-        "Git", "Linux", "REST API", "GraphQL", "gRPC", "WebSocket", "OAuth", "JWT",
-        "Microservices", "CI/CD", "Agile", "Scrum", "TDD", "Unit Testing",
-    }
-    
+    # Single pass over the text; the longest overlapping name wins ("SQL Server" over "SQL")
     found_skills = []
-    jd_lower = jd_text.lower()
-    
-    for skill in skill_patterns:
-        # Case-insensitive search with word boundaries
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, jd_lower):
-            found_skills.append(skill)
+    for match in _jd_skill_matcher.find_all(jd_text):
+        if match.value not in found_skills:
+            found_skills.append(match.value)
     
     return found_skills
 
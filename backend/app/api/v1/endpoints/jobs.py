@@ -0,0 +1,67 @@
+"""
+Background Job API Endpoints
+Status and results for queued long-running AI work
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+import uuid
+
+from app.db.database import get_db
+from app.core.security import get_current_user_id
+from app.models.jobs import BackgroundJob
+from app.services.job_queue import serialize_job
+
+router = APIRouter()
+
+
+@router.get("", response_model=dict)
+async def list_jobs(
+    limit: int = 20,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Most recent jobs for the current user"""
+    result = await db.execute(
+        select(BackgroundJob)
+        .where(BackgroundJob.user_id == uuid.UUID(user_id))
+        .order_by(BackgroundJob.created_at.desc())
+        .limit(min(limit, 100))
+    )
+    return {
+        "success": True,
+        "data": [serialize_job(job) for job in result.scalars().all()]
+    }
+
+
+@router.get("/{job_id}", response_model=dict)
+async def get_job(
+    job_id: str,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Job status, plus the result once it has succeeded or the error if it failed"""
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    
+    result = await db.execute(
+        select(BackgroundJob).where(
+            BackgroundJob.id == job_uuid,
+            BackgroundJob.user_id == uuid.UUID(user_id)
+        )
+    )
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return {
+        "success": True,
+        "data": serialize_job(job)
+    }
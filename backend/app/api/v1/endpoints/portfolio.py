@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
@@ -6,20 +6,18 @@ import uuid
 
 from app.db.database import get_db
 from app.core.security import get_current_user_id
+from app.services.admission import ai_admission
+from app.services.idempotency import idempotency_store
 from app.models.portfolio import Portfolio
 from app.db.models import Roadmap, User
 from app.services.ai_service import generate_portfolio_content
+from app.services.job_queue import job_queue, register_job
 
 router = APIRouter()
 
 
-@router.post("/generate")
-async def generate_portfolio(
-    roadmap_id: Optional[str] = None,
-    user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
-):
-    """Generate a portfolio from roadmap progress"""
+async def _create_portfolio(db: AsyncSession, user_id: str, roadmap_id: Optional[str]) -> dict:
+    """Generate and persist a portfolio from the given (or most recent) roadmap"""
     print(f"📁 Generating portfolio for user: {user_id}")
     
     # Get user info
@@ -82,21 +80,53 @@ async def generate_portfolio(
     print(f"✅ Portfolio created: {new_portfolio.id}")
     
     return {
-        "success": True,
-        "data": {
-            "id": str(new_portfolio.id),
-            "title": new_portfolio.title,
-            "tagline": new_portfolio.tagline,
-            "bio": new_portfolio.bio,
-            "resume_bullets": new_portfolio.resume_bullets,
-            "linkedin_posts": new_portfolio.linkedin_posts,
-            "projects": new_portfolio.projects,
-            "certificates": new_portfolio.certificates,
-            "is_published": new_portfolio.is_published,
-        }
+        "id": str(new_portfolio.id),
+        "title": new_portfolio.title,
+        "tagline": new_portfolio.tagline,
+        "bio": new_portfolio.bio,
+        "resume_bullets": new_portfolio.resume_bullets,
+        "linkedin_posts": new_portfolio.linkedin_posts,
+        "projects": new_portfolio.projects,
+        "certificates": new_portfolio.certificates,
+        "is_published": new_portfolio.is_published,
     }
 
 
+@register_job("portfolio.generate")
+async def _run_portfolio_job(db: AsyncSession, user_id: str, payload: dict) -> dict:
+    return await _create_portfolio(db, user_id, payload.get("roadmap_id"))
+
+
+@router.post("/generate", dependencies=[Depends(ai_admission)])
+async def generate_portfolio(
+    response: Response,
+    roadmap_id: Optional[str] = None,
+    background: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate a portfolio from roadmap progress (queued as a job with ?background=true)"""
+    async def generate() -> dict:
+        if background:
+            job = await job_queue.enqueue(db, user_id, "portfolio.generate", {"roadmap_id": roadmap_id})
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {
+                "success": True,
+                "data": {"job_id": str(job.id), "status": job.status}
+            }
+        
+        return {
+            "success": True,
+            "data": await _create_portfolio(db, user_id, roadmap_id)
+        }
+    
+    return await idempotency_store.run(
+        user_id, "portfolio.generate", idempotency_key,
+        {"roadmap_id": roadmap_id, "background": background}, response, generate,
+    )
+
+
 @router.get("/{portfolio_id}")
 async def get_portfolio(
     portfolio_id: str,
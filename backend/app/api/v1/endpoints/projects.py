@@ -1,5 +1,5 @@
 """AI Project Generator API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
@@ -9,6 +9,8 @@ from datetime import datetime
 
 from app.db.database import get_db
 from app.core.security import get_current_user_id
+from app.services.admission import ai_admission
+from app.services.idempotency import idempotency_store
 from app.db.models_extended import GeneratedProject
 from app.services.project_generator_service import (
     generate_project_idea,
@@ -17,6 +19,7 @@ from app.services.project_generator_service import (
     review_project_code,
     suggest_project_improvements,
 )
+from app.services.job_queue import job_queue, register_job
 
 router = APIRouter()
 
@@ -55,55 +58,81 @@ class UpdateProjectRequest(BaseModel):
     github_url: Optional[str] = None
 
 
-@router.post("/generate", response_model=dict)
+async def _create_project(db: AsyncSession, user_id: str, request: GenerateProjectRequest) -> dict:
+    """Generate a project idea and save it for the user."""
+    project_data = await generate_project_idea(
+        request.skills,
+        request.difficulty,
+        request.interests,
+        request.time_available
+    )
+    
+    user_uuid = uuid.UUID(user_id)
+    roadmap_uuid = uuid.UUID(request.roadmap_id) if request.roadmap_id else None
+    
+    # Save to database
+    project = GeneratedProject(
+        user_id=user_uuid,
+        roadmap_id=roadmap_uuid,
+        title=project_data["title"],
+        description=project_data["description"],
+        difficulty=project_data["difficulty"],
+        tech_stack=project_data["tech_stack"],
+        requirements=project_data["requirements"],
+        implementation_guide=project_data["implementation_steps"],
+        test_cases=project_data.get("test_cases", []),
+        status="not_started",
+    )
+    
+    db.add(project)
+    await db.commit()
+    await db.refresh(project)
+    
+    return {
+        "id": str(project.id),
+        **project_data
+    }
+
+
+@register_job("project.generate")
+async def _run_project_job(db: AsyncSession, user_id: str, payload: dict) -> dict:
+    return await _create_project(db, user_id, GenerateProjectRequest(**payload))
+
+
+@router.post("/generate", response_model=dict, dependencies=[Depends(ai_admission)])
 async def generate_project(
     request: GenerateProjectRequest,
+    response: Response,
+    background: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate a custom project idea."""
-    try:
-        # Generate project
-        project_data = await generate_project_idea(
-            request.skills,
-            request.difficulty,
-            request.interests,
-            request.time_available
-        )
-        
-        user_uuid = uuid.UUID(user_id)
-        roadmap_uuid = uuid.UUID(request.roadmap_id) if request.roadmap_id else None
-        
-        # Save to database
-        project = GeneratedProject(
-            user_id=user_uuid,
-            roadmap_id=roadmap_uuid,
-            title=project_data["title"],
-            description=project_data["description"],
-            difficulty=project_data["difficulty"],
-            tech_stack=project_data["tech_stack"],
-            requirements=project_data["requirements"],
-            implementation_guide=project_data["implementation_steps"],
-            test_cases=project_data.get("test_cases", []),
-            status="not_started",
-        )
-        
-        db.add(project)
-        await db.commit()
-        await db.refresh(project)
+    """Generate a custom project idea (queued as a job with ?background=true)."""
+    async def generate() -> dict:
+        if background:
+            job = await job_queue.enqueue(db, user_id, "project.generate", request.model_dump())
+            response.status_code = 202
+            return {
+                "success": True,
+                "data": {"job_id": str(job.id), "status": job.status}
+            }
         
-        return {
-            "success": True,
-            "data": {
-                "id": str(project.id),
-                **project_data
+        try:
+            return {
+                "success": True,
+                "data": await _create_project(db, user_id, request)
             }
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await idempotency_store.run(
+        user_id, "project.generate", idempotency_key,
+        {**request.model_dump(), "background": background}, response, generate,
+    )
 
 
-@router.post("/implementation-guide", response_model=dict)
+@router.post("/implementation-guide", response_model=dict, dependencies=[Depends(ai_admission)])
 async def get_implementation_guide(
     request: ImplementationGuideRequest,
     user_id: str = Depends(get_current_user_id),
@@ -124,7 +153,7 @@ async def get_implementation_guide(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/generate-tests", response_model=dict)
+@router.post("/generate-tests", response_model=dict, dependencies=[Depends(ai_admission)])
 async def generate_tests(
     request: GenerateTestsRequest,
     user_id: str = Depends(get_current_user_id),
@@ -145,7 +174,7 @@ async def generate_tests(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/review-code", response_model=dict)
+@router.post("/review-code", response_model=dict, dependencies=[Depends(ai_admission)])
 async def review_code(
     request: ReviewCodeRequest,
     user_id: str = Depends(get_current_user_id),
@@ -166,7 +195,7 @@ async def review_code(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/suggest-improvements", response_model=dict)
+@router.post("/suggest-improvements", response_model=dict, dependencies=[Depends(ai_admission)])
 async def suggest_improvements(
     request: SuggestImprovementsRequest,
     user_id: str = Depends(get_current_user_id),
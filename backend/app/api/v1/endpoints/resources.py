@@ -5,28 +5,25 @@ Resource discovery, health checking, and broken link reporting
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional
 from pydantic import BaseModel
-from datetime import datetime
 import uuid
 
 from app.db.database import get_db
-from app.core.security import get_current_user_id
+from app.core.security import get_current_user_id, get_current_admin_user_id
 from app.services.resource_service_v2 import (
     get_resources_for_skill,
     get_official_doc,
     get_skill_category,
-    mark_resource_unhealthy,
     get_resource_health,
-    VERIFIED_RESOURCES,
+    get_catalog,
     OFFICIAL_DOCS,
 )
+from app.services.resource_reports import count_reports, list_reports, submit_report
+from app.services.resource_search import resource_search_index
 
 router = APIRouter()
 
-# In-memory storage for reports (in production, use database)
-_resource_reports: List[dict] = []
-
 
 class ResourceReportRequest(BaseModel):
     resource_id: str
@@ -91,7 +88,7 @@ async def list_resource_categories(
     """List all available resource categories"""
     
     categories = []
-    for category, resources in VERIFIED_RESOURCES.items():
+    for category, resources in get_catalog().resources_by_category.items():
         categories.append({
             "id": category,
             "name": category.replace("_", " ").title(),
@@ -135,32 +132,30 @@ async def report_broken_resource(
 ):
     """Report a broken or outdated resource"""
     
-    report = {
-        "id": str(uuid.uuid4()),
-        "resource_id": request.resource_id,
-        "resource_url": request.resource_url,
-        "report_type": request.report_type,
-        "description": request.description,
-        "suggested_replacement_url": request.suggested_replacement_url,
-        "user_id": user_id,
-        "status": "pending",
-        "created_at": datetime.utcnow().isoformat(),
-    }
-    
-    _resource_reports.append(report)
-    
-    # Mark resource as potentially unhealthy
-    if request.report_type == "broken_link":
-        mark_resource_unhealthy(
-            request.resource_id,
-            f"User reported: {request.description or 'Broken link'}"
-        )
+    try:
+        uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+    
+    # Stored and counted per resource; demoted to its fallback after enough distinct reporters
+    submitted = await submit_report(
+        db,
+        user_id,
+        request.resource_id,
+        request.resource_url,
+        request.report_type,
+        description=request.description,
+        suggested_replacement_url=request.suggested_replacement_url,
+    )
+    if submitted is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    report, _ = submitted
     
     return {
         "success": True,
         "message": "Thank you for reporting this issue. We'll review it shortly.",
         "data": {
-            "report_id": report["id"],
+            "report_id": str(report.id),
         }
     }
 
@@ -186,21 +181,25 @@ async def check_resource_health(
 @router.get("/reports", response_model=dict)
 async def list_resource_reports(
     status: Optional[str] = None,
-    user_id: str = Depends(get_current_user_id),
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    user_id: str = Depends(get_current_admin_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    """List resource reports (admin only in production)"""
-    
-    reports = _resource_reports
+    """List resource reports, newest first; pass next_cursor back for the next page (admin only)"""
     
-    if status:
-        reports = [r for r in reports if r.get("status") == status]
+    try:
+        reports, next_cursor = await list_reports(db, status, max(1, min(limit, 100)), cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
     return {
         "success": True,
         "data": {
-            "reports": reports[-50:],  # Last 50 reports
-            "total_count": len(reports),
-            "pending_count": len([r for r in _resource_reports if r.get("status") == "pending"]),
+            "reports": reports,
+            "next_cursor": next_cursor,
+            "total_count": await count_reports(db, status),
+            "pending_count": await count_reports(db, "pending"),
         }
     }
 
@@ -225,32 +224,20 @@ async def search_resources(
     except:
         user_tier = "free"
     
-    query_lower = query.lower()
+    # Ranked, tier-filtered matches from the search index
+    matches = resource_search_index.search(query, user_tier)
     results = []
-    
-    # Search through all resources
-    for category, resources in VERIFIED_RESOURCES.items():
-        for resource in resources:
-            # Check if query matches title, provider, or category
-            if (query_lower in resource.get("title", "").lower() or
-                query_lower in resource.get("provider", "").lower() or
-                query_lower in category.lower()):
-                
-                # Check tier access
-                tier_order = {"free": 0, "standard": 1, "premium": 2}
-                if tier_order.get(resource.get("tier_required", "free"), 0) <= tier_order.get(user_tier, 0):
-                    result = resource.copy()
-                    result["category"] = category
-                    results.append(result)
-    
-    # Sort by quality score
-    results.sort(key=lambda x: x.get("quality_score", 0), reverse=True)
+    for score, resource, category in matches[:20]:
+        result = dict(resource)
+        result["category"] = category
+        result["score"] = round(score, 4)
+        results.append(result)
     
     return {
         "success": True,
         "data": {
             "query": query,
-            "results": results[:20],  # Top 20 results
-            "total_count": len(results),
+            "results": results,  # Top 20 results
+            "total_count": len(matches),
         }
     }
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import Callable, List, Optional
 from datetime import datetime
+import asyncio
+import json
 import uuid
 
-from app.db.database import get_db
+from app.db.database import get_db, AsyncSessionLocal
 from app.db.models import Roadmap, Progress, User
 from app.schemas.roadmap import (
     RoadmapGenerateRequest,
@@ -16,22 +20,26 @@ from app.schemas.roadmap import (
     TimeLogRequest,
 )
 from app.core.security import get_current_user_id
-from app.services.ai_service import generate_roadmap
+from app.services.admission import AdmissionTicket, ai_admission
+from app.services.idempotency import idempotency_store
+from app.services.ai_service import generate_roadmap, stream_roadmap
 from app.services.resource_service_v2 import enrich_roadmap_with_resources, get_resources_for_skill
+from app.services.roadmap_cache import roadmap_cache, reassign_roadmap_ids
+from app.services.roadmap_detail_cache import roadmap_detail_cache, progress_version
+from app.services.jd_similarity import jd_similarity_index
+from app.services.llm_telemetry import llm_telemetry
+from app.services.job_queue import job_queue, register_job
+from app.services.local_roadmap_service import build_local_roadmap
+from app.core.config import settings
 
 router = APIRouter()
 
+# Background upgrades of locally built roadmaps (kept referenced until done)
+_upgrade_tasks: set = set()
 
-@router.post("/generate", response_model=dict)
-async def create_roadmap(
-    request: RoadmapGenerateRequest,
-    user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
-):
-    """Generate a new learning roadmap from a job description."""
-    print(f"🎯 Roadmap generation started for user: {user_id}")
-    print(f"📝 Request: job_description length={len(request.job_description)}, skill_level={request.skill_level}, industry={request.industry}")
-    
+
+async def _load_user_with_quota(db: AsyncSession, user_id: str) -> User:
+    """Load the requesting user and enforce the free tier roadmap limit."""
     # Convert user_id string to UUID
     try:
         user_uuid = uuid.UUID(user_id)
@@ -59,67 +67,330 @@ async def create_roadmap(
                 detail=f"Free tier limited to 10 roadmaps. You have {len(existing_roadmaps)}. Delete old roadmaps or upgrade to Pro."
             )
     
+    return user
+
+
+async def _clone_near_duplicate(db: AsyncSession, request: RoadmapGenerateRequest) -> Optional[dict]:
+    """Reuse an existing roadmap generated from a near-identical job description at the same skill level."""
+    if not settings.ROADMAP_DEDUP_ENABLED:
+        return None
+    
+    match = await jd_similarity_index.query(request.job_description, request.skill_level)
+    llm_telemetry.record_cache("roadmap_near_duplicate", hit=bool(match))
+    if not match:
+        return None
+    
+    roadmap_id, similarity = match
+    result = await db.execute(select(Roadmap).where(Roadmap.id == uuid.UUID(roadmap_id)))
+    source = result.scalar_one_or_none()
+    if not source or not source.phases or source.generation not in (None, "llm"):
+        jd_similarity_index.remove(roadmap_id)
+        return None
+    
+    print(f"♻️ Reusing roadmap {roadmap_id} (similarity {similarity:.2f}) instead of calling the LLM")
+    return reassign_roadmap_ids({
+        "job_title": source.job_title,
+        "industry": source.industry,
+        "estimated_weeks": source.estimated_weeks,
+        "phases": source.phases,
+        "projects": source.projects or [],
+    })
+
+
+async def _save_roadmap(
+    db: AsyncSession,
+    user_id: str,
+    request: RoadmapGenerateRequest,
+    ai_result: dict,
+    generation: str = "llm"
+) -> Roadmap:
+    """
+    Persist a generated roadmap and initialize progress for all skills.
+
+    Only LLM roadmaps (`generation="llm"`, clones of them included) are added
+    to the near-duplicate index; rule-based "local" ones never become clone sources.
+    """
+    new_roadmap = Roadmap(
+        user_id=user_id,
+        job_title=ai_result.get("job_title", "Untitled Role"),
+        job_description=request.job_description,
+        industry=ai_result.get("industry", request.industry),
+        skill_level=request.skill_level,
+        estimated_weeks=ai_result.get("estimated_weeks"),
+        phases=ai_result.get("phases", []),
+        projects=ai_result.get("projects", []),
+        status="active",
+        generation=generation,
+    )
+    
+    db.add(new_roadmap)
+    await db.commit()
+    await db.refresh(new_roadmap)
+    
+    # Initialize progress for all skills
+    for phase in ai_result.get("phases", []):
+        for skill in phase.get("skills", []):
+            progress = Progress(
+                roadmap_id=new_roadmap.id,
+                skill_id=skill["id"],
+                skill_name=skill["name"],
+                status="not_started",
+            )
+            db.add(progress)
+    
+    await db.commit()
+    
+    if generation == "llm" and settings.ROADMAP_DEDUP_ENABLED:
+        await jd_similarity_index.add(str(new_roadmap.id), request.job_description, request.skill_level)
+    
+    return new_roadmap
+
+
+async def _upgrade_local_roadmap(roadmap_id: uuid.UUID, request: RoadmapGenerateRequest, llm_task: asyncio.Task) -> None:
+    """Replace a locally built roadmap with the LLM result once it lands."""
     try:
-        print(f"🎯 Starting AI roadmap generation...")
-        # Generate roadmap using AI with timeout protection
-        ai_result = await generate_roadmap(
-            job_description=request.job_description,
-            skill_level=request.skill_level,
-            industry=request.industry
-        )
-        print(f"✅ AI generation complete!")
+        ai_result = await llm_task
+    except Exception as e:
+        print(f"⚠ LLM roadmap for {roadmap_id} failed, keeping the local roadmap: {e}")
+        return
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Roadmap).where(Roadmap.id == roadmap_id))
+        roadmap = result.scalar_one_or_none()
+        if not roadmap:
+            return
         
-        # Create roadmap in database
-        new_roadmap = Roadmap(
-            user_id=user_id,
-            job_title=ai_result.get("job_title", "Untitled Role"),
-            job_description=request.job_description,
-            industry=ai_result.get("industry", request.industry),
-            skill_level=request.skill_level,
-            estimated_weeks=ai_result.get("estimated_weeks"),
-            phases=ai_result.get("phases", []),
-            projects=ai_result.get("projects", []),
-            status="active",
-        )
+        progress_result = await session.execute(select(Progress).where(Progress.roadmap_id == roadmap_id))
+        progress_rows = progress_result.scalars().all()
+        if any(p.status != "not_started" for p in progress_rows):
+            print(f"⚠ User already started roadmap {roadmap_id}, not replacing it with the LLM version")
+            return
         
-        db.add(new_roadmap)
-        await db.commit()
-        await db.refresh(new_roadmap)
+        roadmap.job_title = ai_result.get("job_title", roadmap.job_title)
+        roadmap.industry = ai_result.get("industry", roadmap.industry)
+        roadmap.estimated_weeks = ai_result.get("estimated_weeks")
+        roadmap.phases = ai_result.get("phases", [])
+        roadmap.projects = ai_result.get("projects", [])
+        roadmap.generation = "llm"
         
-        # Initialize progress for all skills
-        for phase in ai_result.get("phases", []):
+        # Skill IDs changed, so progress rows are recreated
+        for row in progress_rows:
+            await session.delete(row)
+        for phase in roadmap.phases:
             for skill in phase.get("skills", []):
-                progress = Progress(
-                    roadmap_id=new_roadmap.id,
+                session.add(Progress(
+                    roadmap_id=roadmap.id,
                     skill_id=skill["id"],
                     skill_name=skill["name"],
                     status="not_started",
-                )
-                db.add(progress)
+                ))
         
-        await db.commit()
+        await session.commit()
+    
+    roadmap_detail_cache.invalidate(roadmap_id)
+    if settings.ROADMAP_DEDUP_ENABLED:
+        await jd_similarity_index.add(str(roadmap_id), request.job_description, request.skill_level)
+    print(f"⬆️ Upgraded roadmap {roadmap_id} with the LLM version")
+
+
+def _schedule(coro, on_done: Optional[Callable[[], None]] = None) -> None:
+    task = asyncio.create_task(coro)
+    _upgrade_tasks.add(task)
+    task.add_done_callback(_upgrade_tasks.discard)
+    if on_done is not None:
+        task.add_done_callback(lambda _: on_done())
+
+
+def _new_roadmap_data(roadmap: Roadmap) -> dict:
+    return {
+        "id": str(roadmap.id),
+        "job_title": roadmap.job_title,
+        "industry": roadmap.industry,
+        "skill_level": roadmap.skill_level,
+        "estimated_weeks": roadmap.estimated_weeks,
+        "phases": roadmap.phases,
+        "projects": roadmap.projects,
+        "completion_percentage": 0,
+        "status": roadmap.status,
+        "generated_at": roadmap.generated_at.isoformat(),
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _generate_and_save(
+    db: AsyncSession,
+    user_id: str,
+    request: RoadmapGenerateRequest,
+    allow_fallback: bool = True,
+    admission: Optional[AdmissionTicket] = None,
+) -> dict:
+    """
+    Clone a near-duplicate or generate a new roadmap, then persist it.
+
+    With the local fallback enabled, the LLM gets ROADMAP_LLM_LATENCY_BUDGET_SECONDS.
+    If it is slower (or fails), a rule-based roadmap is saved and returned at
+    once, and the LLM result replaces it in the background when it arrives.
+    The request's admission slot stays held until that background upgrade ends,
+    so upgrades count against AI capacity like any other request.
+    """
+    ai_result = await _clone_near_duplicate(db, request)
+    if ai_result is not None:
+        new_roadmap = await _save_roadmap(db, user_id, request, ai_result)
+        return _new_roadmap_data(new_roadmap)
+    
+    print(f"🎯 Starting AI roadmap generation...")
+    llm_task = asyncio.create_task(generate_roadmap(
+        job_description=request.job_description,
+        skill_level=request.skill_level,
+        industry=request.industry
+    ))
+    
+    if allow_fallback and settings.ROADMAP_LOCAL_FALLBACK_ENABLED:
+        await asyncio.wait({llm_task}, timeout=settings.ROADMAP_LLM_LATENCY_BUDGET_SECONDS)
+        if not llm_task.done():
+            reason = "missed latency budget"
+        elif llm_task.cancelled():
+            reason = "was cancelled"
+        elif llm_task.exception() is not None:
+            reason = f"failed: {llm_task.exception()}"
+        else:
+            reason = None
+        if reason is not None:
+            print(f"⏱️ LLM {reason}, serving local roadmap")
+            local_result = build_local_roadmap(request.job_description, request.skill_level, request.industry)
+            new_roadmap = await _save_roadmap(db, user_id, request, local_result, generation="local")
+            if not llm_task.done():
+                release_slot = admission.hold() if admission is not None else None
+                _schedule(_upgrade_local_roadmap(new_roadmap.id, request, llm_task), on_done=release_slot)
+            return {
+                **_new_roadmap_data(new_roadmap),
+                "generation": "local",
+                "upgrade_pending": not llm_task.done(),
+            }
+    
+    ai_result = await llm_task
+    print(f"✅ AI generation complete!")
+    new_roadmap = await _save_roadmap(db, user_id, request, ai_result)
+    return {**_new_roadmap_data(new_roadmap), "generation": "llm", "upgrade_pending": False}
+
+
+@register_job("roadmap.generate")
+async def _run_roadmap_job(db: AsyncSession, user_id: str, payload: dict) -> dict:
+    request = RoadmapGenerateRequest(**payload)
+    await _load_user_with_quota(db, user_id)
+    # The caller is polling anyway, so wait for the full LLM roadmap
+    return await _generate_and_save(db, user_id, request, allow_fallback=False)
+
+
+@router.post("/generate", response_model=dict)
+async def create_roadmap(
+    request: RoadmapGenerateRequest,
+    response: Response,
+    background: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user_id: str = Depends(get_current_user_id),
+    admission: AdmissionTicket = Depends(ai_admission),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate a new learning roadmap from a job description.
+
+    With `?background=true` the work is queued and a job ID is returned
+    immediately (202); poll GET /jobs/{job_id} for the roadmap. Retries sent
+    with the same `Idempotency-Key` header get the original response.
+    """
+    print(f"🎯 Roadmap generation started for user: {user_id}")
+    print(f"📝 Request: job_description length={len(request.job_description)}, skill_level={request.skill_level}, industry={request.industry}")
+    
+    async def generate() -> dict:
+        await _load_user_with_quota(db, user_id)
         
-        return {
-            "success": True,
-            "data": {
-                "id": str(new_roadmap.id),
-                "job_title": new_roadmap.job_title,
-                "industry": new_roadmap.industry,
-                "skill_level": new_roadmap.skill_level,
-                "estimated_weeks": new_roadmap.estimated_weeks,
-                "phases": new_roadmap.phases,
-                "projects": new_roadmap.projects,
-                "completion_percentage": 0,
-                "status": new_roadmap.status,
-                "generated_at": new_roadmap.generated_at.isoformat(),
+        if background:
+            job = await job_queue.enqueue(db, user_id, "roadmap.generate", request.model_dump())
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {
+                "success": True,
+                "data": {"job_id": str(job.id), "status": job.status}
             }
-        }
         
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate roadmap: {str(e)}"
-        )
+        try:
+            return {
+                "success": True,
+                "data": await _generate_and_save(db, user_id, request, admission=admission)
+            }
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate roadmap: {str(e)}"
+            )
+    
+    return await idempotency_store.run(
+        user_id, "roadmap.generate", idempotency_key,
+        {**request.model_dump(), "background": background}, response, generate,
+    )
+
+
+@router.post("/generate/stream")
+async def create_roadmap_stream(
+    request: RoadmapGenerateRequest,
+    user_id: str = Depends(get_current_user_id),
+    admission: AdmissionTicket = Depends(ai_admission),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate a roadmap and stream it as server-sent events.
+
+    Emits a `phase` event for each phase and a `project` event for each project
+    as soon as it is parsed, then `complete` with the persisted roadmap, or
+    `error` if generation fails.
+    """
+    print(f"🎯 Streaming roadmap generation started for user: {user_id}")
+    
+    await _load_user_with_quota(db, user_id)
+    cloned = await _clone_near_duplicate(db, request)
+    release_slot = admission.hold()
+    
+    async def event_stream():
+        try:
+            ai_result = cloned
+            if cloned is not None:
+                for phase in cloned.get("phases", []):
+                    yield _sse("phase", phase)
+                for project in cloned.get("projects", []):
+                    yield _sse("project", project)
+            else:
+                async for event, payload in stream_roadmap(
+                    job_description=request.job_description,
+                    skill_level=request.skill_level,
+                    industry=request.industry
+                ):
+                    if event == "roadmap":
+                        ai_result = payload
+                    else:
+                        yield _sse(event, payload)
+            
+            # The request-scoped session is closed once streaming starts
+            async with AsyncSessionLocal() as session:
+                new_roadmap = await _save_roadmap(session, user_id, request, ai_result)
+            
+            yield _sse("complete", _new_roadmap_data(new_roadmap))
+        except Exception as e:
+            yield _sse("error", {"detail": f"Failed to generate roadmap: {str(e)}"})
+        finally:
+            release_slot()
+    
+    # The background task also releases the slot if the client leaves before streaming starts
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_slot),
+    )
 
 
 @router.get("", response_model=dict)
@@ -161,13 +432,28 @@ async def list_roadmaps(
     }
 
 
+@router.get("/cache/stats", response_model=dict)
+async def get_roadmap_cache_stats(
+    user_id: str = Depends(get_current_user_id),
+):
+    """Hit/miss counters and estimated savings of the roadmap generation cache."""
+    return {
+        "success": True,
+        "data": {
+            **await roadmap_cache.stats(),
+            "detail": roadmap_detail_cache.stats(),
+        },
+    }
+
+
 @router.get("/{roadmap_id}", response_model=dict)
 async def get_roadmap(
     roadmap_id: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get a specific roadmap with full details and curated resources."""
+    """Get a specific roadmap with full details and curated resources (ETag / 304 aware)."""
     # Convert IDs to UUID
     try:
         user_uuid = uuid.UUID(user_id)
@@ -180,21 +466,41 @@ async def get_roadmap(
     user = user_result.scalar_one_or_none()
     user_tier = user.tier if user else "free"
     
+    # Only the columns the cached rendering depends on; phases are loaded on a miss
     result = await db.execute(
-        select(Roadmap)
+        select(Roadmap.completion_percentage, Roadmap.status)
         .where(Roadmap.id == roadmap_uuid, Roadmap.user_id == user_uuid)
     )
-    roadmap = result.scalar_one_or_none()
+    summary = result.one_or_none()
     
-    if not roadmap:
+    if not summary:
         raise HTTPException(status_code=404, detail="Roadmap not found")
     
     # Get progress for this roadmap
     progress_result = await db.execute(
-        select(Progress).where(Progress.roadmap_id == roadmap_uuid)
+        select(
+            Progress.id,
+            Progress.skill_id,
+            Progress.status,
+            Progress.time_spent_minutes,
+            Progress.completed_at,
+        ).where(Progress.roadmap_id == roadmap_uuid)
+    )
+    progress_items = progress_result.all()
+    
+    cache_key = (
+        str(roadmap_uuid),
+        user_tier,
+        progress_version(progress_items),
+        summary.completion_percentage,
+        summary.status,
     )
-    progress_items = progress_result.scalars().all()
+    cached = roadmap_detail_cache.get(cache_key)
+    if cached is not None:
+        return cached.response(if_none_match)
     
+    result = await db.execute(select(Roadmap).where(Roadmap.id == roadmap_uuid))
+    roadmap = result.scalar_one()
     progress_map = {p.skill_id: p for p in progress_items}
     
     # Merge progress into phases and enrich with curated resources
@@ -229,7 +535,7 @@ async def get_roadmap(
         phase_copy["skills"] = skills_with_progress
         phases_with_progress.append(phase_copy)
     
-    return {
+    rendered = roadmap_detail_cache.put(cache_key, {
         "success": True,
         "data": {
             "id": str(roadmap.id),
@@ -245,7 +551,8 @@ async def get_roadmap(
             "generated_at": roadmap.generated_at.isoformat(),
             "user_tier": user_tier,
         }
-    }
+    })
+    return rendered.response(if_none_match)
 
 
 @router.post("/progress", response_model=dict)
@@ -305,6 +612,7 @@ async def update_progress(
         roadmap.completion_percentage = int((completed / len(all_items)) * 100)
     
     await db.commit()
+    roadmap_detail_cache.invalidate(request.roadmap_id)
     
     return {
         "success": True,
@@ -345,6 +653,7 @@ async def log_time(
         if progress.status == "not_started":
             progress.status = "in_progress"
         await db.commit()
+        roadmap_detail_cache.invalidate(request.roadmap_id)
         
         return {
             "success": True,
@@ -408,5 +717,7 @@ async def delete_roadmap(
     
     await db.delete(roadmap)
     await db.commit()
+    roadmap_detail_cache.invalidate(roadmap.id)
+    jd_similarity_index.remove(str(roadmap.id))
     
     return {"success": True, "message": "Roadmap deleted"}
@@ -1,14 +1,20 @@
 """Personal AI Mentor API endpoints (renamed from Study Buddy)."""
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
+import json
 
 from app.db.database import get_db
 from app.core.security import get_current_user_id
+from app.services.admission import AdmissionTicket, ai_admission
 from app.services.study_buddy_service import (
     chat_with_study_buddy,
     chat_interview_mode,
+    stream_chat_with_study_buddy,
+    stream_chat_interview_mode,
     explain_concept,
     debug_code,
     generate_quiz,
@@ -61,7 +67,7 @@ class SuggestLearningPathRequest(BaseModel):
     time_available: str
 
 
-@router.post("/chat", response_model=dict)
+@router.post("/chat", response_model=dict, dependencies=[Depends(ai_admission)])
 async def chat_endpoint(
     request: StudyBuddyChatRequest,
     user_id: str = Depends(get_current_user_id),
@@ -96,7 +102,53 @@ async def chat_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/explain", response_model=dict)
+@router.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: StudyBuddyChatRequest,
+    user_id: str = Depends(get_current_user_id),
+    admission: AdmissionTicket = Depends(ai_admission),
+):
+    """
+    Chat with Personal AI Mentor and stream the reply as server-sent events.
+
+    Emits `token` events followed by `done` with the full reply. Disconnecting
+    cancels the stream and aborts the upstream completion.
+    """
+    history = [{"role": msg.role, "content": msg.content} for msg in request.conversation_history]
+    
+    if request.mode == "interview":
+        tokens_iter = stream_chat_interview_mode(request.message, history, request.context)
+    else:
+        tokens_iter = stream_chat_with_study_buddy(
+            request.message,
+            history,
+            request.user_context,
+            request.context
+        )
+    release_slot = admission.hold()
+    
+    async def event_stream():
+        tokens = []
+        try:
+            async for token in tokens_iter:
+                tokens.append(token)
+                yield f"event: token\ndata: {json.dumps({'content': token})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'response': ''.join(tokens)})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            release_slot()
+    
+    # The background task also releases the slot if the client leaves before streaming starts
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_slot),
+    )
+
+
+@router.post("/explain", response_model=dict, dependencies=[Depends(ai_admission)])
 async def explain_concept_endpoint(
     request: ExplainConceptRequest,
     user_id: str = Depends(get_current_user_id),
@@ -118,7 +170,7 @@ async def explain_concept_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/debug", response_model=dict)
+@router.post("/debug", response_model=dict, dependencies=[Depends(ai_admission)])
 async def debug_code_endpoint(
     request: DebugCodeRequest,
     user_id: str = Depends(get_current_user_id),
@@ -136,7 +188,7 @@ async def debug_code_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/quiz", response_model=dict)
+@router.post("/quiz", response_model=dict, dependencies=[Depends(ai_admission)])
 async def generate_quiz_endpoint(
     request: GenerateQuizRequest,
     user_id: str = Depends(get_current_user_id),
@@ -154,7 +206,7 @@ async def generate_quiz_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/review", response_model=dict)
+@router.post("/review", response_model=dict, dependencies=[Depends(ai_admission)])
 async def review_project_endpoint(
     request: ReviewProjectRequest,
     user_id: str = Depends(get_current_user_id),
@@ -176,7 +228,7 @@ async def review_project_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/learning-path", response_model=dict)
+@router.post("/learning-path", response_model=dict, dependencies=[Depends(ai_admission)])
 async def suggest_learning_path_endpoint(
     request: SuggestLearningPathRequest,
     user_id: str = Depends(get_current_user_id),
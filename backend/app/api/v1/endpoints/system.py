@@ -0,0 +1,48 @@
+"""
+AI Operations API Endpoints
+Runtime statistics for the LLM gateway, request coalescing and response caches
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core.security import get_current_admin_user_id
+from app.services.admission import admission_controller
+from app.services.jd_similarity import jd_similarity_index
+from app.services.llm_gateway import llm_gateway
+from app.services.llm_telemetry import llm_telemetry
+from app.services.model_router import model_router
+from app.services.roadmap_cache import roadmap_cache
+from app.services.single_flight import single_flight
+from app.services.token_budget import token_budgeter
+
+router = APIRouter()
+
+
+@router.get("/ai-stats", response_model=dict)
+async def get_ai_stats(
+    user_id: str = Depends(get_current_admin_user_id),
+):
+    """Gateway load, coalesced calls, cache effectiveness and prompt tokens saved (admins only)"""
+    return {
+        "success": True,
+        "data": {
+            "gateway": llm_gateway.stats(),
+            "single_flight": single_flight.stats(),
+            "roadmap_cache": await roadmap_cache.stats(),
+            "jd_similarity": jd_similarity_index.stats(),
+            "token_budget": token_budgeter.stats(),
+            "admission": admission_controller.summary(),
+            "model_routing": model_router.stats(),
+        }
+    }
+
+
+@router.get("/llm-usage", response_model=dict)
+async def get_llm_usage(
+    user_id: str = Depends(get_current_admin_user_id),
+):
+    """Per-feature LLM calls, tokens, cost, latency percentiles and cache hit rates (admins only)"""
+    return {
+        "success": True,
+        "data": llm_telemetry.summary()
+    }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Any, Dict, List
 import os
 
 
@@ -26,7 +26,126 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
-    
+    OPENAI_FAST_MODEL: str = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+
+    # Per-task model routing (see app/services/model_router.py for the default table)
+    LLM_ROUTES: Dict[str, Dict[str, Any]] = {}  # Per-feature overrides: tier, max_tokens, temperature, ...
+    LLM_SLO_ENABLED: bool = True
+    LLM_SLO_WINDOW_SECONDS: float = 300.0
+    LLM_SLO_MIN_SAMPLES: int = 20
+    LLM_SLO_DOWNGRADE_SECONDS: float = 120.0
+
+    # LLM gateway (shared client, concurrency cap, retries, circuit breaker)
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+    LLM_TIMEOUT_SECONDS: float = 90.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RECOVERY_SECONDS: float = 30.0
+
+    # Structured output repair (failing fragments are re-requested, not the whole response)
+    LLM_REPAIR_MAX_ROUNDS: int = 2
+    LLM_REPAIR_MAX_TOKENS: int = 1500
+
+    # Offline LLM stand-in (mode: live, replay, record)
+    LLM_CLIENT_MODE: str = os.getenv("LLM_CLIENT_MODE", "live")
+    LLM_REPLAY_CASSETTE_DIR: str = os.getenv("LLM_REPLAY_CASSETTE_DIR", "./cassettes")
+    LLM_REPLAY_LATENCY_MODE: str = "recorded"  # recorded, lognormal, fixed
+    LLM_REPLAY_LATENCY_MEDIAN_SECONDS: float = 2.0
+    LLM_REPLAY_LATENCY_SIGMA: float = 0.5
+    LLM_REPLAY_TTFT_SECONDS: float = 0.4
+    LLM_REPLAY_SPEED_FACTOR: float = 1.0  # Scales all simulated latency; 0 disables waiting
+    LLM_REPLAY_ERROR_RATE: float = 0.0
+    LLM_REPLAY_ERROR_KINDS: str = "rate_limit,server_error,timeout"
+
+    # AI endpoint admission control (priority by User.tier, shed with 503 when saturated)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENT_REQUESTS: int = 24
+    ADMISSION_MAX_QUEUE_DEPTH: int = 100
+    ADMISSION_MAX_WAIT_ENTERPRISE_SECONDS: float = 30.0
+    ADMISSION_MAX_WAIT_PRO_SECONDS: float = 20.0
+    ADMISSION_MAX_WAIT_FREE_SECONDS: float = 5.0
+
+    # Roadmap response cache (backend: memory, redis, redis-memory)
+    ROADMAP_CACHE_ENABLED: bool = True
+    ROADMAP_CACHE_BACKEND: str = os.getenv("ROADMAP_CACHE_BACKEND", "memory")
+    ROADMAP_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    ROADMAP_CACHE_MAX_ENTRIES: int = 1000
+
+    # Rendered GET /roadmaps/{id} responses, served with a strong ETag
+    ROADMAP_DETAIL_CACHE_ENABLED: bool = True
+    ROADMAP_DETAIL_CACHE_MAX_ENTRIES: int = 500
+
+    # Near-duplicate job description reuse
+    ROADMAP_DEDUP_ENABLED: bool = True
+    ROADMAP_DEDUP_THRESHOLD: float = 0.85  # Estimated Jaccard similarity of JD shingles
+    ROADMAP_DEDUP_REBUILD_LIMIT: int = 50000  # Most recent roadmaps indexed at startup
+    ROADMAP_DEDUP_REBUILD_SECONDS: float = 20.0
+
+    # Roadmap generation (mode: fanout = outline + parallel per-phase calls, single = one call)
+    ROADMAP_GENERATION_MODE: str = os.getenv("ROADMAP_GENERATION_MODE", "fanout")
+    ROADMAP_FANOUT_CONCURRENCY: int = 6
+    ROADMAP_PHASE_MAX_ATTEMPTS: int = 3
+
+    # Serve a rule-based roadmap when the LLM misses its latency budget, upgrade it later
+    ROADMAP_LOCAL_FALLBACK_ENABLED: bool = True
+    ROADMAP_LLM_LATENCY_BUDGET_SECONDS: float = 20.0
+
+    # Interview question bank
+    INTERVIEW_BANK_ENABLED: bool = True
+    INTERVIEW_BANK_WATERMARK: int = 30  # Minimum questions kept per bucket
+    INTERVIEW_BANK_REFILL_INTERVAL_SECONDS: int = 300
+
+    # Background jobs (backend: database, local)
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "database")
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: float = 120.0  # Running jobs without a heartbeat for this long are requeued
+    JOB_MAX_ATTEMPTS: int = 3  # Jobs whose lease expires after this many claims are failed, not requeued
+
+    # Learning resource catalog (learning_resources table), reloaded when its version changes
+    RESOURCE_CATALOG_POLL_SECONDS: float = 5.0
+
+    # Resource health shared across workers (backend: auto, memory, redis, redis-memory);
+    # auto is redis when REDIS_URL is configured, memory otherwise
+    RESOURCE_HEALTH_BACKEND: str = os.getenv("RESOURCE_HEALTH_BACKEND", "auto")
+    RESOURCE_HEALTH_RESYNC_SECONDS: float = 30.0
+
+    # Scheduled link health checks for curated resources
+    LINK_HEALTH_ENABLED: bool = True
+    LINK_HEALTH_INTERVAL_SECONDS: int = 6 * 3600
+    LINK_HEALTH_MAX_CONCURRENCY: int = 20
+    LINK_HEALTH_PER_HOST_CONCURRENCY: int = 2
+    LINK_HEALTH_TIMEOUT_SECONDS: float = 10.0
+    LINK_HEALTH_FAILURE_THRESHOLD: int = 2  # Failed checks in a row before serving the fallback
+    LINK_HEALTH_BACKOFF_BASE_SECONDS: float = 60.0
+    LINK_HEALTH_BACKOFF_MAX_SECONDS: float = 3600.0
+
+    # Distinct users reporting a resource before it is served with its fallback
+    RESOURCE_REPORT_DEMOTION_THRESHOLD: int = 3
+
+    # Idempotency-Key support for expensive POST endpoints
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600
+    IDEMPOTENCY_LOCK_SECONDS: int = 300  # In-progress claims not extended for this long (dead worker) are taken over
+    IDEMPOTENCY_WAIT_SECONDS: float = 120.0  # How long a duplicate waits for the original
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS: float = 0.5
+
+    # Prompt token budgets (input tokens per call, or per free-text field)
+    PROMPT_BUDGET_CHAT_TOKENS: int = 3000
+    PROMPT_BUDGET_STUDY_BUDDY_TOKENS: int = 4000
+    PROMPT_BUDGET_INTERVIEW_EVAL_TOKENS: int = 4000
+    PROMPT_BUDGET_RESUME_TOKENS: int = 3000
+    PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS: int = 2000
+    PROMPT_BUDGET_CODE_TOKENS: int = 3000
+
+    # Comma-separated emails allowed to use admin-only endpoints
+    ADMIN_EMAILS: str = os.getenv("ADMIN_EMAILS", "")
+
+    # Bearer token the Prometheus scraper sends to GET /metrics (unset keeps /metrics closed)
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
     # CORS
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -1,14 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import secrets
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
 
 from app.core.config import settings
+from app.db.database import get_db
+from app.db.models import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+metrics_security = HTTPBearer(auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -89,3 +96,39 @@ async def get_current_user_id(
         )
     print(f"✅ User ID extracted: {user_id}")
     return user_id
+
+
+async def get_current_admin_user_id(
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> str:
+    """Require the current user to be listed in ADMIN_EMAILS."""
+    admin_emails = {e.strip().lower() for e in settings.ADMIN_EMAILS.split(",") if e.strip()}
+    if admin_emails:
+        result = await db.execute(select(User.email).where(User.id == uuid.UUID(user_id)))
+        email = result.scalar_one_or_none()
+        if email and email.lower() in admin_emails:
+            return user_id
+    
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Admin access required",
+    )
+
+
+async def verify_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_security)
+) -> None:
+    """Require METRICS_TOKEN as the bearer token; /metrics stays closed while it is unset."""
+    if (
+        settings.METRICS_TOKEN
+        and credentials is not None
+        and secrets.compare_digest(credentials.credentials, settings.METRICS_TOKEN)
+    ):
+        return
+    
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Metrics token required",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
@@ -1,3 +1,6 @@
+from typing import List
+
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -23,6 +26,31 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def add_missing_columns(connection) -> List[str]:
+    """
+    Add nullable model columns missing from existing tables.
+
+    create_all only creates missing tables, so a column added to an existing
+    model (e.g. roadmaps.generation) would otherwise break every query on an
+    older database. Run with `conn.run_sync(add_missing_columns)` after create_all.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    quote = connection.dialect.identifier_preparer.quote
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
 async def get_db():
     """Dependency to get database session."""
     async with AsyncSessionLocal() as session:
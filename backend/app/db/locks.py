@@ -0,0 +1,49 @@
+"""
+Database advisory locks
+Lets one worker at a time run a background pass (question bank refill, link
+health checks) when every uvicorn worker and replica starts the same loop.
+
+On PostgreSQL this is a session-level pg_try_advisory_lock held on its own
+connection for the duration of the block. Other databases (SQLite in
+development) are single-host, so a process-local lock stands in.
+"""
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+_local_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _lock_key(name: str) -> int:
+    """Stable signed 64-bit key for a lock name"""
+    return int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+@asynccontextmanager
+async def try_advisory_lock(name: str) -> AsyncIterator[bool]:
+    """Yield True if this worker holds the lock for the block, False if another worker does"""
+    if engine.dialect.name != "postgresql":
+        lock = _local_locks.setdefault(name, asyncio.Lock())
+        if lock.locked():
+            yield False
+            return
+        async with lock:
+            yield True
+        return
+
+    key = _lock_key(name)
+    async with engine.connect() as conn:
+        acquired = bool((await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})).scalar())
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                await conn.commit()
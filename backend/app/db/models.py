@@ -75,6 +75,7 @@ class Roadmap(Base):
     phases = Column(JSON, nullable=True)  # Learning phases with resources
     projects = Column(JSON, nullable=True)  # Project suggestions
     status = Column(String(50), default="active")  # active, completed, archived
+    generation = Column(String(20), nullable=True, default="llm")  # llm, local (rule-based fallback); NULL before tracking
 
     # Relationships
     user = relationship("User", back_populates="roadmaps")
@@ -1,9 +1,11 @@
 """
-Resource Database Models
-Tracks learning resources with health status, user reports, and fallbacks
+Career Tracking Database Models
+Resume analyses, job applications and skill assessments
+
+Learning resource, report and health check tables live in app.models.resources.
 """
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -11,82 +13,6 @@ import uuid
 from app.db.database import Base
 
 
-class LearningResource(Base):
-    """Curated learning resource with health tracking"""
-    __tablename__ = "learning_resources"
-
-    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    
-    # Resource info
-    title = Column(String(500), nullable=False)
-    url = Column(String(1000), nullable=False, unique=True)
-    description = Column(Text, nullable=True)
-    
-    # Categorization
-    skill_category = Column(String(100), nullable=False, index=True)  # python, javascript, react, etc.
-    resource_type = Column(String(50), nullable=False)  # video, documentation, article, course, interactive, book
-    provider = Column(String(200), nullable=True)  # freeCodeCamp, MDN, YouTube, etc.
-    difficulty = Column(String(20), default="beginner")  # beginner, intermediate, advanced
-    
-    # Quality metrics
-    quality_score = Column(Float, default=0.8)  # 0.0 - 1.0
-    duration_minutes = Column(Integer, nullable=True)
-    is_free = Column(Boolean, default=True)
-    
-    # Tier access
-    tier_required = Column(String(20), default="free")  # free, standard, premium
-    
-    # Health tracking
-    is_verified = Column(Boolean, default=False)
-    is_active = Column(Boolean, default=True)
-    last_verified_at = Column(DateTime, nullable=True)
-    consecutive_failures = Column(Integer, default=0)
-    last_failure_reason = Column(String(500), nullable=True)
-    
-    # User reports
-    report_count = Column(Integer, default=0)
-    
-    # Fallback
-    fallback_resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=True)
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-
-class ResourceReport(Base):
-    """User reports for broken/outdated resources"""
-    __tablename__ = "resource_reports"
-
-    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=False)
-    user_id = Column(UUID(), ForeignKey("users.id"), nullable=False)
-    
-    report_type = Column(String(50), nullable=False)  # broken_link, outdated, inappropriate, other
-    description = Column(Text, nullable=True)
-    suggested_replacement_url = Column(String(1000), nullable=True)
-    
-    status = Column(String(20), default="pending")  # pending, reviewed, fixed, dismissed
-    reviewed_by = Column(UUID(), nullable=True)
-    reviewed_at = Column(DateTime, nullable=True)
-    
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-
-class ResourceHealthCheck(Base):
-    """Log of automated health checks"""
-    __tablename__ = "resource_health_checks"
-
-    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=False)
-    
-    check_timestamp = Column(DateTime, default=datetime.utcnow)
-    http_status = Column(Integer, nullable=True)
-    response_time_ms = Column(Integer, nullable=True)
-    is_healthy = Column(Boolean, default=True)
-    error_message = Column(String(500), nullable=True)
-
-
 class ResumeAnalysis(Base):
     """Stored resume analysis results"""
     __tablename__ = "resume_analyses"
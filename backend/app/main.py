@@ -1,7 +1,9 @@
 import os
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from app.core.config import settings
 
@@ -32,9 +34,22 @@ except Exception as e:
     print("Continuing without Sentry...")
 
 from app.api.v1.router import api_router
-from app.db.database import engine, Base
+from app.core.security import verify_metrics_token
+from app.db.database import engine, Base, AsyncSessionLocal, add_missing_columns
 from app.db import models  # Import models to register them
 from app.models import portfolio  # Import new models
+from app.models import jobs  # noqa: F401
+from app.models import idempotency  # noqa: F401
+from app.models import resources  # noqa: F401
+from app.services.job_queue import job_queue
+from app.services.interview_bank_service import run_refiller
+from app.services.jd_similarity import jd_similarity_index
+from app.services.llm_telemetry import llm_telemetry
+from app.services.admission import admission_controller
+from app.services.idempotency import idempotency_store
+from app.services.link_health import run_health_scheduler
+from app.services.resource_catalog import run_catalog_poller
+from app.services.resource_health_store import resource_health_store
 
 
 @asynccontextmanager
@@ -42,8 +57,49 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        added_columns = await conn.run_sync(add_missing_columns)
+    if added_columns:
+        print(f"🗄️ Added columns: {', '.join(added_columns)}")
+    
+    # Keep the interview question bank warm in the background
+    stop_event = asyncio.Event()
+    background_tasks = [asyncio.create_task(run_refiller(stop_event))]
+    
+    # Serve the learning resource catalog from the database, reloading on edits
+    background_tasks.append(asyncio.create_task(run_catalog_poller(stop_event)))
+    
+    # Apply resource health changes published by other workers
+    background_tasks.append(asyncio.create_task(resource_health_store.run(stop_event)))
+    
+    # Re-check curated resource links on a schedule
+    background_tasks.append(asyncio.create_task(run_health_scheduler(stop_event)))
+    
+    # Index existing job descriptions for near-duplicate roadmap reuse
+    if settings.ROADMAP_DEDUP_ENABLED:
+        background_tasks.append(asyncio.create_task(
+            jd_similarity_index.rebuild_from_db(
+                AsyncSessionLocal,
+                limit=settings.ROADMAP_DEDUP_REBUILD_LIMIT,
+                time_budget_seconds=settings.ROADMAP_DEDUP_REBUILD_SECONDS,
+            )
+        ))
+    
+    # Stored Idempotency-Key responses past their TTL
+    with suppress(Exception):
+        await idempotency_store.purge_expired()
+    
+    # Workers for queued long-running AI jobs
+    await job_queue.start()
+    
     yield
+    
     # Shutdown: Clean up resources
+    stop_event.set()
+    await job_queue.stop()
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await engine.dispose()
 
 
@@ -83,6 +139,15 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(verify_metrics_token)])
+async def metrics():
+    """LLM telemetry and AI admission queue metrics in Prometheus text format (METRICS_TOKEN bearer auth)."""
+    return PlainTextResponse(
+        llm_telemetry.render_prometheus() + admission_controller.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.get("/sentry-test")
 async def sentry_test():
     """Test endpoint to verify Sentry is working."""
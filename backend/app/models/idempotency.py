@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, UniqueConstraint
+import uuid
+from datetime import datetime
+
+from app.db.database import Base
+from app.db.models import UUID
+
+
+class IdempotencyKey(Base):
+    """Stored outcome of a POST sent with an Idempotency-Key header"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_user_scope_key"),)
+
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(), ForeignKey("users.id"), nullable=False)
+
+    # Request identity
+    scope = Column(String(100), nullable=False)  # roadmap.generate, portfolio.generate, ...
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+
+    # Outcome
+    status = Column(String(20), default="in_progress")  # in_progress, completed
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+
+    # Timestamps; in_progress rows expire after the lock timeout, completed rows after the TTL
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, JSON
+import uuid
+from datetime import datetime
+
+from app.db.database import Base
+from app.db.models import UUID
+
+
+class BackgroundJob(Base):
+    """Long-running AI work executed by the job worker pool"""
+    __tablename__ = "background_jobs"
+    
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(), ForeignKey("users.id"), nullable=False, index=True)
+    
+    # Job definition
+    job_type = Column(String(100), nullable=False)  # roadmap.generate, portfolio.generate, ...
+    payload = Column(JSON, default=dict)
+    
+    # Execution state
+    status = Column(String(20), default="queued", index=True)  # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Refreshed by the worker running the job (lease)
+    finished_at = Column(DateTime, nullable=True)
@@ -86,6 +86,37 @@ class InterviewSession(Base):
     user = relationship("User", back_populates="interview_sessions")
 
 
+class InterviewQuestion(Base):
+    """Pre-generated interview question bank entry"""
+    __tablename__ = "interview_question_bank"
+    
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    
+    # Bucket: "{session_type}:{role_family}:{difficulty}"
+    bucket_key = Column(String, nullable=False, index=True)
+    session_type = Column(String, nullable=False)  # coding, system_design, behavioral
+    role_family = Column(String, nullable=False)  # backend, frontend, data, devops, ...
+    difficulty = Column(String, nullable=False)  # easy, medium, hard
+    
+    # Question payload as returned by the generator (question, hints, ideal_answer, ...)
+    question = Column(JSON, nullable=False)
+    
+    # Stats
+    times_served = Column(Integer, default=0)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InterviewQuestionServed(Base):
+    """Bank questions already given to a user, so sampling can exclude them in SQL"""
+    __tablename__ = "interview_question_served"
+    
+    user_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    question_id = Column(UUID(), ForeignKey("interview_question_bank.id"), primary_key=True)
+    served_at = Column(DateTime, default=datetime.utcnow)
+
+
 class AccountabilityPartner(Base):
     """Accountability partner matching"""
     __tablename__ = "accountability_partners"
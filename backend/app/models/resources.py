@@ -0,0 +1,111 @@
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ForeignKey, Index
+import uuid
+from datetime import datetime
+
+from app.db.database import Base
+from app.db.models import UUID
+
+
+class LearningResource(Base):
+    """Curated learning resource with health tracking"""
+    __tablename__ = "learning_resources"
+
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    slug = Column(String(100), nullable=True, unique=True)  # Catalog id, e.g. py-doc-1
+
+    # Resource info
+    title = Column(String(500), nullable=False)
+    url = Column(String(1000), nullable=False, unique=True)
+    description = Column(Text, nullable=True)
+
+    # Categorization
+    skill_category = Column(String(100), nullable=False, index=True)  # python, javascript, react, etc.
+    resource_type = Column(String(50), nullable=False)  # video, documentation, article, course, interactive, book
+    provider = Column(String(200), nullable=True)  # freeCodeCamp, MDN, YouTube, etc.
+    difficulty = Column(String(20), default="beginner")  # beginner, intermediate, advanced
+
+    # Quality metrics
+    quality_score = Column(Float, default=0.8)  # 0.0 - 1.0
+    duration_minutes = Column(Integer, nullable=True)
+    is_free = Column(Boolean, default=True)
+
+    # Tier access
+    tier_required = Column(String(20), default="free")  # free, standard, premium
+    is_official = Column(Boolean, default=False)  # Official documentation, ranked first
+
+    # Health tracking
+    is_verified = Column(Boolean, default=False)
+    is_active = Column(Boolean, default=True)
+    last_verified_at = Column(DateTime, nullable=True)
+    consecutive_failures = Column(Integer, default=0)
+    last_failure_reason = Column(String(500), nullable=True)
+
+    # Validators from the last successful check, sent back as If-None-Match / If-Modified-Since
+    etag = Column(String(500), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+
+    # User reports: distinct users who reported this resource, served with its fallback past the threshold
+    report_count = Column(Integer, default=0)
+
+    # Fallback
+    fallback_resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ResourceReport(Base):
+    """User reports for broken/outdated resources"""
+    __tablename__ = "resource_reports"
+    __table_args__ = (
+        # Review queue pages: newest first, optionally by status
+        Index("ix_resource_reports_created", "created_at", "id"),
+        Index("ix_resource_reports_status_created", "status", "created_at", "id"),
+    )
+
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=False)
+    user_id = Column(UUID(), ForeignKey("users.id"), nullable=False)
+
+    report_type = Column(String(50), nullable=False)  # broken_link, outdated, inappropriate, other
+    description = Column(Text, nullable=True)
+    suggested_replacement_url = Column(String(1000), nullable=True)
+
+    status = Column(String(20), default="pending")  # pending, reviewed, fixed, dismissed
+    reviewed_by = Column(UUID(), nullable=True)
+    reviewed_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ResourceReporter(Base):
+    """One row per user who has reported a resource; the key makes report_count count each user once"""
+    __tablename__ = "resource_reporters"
+
+    resource_id = Column(UUID(), ForeignKey("learning_resources.id"), primary_key=True)
+    user_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    first_reported_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ResourceHealthCheck(Base):
+    """Log of automated health checks"""
+    __tablename__ = "resource_health_checks"
+
+    id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    resource_id = Column(UUID(), ForeignKey("learning_resources.id"), nullable=False, index=True)
+
+    check_timestamp = Column(DateTime, default=datetime.utcnow)
+    http_status = Column(Integer, nullable=True)
+    response_time_ms = Column(Integer, nullable=True)
+    is_healthy = Column(Boolean, default=True)
+    error_message = Column(String(500), nullable=True)
+
+
+class ResourceCatalogState(Base):
+    """Single-row version counter for the learning resource catalog; bumped on every catalog edit"""
+    __tablename__ = "resource_catalog_state"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
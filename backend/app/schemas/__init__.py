@@ -2,3 +2,4 @@
 from app.schemas.auth import *
 from app.schemas.roadmap import *
 from app.schemas.chat import *
+from app.schemas.ai_outputs import *
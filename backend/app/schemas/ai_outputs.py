@@ -0,0 +1,184 @@
+"""
+Schemas for structured LLM output.
+
+Roadmap pieces extend the API models in app.schemas.roadmap; ids are
+optional here because they are assigned after generation.
+
+These validate what the model returns before it is stored or served. They
+are deliberately lenient about formatting (numbers given as "40 hours",
+missing optional text) and strict about structure (a phase without skills,
+a skill without resources), so validation failures point at fragments that
+are worth repairing. Unknown fields are kept.
+"""
+
+import re
+from typing import Annotated, Any, List, Optional
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+
+from app.schemas.roadmap import PhaseBase, ProjectBase, ResourceBase, SkillBase
+
+
+def _loose_number(value: Any) -> Any:
+    """Accept "40", "40 hours", "10-12" (takes the first number)"""
+    if isinstance(value, str):
+        match = re.search(r"-?\d+(?:\.\d+)?", value)
+        if match:
+            return float(match.group(0)) if "." in match.group(0) else int(match.group(0))
+    return value
+
+
+def _loose_int(value: Any) -> Any:
+    value = _loose_number(value)
+    return int(round(value)) if isinstance(value, float) else value
+
+
+LooseInt = Annotated[int, BeforeValidator(_loose_int)]
+LooseFloat = Annotated[float, BeforeValidator(_loose_number)]
+
+
+class AIOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+# ============================================================
+# ROADMAP
+# ============================================================
+
+class AIResource(AIOutput, ResourceBase):
+    id: Optional[str] = None
+    title: str = Field(min_length=1)
+    url: str = Field(pattern=r"^https?://")
+    type: str = "article"
+    difficulty: str = "beginner"
+    duration_minutes: Optional[LooseInt] = None
+    quality_score: LooseFloat = 0.8
+
+
+class AISkillOutline(AIOutput, SkillBase):
+    id: Optional[str] = None
+    name: str = Field(min_length=1)
+    category: str = "technical"
+    difficulty: str = "beginner"
+    importance: str = "important"
+    interview_frequency: LooseInt = 50
+    estimated_hours: LooseInt = 10
+    description: str = ""
+
+
+class AISkill(AISkillOutline):
+    why_this_matters: str = ""
+    what_if_skipped: str = ""
+    resources: List[AIResource] = Field(min_length=1)
+
+
+class AIPhaseOutline(AIOutput, PhaseBase):
+    id: Optional[str] = None
+    name: str = Field(min_length=1)
+    description: str = ""
+    order: Optional[LooseInt] = None
+    estimated_weeks: LooseInt = 2
+    skills: List[AISkillOutline] = Field(min_length=1)
+
+
+class AIPhase(AIPhaseOutline):
+    skills: List[AISkill] = Field(min_length=1)
+
+
+class AIProject(AIOutput, ProjectBase):
+    id: Optional[str] = None
+    title: str = Field(min_length=1)
+    description: str = ""
+    difficulty: str = "intermediate"
+    estimated_hours: LooseInt = 20
+    skills: List[str] = []
+    resume_bullet: str = ""
+    interview_talking_points: List[str] = []
+    steps: List[str] = []
+
+
+class AIRoadmapOutline(AIOutput):
+    job_title: str = Field(min_length=1)
+    industry: Optional[str] = None
+    estimated_weeks: Optional[LooseInt] = None
+    why_this_roadmap: Optional[str] = None
+    phases: List[AIPhaseOutline] = Field(min_length=1)
+    projects: List[AIProject] = []
+
+
+class AIRoadmap(AIRoadmapOutline):
+    phases: List[AIPhase] = Field(min_length=1)
+
+
+class AISkillDetail(AIOutput):
+    name: str = Field(min_length=1)
+    description: str = ""
+    why_this_matters: str = ""
+    what_if_skipped: str = ""
+    resources: List[AIResource] = Field(min_length=1)
+
+
+class AIPhaseDetail(AIOutput):
+    skills: List[AISkillDetail] = Field(min_length=1)
+
+
+# ============================================================
+# RESUME / PORTFOLIO / JOB DESCRIPTIONS
+# ============================================================
+
+class AIResumeSkill(AIOutput):
+    name: str = Field(min_length=1)
+    proficiency: str = "intermediate"
+    years: Optional[LooseFloat] = None
+
+
+class AIResumeAnalysis(AIOutput):
+    skills: List[AIResumeSkill] = Field(min_length=1)
+    experience_years: LooseFloat = 0
+    strengths: List[str] = []
+    improvements: List[str] = []
+    recommendations: List[str] = []
+    summary: str = Field(min_length=1)
+    match_score: Optional[LooseInt] = None
+    education: List[Any] = []
+    work_history: List[Any] = []
+
+
+class AIPortfolioContent(AIOutput):
+    tagline: str = Field(min_length=1)
+    bio: str = Field(min_length=1)
+    resume_bullets: List[str] = Field(min_length=1)
+    linkedin_posts: List[Any] = []
+    projects: List[Any] = []
+    certificates: List[Any] = []
+
+
+class AIJDSkillGroups(AIOutput):
+    required: List[str] = []
+    preferred: List[str] = []
+    soft_skills: List[str] = []
+
+
+class AIJDSkills(AIOutput):
+    job_title: str = "Unknown"
+    company: Optional[str] = None
+    skills: AIJDSkillGroups = Field(default_factory=AIJDSkillGroups)
+    experience_level: str = "mid"
+    industry: str = "technology"
+
+
+# ============================================================
+# INTERVIEW
+# ============================================================
+
+class AIInterviewQuestion(AIOutput):
+    id: Optional[str] = None
+    type: Optional[str] = None
+    question: str = Field(min_length=1)
+    hints: List[str] = []
+    ideal_answer: str = ""
+    time_limit_minutes: LooseInt = 15
+
+
+class AIInterviewQuestions(AIOutput):
+    questions: List[AIInterviewQuestion] = Field(min_length=1)
@@ -0,0 +1,278 @@
+"""
+AI Request Admission
+Tier-aware admission control in front of the AI endpoints.
+
+At most ADMISSION_MAX_CONCURRENT_REQUESTS AI requests run at once. Requests
+beyond that wait in a priority queue ordered by User.tier (enterprise, then
+pro, then free; FIFO within a tier), so a free-tier burst cannot delay paying
+users. Requests are shed with 503 + Retry-After when:
+- the queue is full and nothing lower-priority can be evicted
+- a lower-priority waiter is evicted to make room for a higher-priority one
+- a request has waited longer than its tier's maximum wait
+
+Queue depth, wait times and shed counts are exported on GET /metrics.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.security import get_current_user_id
+from app.db.database import AsyncSessionLocal
+from app.db.models import User
+from app.services.llm_telemetry import Histogram, LATENCY_BUCKETS
+
+TIER_PRIORITY = {"enterprise": 0, "pro": 1, "free": 2}
+TIER_CACHE_SECONDS = 60.0
+
+
+class AdmissionRejected(Exception):
+    """Request shed by the admission controller"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tier", "future", "enqueued_at", "left")
+
+    def __init__(self, priority: int, seq: int, tier: str, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.tier = tier
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.left = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionTicket:
+    """A held slot; released when the request finishes (or by the stream that holds it)"""
+
+    def __init__(self, controller: Optional["AdmissionController"], tier: str):
+        self.controller = controller
+        self.tier = tier
+        self.held = False
+        self._admitted_at = time.monotonic()
+        self._released = False
+
+    def hold(self):
+        """Keep the slot after the handler returns (streaming responses); returns the release function"""
+        self.held = True
+        return self.release
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self.controller:
+            self.controller.release(time.monotonic() - self._admitted_at)
+
+
+class AdmissionController:
+    def __init__(self, capacity: int, max_queue_depth: int, max_wait_seconds: Dict[str, float]):
+        self.capacity = capacity
+        self.max_queue_depth = max_queue_depth
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._queued: Dict[str, int] = defaultdict(int)
+        self._avg_service_seconds = 5.0
+        self.admitted: Dict[str, int] = defaultdict(int)
+        self.shed: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.wait: Dict[str, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self._queued.values())
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained"""
+        estimate = (self.queue_depth + 1) * self._avg_service_seconds / max(self.capacity, 1)
+        return int(min(max(math.ceil(estimate), 1), 120))
+
+    def _leave(self, waiter: _Waiter) -> None:
+        if not waiter.left:
+            waiter.left = True
+            self._queued[waiter.tier] -= 1
+
+    def _reject(self, tier: str, reason: str) -> AdmissionRejected:
+        self.shed[tier][reason] += 1
+        print(f"🚦 Shed {tier} AI request ({reason}), queue depth {self.queue_depth}")
+        return AdmissionRejected(reason, self.retry_after())
+
+    def _evict_for(self, priority: int) -> bool:
+        """Shed the newest lowest-priority waiter if it ranks below `priority`"""
+        waiting = [w for w in self._heap if not w.future.done()]
+        if not waiting:
+            return False
+        victim = max(waiting, key=lambda w: (w.priority, w.seq))
+        if victim.priority <= priority:
+            return False
+        self._leave(victim)
+        victim.future.set_exception(self._reject(victim.tier, "evicted"))
+        return True
+
+    async def acquire(self, tier: str) -> AdmissionTicket:
+        tier = tier if tier in TIER_PRIORITY else "free"
+        priority = TIER_PRIORITY[tier]
+
+        if self.in_flight < self.capacity and not self.queue_depth:
+            self.in_flight += 1
+            self.admitted[tier] += 1
+            self.wait[tier].observe(0.0)
+            return AdmissionTicket(self, tier)
+
+        if self.queue_depth >= self.max_queue_depth and not self._evict_for(priority):
+            raise self._reject(tier, "queue_full")
+
+        waiter = _Waiter(priority, next(self._seq), tier, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, waiter)
+        self._queued[tier] += 1
+
+        def owns_slot() -> bool:
+            f = waiter.future
+            return f.done() and not f.cancelled() and f.exception() is None
+
+        try:
+            async with asyncio.timeout(self.max_wait_seconds.get(tier, 5.0)):
+                await waiter.future
+        except TimeoutError:
+            # A slot handed over at the same instant as the timeout still counts
+            if not owns_slot():
+                self._leave(waiter)
+                raise self._reject(tier, "timeout")
+        except asyncio.CancelledError:
+            self._leave(waiter)
+            if owns_slot():
+                self.release(0.0)
+            raise
+
+        self.admitted[tier] += 1
+        self.wait[tier].observe(time.monotonic() - waiter.enqueued_at)
+        return AdmissionTicket(self, tier)
+
+    def release(self, service_seconds: float) -> None:
+        """Hand the slot to the highest-priority waiter, or free it"""
+        self._avg_service_seconds = 0.9 * self._avg_service_seconds + 0.1 * service_seconds
+        while self._heap:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue  # Timed out, cancelled or evicted
+            self._leave(waiter)
+            waiter.future.set_result(None)
+            return
+        self.in_flight -= 1
+
+    def summary(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_tier": {t: self._queued.get(t, 0) for t in TIER_PRIORITY},
+            "avg_service_seconds": round(self._avg_service_seconds, 3),
+            "tiers": {
+                t: {
+                    "admitted": self.admitted.get(t, 0),
+                    "shed": dict(self.shed.get(t, {})),
+                    "wait_p50_seconds": self.wait[t].quantile(0.5) if t in self.wait else None,
+                    "wait_p99_seconds": self.wait[t].quantile(0.99) if t in self.wait else None,
+                }
+                for t in TIER_PRIORITY
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP pathwise_ai_admission_in_flight AI requests currently admitted",
+            "# TYPE pathwise_ai_admission_in_flight gauge",
+            f"pathwise_ai_admission_in_flight {self.in_flight}",
+            "# HELP pathwise_ai_admission_queue_depth AI requests waiting for admission by tier",
+            "# TYPE pathwise_ai_admission_queue_depth gauge",
+            *(f'pathwise_ai_admission_queue_depth{{tier="{t}"}} {self._queued.get(t, 0)}' for t in TIER_PRIORITY),
+            "# HELP pathwise_ai_admission_admitted_total AI requests admitted by tier",
+            "# TYPE pathwise_ai_admission_admitted_total counter",
+            *(f'pathwise_ai_admission_admitted_total{{tier="{t}"}} {self.admitted.get(t, 0)}' for t in TIER_PRIORITY),
+            "# HELP pathwise_ai_admission_shed_total AI requests shed by tier and reason",
+            "# TYPE pathwise_ai_admission_shed_total counter",
+            *(
+                f'pathwise_ai_admission_shed_total{{tier="{t}",reason="{r}"}} {n}'
+                for t, reasons in sorted(self.shed.items()) for r, n in sorted(reasons.items())
+            ),
+            "# HELP pathwise_ai_admission_wait_seconds Time spent waiting for admission",
+            "# TYPE pathwise_ai_admission_wait_seconds histogram",
+        ]
+        for tier, hist in sorted(self.wait.items()):
+            for bound, total in hist.cumulative():
+                lines.append(f'pathwise_ai_admission_wait_seconds_bucket{{tier="{tier}",le="{bound}"}} {total}')
+            lines.append(f'pathwise_ai_admission_wait_seconds_sum{{tier="{tier}"}} {hist.sum}')
+            lines.append(f'pathwise_ai_admission_wait_seconds_count{{tier="{tier}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+admission_controller = AdmissionController(
+    capacity=settings.ADMISSION_MAX_CONCURRENT_REQUESTS,
+    max_queue_depth=settings.ADMISSION_MAX_QUEUE_DEPTH,
+    max_wait_seconds={
+        "enterprise": settings.ADMISSION_MAX_WAIT_ENTERPRISE_SECONDS,
+        "pro": settings.ADMISSION_MAX_WAIT_PRO_SECONDS,
+        "free": settings.ADMISSION_MAX_WAIT_FREE_SECONDS,
+    },
+)
+
+# user_id -> (tier, expires_at); tiers change rarely (payments webhook)
+_tier_cache: Dict[str, tuple] = {}
+
+
+async def _user_tier(user_id: str) -> str:
+    cached = _tier_cache.get(user_id)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    # Own short session so no connection is held while the request waits in the queue
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User.tier).where(User.id == uuid.UUID(user_id)))
+        tier = result.scalar_one_or_none() or "free"
+    if len(_tier_cache) > 10000:
+        _tier_cache.clear()
+    _tier_cache[user_id] = (tier, time.monotonic() + TIER_CACHE_SECONDS)
+    return tier
+
+
+async def ai_admission(user_id: str = Depends(get_current_user_id)):
+    """
+    Dependency for AI endpoints: waits for an admission slot or raises 503.
+
+    The slot is released when the handler returns. Streaming endpoints call
+    ticket.hold() and release from the stream once it finishes.
+    """
+    if not settings.ADMISSION_ENABLED:
+        yield AdmissionTicket(None, "free")
+        return
+
+    try:
+        ticket = await admission_controller.acquire(await _user_tier(user_id))
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is at capacity. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    try:
+        yield ticket
+    finally:
+        if not ticket.held:
+            ticket.release()
@@ -1,12 +1,55 @@
+import asyncio
 import json
+import time
 import uuid
-from typing import Optional, List
-from openai import AsyncOpenAI
+import hashlib
+from typing import Optional, List, AsyncIterator, Tuple
 
 from app.core.config import settings
+from app.services.llm_gateway import llm_gateway, CircuitOpenError
+from app.services.json_stream import IncrementalArrayParser
+from app.services.llm_output import OutputValidationError, parse_json_content, validate_output
+from app.services.model_router import model_router
+from app.services.roadmap_cache import roadmap_cache, make_roadmap_cache_key, reassign_roadmap_ids
+from app.services.single_flight import coalesce
+from app.services.token_budget import token_budgeter, compact_json, count_tokens, truncate_text
+from app.schemas.ai_outputs import (
+    AIPhase,
+    AIPhaseDetail,
+    AIInterviewQuestions,
+    AIPortfolioContent,
+    AIRoadmap,
+    AIRoadmapOutline,
+)
+
+
+ROADMAP_RESOURCE_GUIDELINES = """CRITICAL RESOURCE URL GUIDELINES - FOLLOW EXACTLY:
+✅ HIGH-QUALITY FREE RESOURCES ONLY:
+- YouTube: Use specific VIDEO IDs or PLAYLIST IDs from verified channels
+  * Web Dev: Traversy Media, freeCodeCamp, Net Ninja, Web Dev Simplified
+  * Python: Corey Schafer, Tech With Tim, mCoding
+  * Data Science: StatQuest, Krish Naik, freeCodeCamp
+  * DevOps: TechWorld with Nana, NetworkChuck, KodeKloud
+- Official Documentation: MDN, Python.org, React.dev, FastAPI.tiangolo.com, etc.
+- Free Platforms: freeCodeCamp.org, The Odin Project, Scrimba, W3Schools
+- Quality Blogs: Real Python, CSS-Tricks, Smashing Magazine
+- Interactive: Codecademy, Khan Academy, LeetCode, HackerRank
 
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+❌ NEVER USE:
+- Broken or placeholder URLs
+- Generic course marketplace URLs without specific course IDs
+- Paid-only content unless it's highly rated
+- Outdated resources (pre-2020 unless it's timeless content)
+- Low-quality tutorial sites
+
+RESOURCE QUALITY REQUIREMENTS:
+- quality_score must be 0.7-1.0 for all resources
+- Each resource MUST have a specific, working URL
+- Prefer beginner-friendly resources for beginner skills
+- Include mix of video, documentation, and interactive resources
+- Duration estimates must be realistic
 
+"""
 
 ROADMAP_SYSTEM_PROMPT = """You are an expert career advisor and learning path designer. Your task is to analyze job descriptions and create comprehensive, personalized learning roadmaps.
 
@@ -83,33 +126,7 @@ Output your response as valid JSON with this structure:
   ]
 }
 
-CRITICAL RESOURCE URL GUIDELINES - FOLLOW EXACTLY:
-✅ HIGH-QUALITY FREE RESOURCES ONLY:
-- YouTube: Use specific VIDEO IDs or PLAYLIST IDs from verified channels
-  * Web Dev: Traversy Media, freeCodeCamp, Net Ninja, Web Dev Simplified
-  * Python: Corey Schafer, Tech With Tim, mCoding
-  * Data Science: StatQuest, Krish Naik, freeCodeCamp
-  * DevOps: TechWorld with Nana, NetworkChuck, KodeKloud
-- Official Documentation: MDN, Python.org, React.dev, FastAPI.tiangolo.com, etc.
-- Free Platforms: freeCodeCamp.org, The Odin Project, Scrimba, W3Schools
-- Quality Blogs: Real Python, CSS-Tricks, Smashing Magazine
-- Interactive: Codecademy, Khan Academy, LeetCode, HackerRank
-
-❌ NEVER USE:
-- Broken or placeholder URLs
-- Generic course marketplace URLs without specific course IDs
-- Paid-only content unless it's highly rated
-- Outdated resources (pre-2020 unless it's timeless content)
-- Low-quality tutorial sites
-
-RESOURCE QUALITY REQUIREMENTS:
-- quality_score must be 0.7-1.0 for all resources
-- Each resource MUST have a specific, working URL
-- Prefer beginner-friendly resources for beginner skills
-- Include mix of video, documentation, and interactive resources
-- Duration estimates must be realistic
-
-Guidelines:
+""" + ROADMAP_RESOURCE_GUIDELINES + """Guidelines:
 - Create 4-6 phases, progressing from foundational to advanced (LONGER ROADMAPS)
 - Include 5-8 skills per phase (MORE COMPREHENSIVE)
 - Order skills by INTERVIEW FREQUENCY within phases
@@ -123,21 +140,98 @@ Guidelines:
 - Generate unique UUIDs for all id fields
 - ALWAYS include interview_frequency for each skill"""
 
+# Two-stage ("fanout") generation: a short skeleton call, then one detail call per phase
+ROADMAP_SKELETON_PROMPT = """You are an expert career advisor and learning path designer. Analyze the job description and produce the OUTLINE of a personalized learning roadmap. Detailed explanations and resources are generated separately for each phase, so do NOT include them.
 
-async def generate_roadmap(
+Output your response as valid JSON with this structure:
+{
+  "job_title": "extracted job title",
+  "industry": "detected industry",
+  "estimated_weeks": number,
+  "why_this_roadmap": "Brief explanation of why skills are ordered this way",
+  "phases": [
+    {
+      "name": "Phase Name",
+      "description": "Brief description",
+      "order": 1,
+      "estimated_weeks": number,
+      "skills": [
+        {
+          "name": "Skill Name",
+          "category": "technical|soft|domain",
+          "difficulty": "beginner|intermediate|advanced",
+          "importance": "critical|important|optional",
+          "interview_frequency": number (percentage of interviews that test this),
+          "estimated_hours": number
+        }
+      ]
+    }
+  ],
+  "projects": [
+    {
+      "title": "Project Title",
+      "description": "Project description",
+      "difficulty": "beginner|intermediate|advanced",
+      "estimated_hours": number,
+      "skills": ["skill names used"],
+      "resume_bullet": "How to describe this on resume",
+      "interview_talking_points": ["point 1", "point 2"],
+      "steps": ["step 1", "step 2", ...]
+    }
+  ]
+}
+
+Guidelines:
+- Create 4-6 phases, progressing from foundational to advanced
+- Include 5-8 skills per phase, ordered by INTERVIEW FREQUENCY
+- Total roadmap should be 12-20 weeks for complete mastery
+- Recommend 2-4 portfolio projects of increasing complexity
+- Adjust difficulty based on the user's stated skill level"""
+
+ROADMAP_PHASE_PROMPT = """You are an expert career advisor and learning path designer. You are given ONE phase of a learning roadmap for a target role. For EVERY skill listed in the phase, explain why it matters and recommend learning resources.
+
+Output your response as valid JSON with this structure:
+{
+  "skills": [
+    {
+      "name": "Skill Name (exactly as given)",
+      "description": "Brief skill description",
+      "why_this_matters": "Explain why this skill is critical for the role",
+      "what_if_skipped": "Consequences of skipping this skill",
+      "resources": [
+        {
+          "title": "Resource Title",
+          "url": "https://example.com",
+          "type": "video|article|course|documentation|book",
+          "difficulty": "beginner|intermediate|advanced",
+          "duration_minutes": number,
+          "quality_score": 0.0-1.0
+        }
+      ]
+    }
+  ]
+}
+
+""" + ROADMAP_RESOURCE_GUIDELINES + """Guidelines:
+- Each skill MUST have 5-8 high-quality resources
+- Mix resource types: 2-3 videos, 1-2 documentation links, 1-2 interactive, 1-2 articles
+- Match resource difficulty to the skill difficulty and the user's skill level"""
+
+# Changes whenever a roadmap prompt is edited, so cached roadmaps from an older prompt are not reused
+ROADMAP_PROMPT_VERSION = hashlib.sha256(
+    (ROADMAP_SYSTEM_PROMPT + ROADMAP_SKELETON_PROMPT + ROADMAP_PHASE_PROMPT).encode("utf-8")
+).hexdigest()[:12]
+
+
+def _build_roadmap_user_prompt(
     job_description: str,
     skill_level: str,
     industry: Optional[str] = None
-) -> dict:
-    """Generate a learning roadmap using Emergent LLM."""
-    
-    print(f"🎯 Generating roadmap for: {job_description[:100]}...")
-    print(f"📊 Skill level: {skill_level}, Industry: {industry}")
-    
-    user_prompt = f"""Create a detailed learning roadmap for this job/career goal:
+) -> str:
+    return f"""Create a detailed learning roadmap for this job/career goal:
 
 Description:
-{job_description}
+{token_budgeter.fit_text("roadmap", job_description, settings.PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS)}
 
 User's Current Skill Level: {skill_level}
 {f"Industry: {industry}" if industry else ""}
@@ -152,56 +246,407 @@ IMPORTANT:
 Generate a complete learning path with phases, skills, high-quality resources (with real URLs), and projects.
 Output as valid JSON."""
 
+
+def _ensure_phase_ids(phase: dict) -> dict:
+    """Fill in missing IDs and interview_frequency for a phase and its skills/resources."""
+    if not phase.get("id"):
+        phase["id"] = str(uuid.uuid4())
+    for skill in phase.get("skills", []):
+        if not skill.get("id"):
+            skill["id"] = str(uuid.uuid4())
+        # Ensure interview_frequency exists
+        if not skill.get("interview_frequency"):
+            skill["interview_frequency"] = 50  # Default
+        for resource in skill.get("resources", []):
+            if not resource.get("id"):
+                resource["id"] = str(uuid.uuid4())
+    return phase
+
+
+def _ensure_project_ids(project: dict) -> dict:
+    if not project.get("id"):
+        project["id"] = str(uuid.uuid4())
+    return project
+
+
+def _roadmap_error(e: Exception) -> Exception:
+    """Translate a provider error into a user-facing message."""
+    error_msg = str(e)
+    print(f"❌ AI roadmap generation error: {error_msg}")
+    
+    if "rate_limit" in error_msg.lower():
+        return Exception("OpenAI API rate limit reached. Please try again in a moment.")
+    elif "api_key" in error_msg.lower() or "authentication" in error_msg.lower():
+        return Exception("OpenAI API key is invalid or missing. Please contact support.")
+    elif "timeout" in error_msg.lower():
+        return Exception("AI generation timed out. Please try with a shorter description.")
+    else:
+        return Exception(f"AI generation failed: {error_msg}")
+
+
+def _roadmap_features(stream: bool = False) -> Tuple[str, ...]:
+    """LLM features a roadmap request will call in the configured generation mode"""
+    if settings.ROADMAP_GENERATION_MODE == "fanout":
+        return ("roadmap_outline", "roadmap_phase_detail")
+    return ("roadmap_stream",) if stream else ("roadmap",)
+
+
+def _roadmap_cache_key(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str],
+    stream: bool = False
+) -> str:
+    """Cache key under the models the roadmap calls will actually use, SLO downgrades included"""
+    models = ",".join(model_router.select(feature)[1] for feature in _roadmap_features(stream))
+    return make_roadmap_cache_key(job_description, skill_level, industry, models, ROADMAP_PROMPT_VERSION)
+
+
+def _routing_changed(
+    cache_key: str,
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str],
+    stream: bool = False
+) -> bool:
+    """True when a downgrade started or ended mid-generation, so the result may mix models"""
+    if _roadmap_cache_key(job_description, skill_level, industry, stream) == cache_key:
+        return False
+    print("⚠ Not caching roadmap: model routing changed during generation")
+    return True
+
+
+def _usage_tokens(response) -> int:
+    return response.usage.total_tokens if getattr(response, "usage", None) else 0
+
+
+async def _generate_roadmap_single(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str]
+) -> Tuple[dict, int]:
+    """Whole roadmap in one completion. Returns (roadmap, total_tokens)."""
+    print("🤖 Calling OpenAI API...")
+    response = await llm_gateway.complete(
+        feature="roadmap",
+        messages=[
+            {"role": "system", "content": ROADMAP_SYSTEM_PROMPT},
+            {"role": "user", "content": _build_roadmap_user_prompt(job_description, skill_level, industry)}
+        ],
+        response_format={"type": "json_object"}
+    )
+    print("✅ OpenAI response received")
+    roadmap = await validate_output(AIRoadmap, parse_json_content(response.choices[0].message.content), "roadmap")
+    return roadmap, _usage_tokens(response)
+
+
+async def _generate_roadmap_skeleton(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str]
+) -> Tuple[dict, int]:
+    """Phases and skill names only; small enough to come back quickly and untruncated."""
+    response = await llm_gateway.complete(
+        feature="roadmap_outline",
+        messages=[
+            {"role": "system", "content": ROADMAP_SKELETON_PROMPT},
+            {"role": "user", "content": _build_roadmap_user_prompt(job_description, skill_level, industry)}
+        ],
+        response_format={"type": "json_object"}
+    )
+    skeleton = await validate_output(
+        AIRoadmapOutline, parse_json_content(response.choices[0].message.content), "roadmap_outline"
+    )
+    print(f"🦴 Roadmap outline: {skeleton.get('job_title', 'Unknown')} with {len(skeleton['phases'])} phases")
+    return skeleton, _usage_tokens(response)
+
+
+def _merge_phase_detail(phase: dict, detail: dict) -> dict:
+    """Copy per-skill detail onto the outline's skills, matching by name then by position."""
+    detailed = detail.get("skills", []) if isinstance(detail, dict) else []
+    by_name = {(d.get("name") or "").strip().lower(): d for d in detailed}
+    for i, skill in enumerate(phase.get("skills", [])):
+        match = by_name.get((skill.get("name") or "").strip().lower())
+        if match is None and i < len(detailed):
+            match = detailed[i]
+        if match:
+            for field in ("description", "why_this_matters", "what_if_skipped", "resources"):
+                if match.get(field):
+                    skill[field] = match[field]
+        skill.setdefault("resources", [])
+    return phase
+
+
+async def _generate_phase_detail(
+    skeleton: dict,
+    phase: dict,
+    skill_level: str
+) -> Tuple[dict, int, bool]:
+    """
+    Fill in one phase. Failures (including truncated JSON) retry this phase
+    only; after the last attempt the outline phase is kept as-is so one bad
+    phase does not sink the whole roadmap.
+
+    Returns (phase, tokens, complete); complete is False when the outline was
+    kept or skill detail had to be dropped.
+    """
+    prompt = f"""Target role: {skeleton.get('job_title', 'Not specified')}
+Industry: {skeleton.get('industry', 'Not specified')}
+User's Current Skill Level: {skill_level}
+
+Phase {phase.get('order', '')}: {phase.get('name', '')}
+{phase.get('description', '')}
+
+Skills:
+{compact_json([{k: s.get(k) for k in ("name", "difficulty", "importance")} for s in phase.get("skills", [])])}
+
+Output as valid JSON."""
+
+    tokens = 0
+    for attempt in range(1, settings.ROADMAP_PHASE_MAX_ATTEMPTS + 1):
+        try:
+            response = await llm_gateway.complete(
+                feature="roadmap_phase_detail",
+                messages=[
+                    {"role": "system", "content": ROADMAP_PHASE_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            tokens += _usage_tokens(response)
+            detail = await validate_output(
+                AIPhaseDetail, parse_json_content(response.choices[0].message.content), "roadmap_phase_detail"
+            )
+            return _merge_phase_detail(phase, detail), tokens, not detail.dropped
+        except CircuitOpenError:
+            break
+        except Exception as e:
+            print(f"⚠ Phase '{phase.get('name', 'Unnamed')}' detail failed (attempt {attempt}): {e}")
+
+    print(f"⚠ Keeping outline for phase '{phase.get('name', 'Unnamed')}' without detail")
+    for skill in phase.get("skills", []):
+        skill.setdefault("resources", [])
+    return phase, tokens, False
+
+
+async def _fanout_roadmap(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str],
+    usage: dict
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Two-stage generation: outline first, then every phase in parallel.
+
+    Yields ("phase", phase) in completion order, then ("roadmap", result) with
+    phases in their original order. Total tokens are accumulated in `usage`,
+    and usage["incomplete"] lists outline fragments or phases left without detail.
+    """
+    skeleton, tokens = await _generate_roadmap_skeleton(job_description, skill_level, industry)
+    usage["total_tokens"] = tokens
+    usage["incomplete"] = [f"outline {path}" for path in skeleton.dropped]
+    phases = skeleton["phases"]
+    for i, phase in enumerate(phases):
+        if not phase.get("order"):
+            phase["order"] = i + 1
+
+    semaphore = asyncio.Semaphore(settings.ROADMAP_FANOUT_CONCURRENCY)
+
+    async def detail(phase: dict) -> Tuple[dict, int, bool]:
+        async with semaphore:
+            return await _generate_phase_detail(skeleton, phase, skill_level)
+
+    tasks = [asyncio.create_task(detail(phase)) for phase in phases]
     try:
-        print("🤖 Calling OpenAI API...")
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": ROADMAP_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4000,
-            response_format={"type": "json_object"}
-        )
+        for next_done in asyncio.as_completed(tasks):
+            phase, phase_tokens, complete = await next_done
+            usage["total_tokens"] += phase_tokens
+            if not complete:
+                usage["incomplete"].append(f"phase '{phase.get('name', 'Unnamed')}'")
+            yield "phase", _ensure_phase_ids(phase)
+    finally:
+        # Consumer went away (client disconnect) or a task raised: stop the rest
+        for task in tasks:
+            task.cancel()
+
+    skeleton["phases"] = sorted(phases, key=lambda p: p.get("order") or 0)
+    yield "roadmap", skeleton
+
+
+@coalesce("generate_roadmap", share=reassign_roadmap_ids)
+async def generate_roadmap(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str] = None
+) -> dict:
+    """Generate a learning roadmap using Emergent LLM."""
+    
+    print(f"🎯 Generating roadmap for: {job_description[:100]}...")
+    print(f"📊 Skill level: {skill_level}, Industry: {industry}")
+    
+    cache_key = _roadmap_cache_key(job_description, skill_level, industry)
+    if settings.ROADMAP_CACHE_ENABLED:
+        cached = await roadmap_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Roadmap cache hit: {cached.get('job_title', 'Unknown')}")
+            return reassign_roadmap_ids(cached)
+    
+    try:
+        started_at = time.monotonic()
+        incomplete: List[str] = []
+        if settings.ROADMAP_GENERATION_MODE == "fanout":
+            usage = {"total_tokens": 0}
+            result = None
+            async for event, payload in _fanout_roadmap(job_description, skill_level, industry, usage):
+                if event == "roadmap":
+                    result = payload
+            total_tokens = usage["total_tokens"]
+            incomplete = usage["incomplete"]
+        else:
+            result, total_tokens = await _generate_roadmap_single(job_description, skill_level, industry)
+            incomplete = result.dropped
         
-        print("✅ OpenAI response received")
-        result = json.loads(response.choices[0].message.content)
         print(f"📦 Roadmap generated: {result.get('job_title', 'Unknown')} with {len(result.get('phases', []))} phases")
         
         # Ensure all IDs are present
         for phase in result.get("phases", []):
-            if not phase.get("id"):
-                phase["id"] = str(uuid.uuid4())
-            for skill in phase.get("skills", []):
-                if not skill.get("id"):
-                    skill["id"] = str(uuid.uuid4())
-                # Ensure interview_frequency exists
-                if not skill.get("interview_frequency"):
-                    skill["interview_frequency"] = 50  # Default
-                for resource in skill.get("resources", []):
-                    if not resource.get("id"):
-                        resource["id"] = str(uuid.uuid4())
-        
+            _ensure_phase_ids(phase)
         for project in result.get("projects", []):
-            if not project.get("id"):
-                project["id"] = str(uuid.uuid4())
+            _ensure_project_ids(project)
+        
+        if incomplete:
+            # Served to this caller, but not handed to everyone with the same job description for a week
+            print(f"⚠ Not caching incomplete roadmap (missing: {', '.join(incomplete)})")
+        elif (
+            settings.ROADMAP_CACHE_ENABLED
+            and result.get("phases")
+            and not _routing_changed(cache_key, job_description, skill_level, industry)
+        ):
+            await roadmap_cache.set(
+                cache_key,
+                result,
+                total_tokens=total_tokens,
+                latency_seconds=time.monotonic() - started_at,
+            )
         
         return result
         
     except Exception as e:
-        error_msg = str(e)
-        print(f"❌ AI roadmap generation error: {error_msg}")
+        raise _roadmap_error(e)
+
+
+async def stream_roadmap(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str] = None
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Stream a roadmap as it is generated.
+
+    Yields ("phase", phase) and ("project", project) as soon as each element
+    has been parsed from the token stream, then ("roadmap", full_result) once
+    the document is complete. IDs in the final result match the streamed ones.
+    """
+    print(f"🎯 Streaming roadmap for: {job_description[:100]}...")
+    
+    cache_key = _roadmap_cache_key(job_description, skill_level, industry, stream=True)
+    if settings.ROADMAP_CACHE_ENABLED:
+        cached = await roadmap_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Roadmap cache hit: {cached.get('job_title', 'Unknown')}")
+            result = reassign_roadmap_ids(cached)
+            for phase in result.get("phases", []):
+                yield "phase", phase
+            for project in result.get("projects", []):
+                yield "project", project
+            yield "roadmap", result
+            return
+    
+    if settings.ROADMAP_GENERATION_MODE == "fanout":
+        usage = {"total_tokens": 0}
+        started_at = time.monotonic()
+        try:
+            async for event, payload in _fanout_roadmap(job_description, skill_level, industry, usage):
+                if event == "phase":
+                    print(f"📦 Streamed phase: {payload.get('name', 'Unnamed')}")
+                    yield "phase", payload
+                else:
+                    result = payload
+        except Exception as e:
+            raise _roadmap_error(e)
         
-        # Provide more helpful error messages
-        if "rate_limit" in error_msg.lower():
-            raise Exception("OpenAI API rate limit reached. Please try again in a moment.")
-        elif "api_key" in error_msg.lower() or "authentication" in error_msg.lower():
-            raise Exception("OpenAI API key is invalid or missing. Please contact support.")
-        elif "timeout" in error_msg.lower():
-            raise Exception("AI generation timed out. Please try with a shorter description.")
-        else:
-            raise Exception(f"AI generation failed: {error_msg}")
+        for project in result.get("projects", []):
+            yield "project", _ensure_project_ids(project)
+        
+        if usage["incomplete"]:
+            print(f"⚠ Not caching incomplete roadmap (missing: {', '.join(usage['incomplete'])})")
+        elif settings.ROADMAP_CACHE_ENABLED and not _routing_changed(
+            cache_key, job_description, skill_level, industry, stream=True
+        ):
+            await roadmap_cache.set(
+                cache_key,
+                result,
+                total_tokens=usage["total_tokens"],
+                latency_seconds=time.monotonic() - started_at,
+            )
+        
+        yield "roadmap", result
+        return
+    
+    user_prompt = _build_roadmap_user_prompt(job_description, skill_level, industry)
+    parser = IncrementalArrayParser(["phases", "projects"])
+    phases: List[dict] = []
+    projects: List[dict] = []
+    incomplete: List[str] = []
+    
+    try:
+        started_at = time.monotonic()
+        async for delta in llm_gateway.stream(
+            feature="roadmap_stream",
+            messages=[
+                {"role": "system", "content": ROADMAP_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"},
+        ):
+            for key, item in parser.feed(delta):
+                if key == "phases":
+                    try:
+                        item = await validate_output(AIPhase, item, "roadmap_stream")
+                    except OutputValidationError as e:
+                        print(f"⚠ Skipping streamed phase: {e}")
+                        incomplete.append(f"phase '{item.get('name', 'Unnamed') if isinstance(item, dict) else 'Unnamed'}'")
+                        continue
+                    incomplete.extend(f"phase '{item.get('name', 'Unnamed')}' {path}" for path in item.dropped)
+                    phases.append(_ensure_phase_ids(item))
+                    print(f"📦 Streamed phase {len(phases)}: {item.get('name', 'Unnamed')}")
+                    yield "phase", item
+                else:
+                    projects.append(_ensure_project_ids(item))
+                    yield "project", item
+        
+        result = parser.document()
+    except Exception as e:
+        raise _roadmap_error(e)
+    
+    result["phases"] = phases
+    result["projects"] = projects
+    print(f"✅ Roadmap stream complete: {result.get('job_title', 'Unknown')} with {len(phases)} phases")
+    
+    if incomplete:
+        print(f"⚠ Not caching incomplete roadmap (missing: {', '.join(incomplete)})")
+    elif (
+        settings.ROADMAP_CACHE_ENABLED
+        and phases
+        and not _routing_changed(cache_key, job_description, skill_level, industry, stream=True)
+    ):
+        await roadmap_cache.set(
+            cache_key,
+            result,
+            latency_seconds=time.monotonic() - started_at,
+        )
+    
+    yield "roadmap", result
 
 
 CHAT_SYSTEM_PROMPT = """You are PathWise AI, a world-class career and learning assistant. You help users with:
@@ -218,13 +663,11 @@ RULES:
 - Always focus on what helps the user GET HIRED"""
 
 
-async def chat_response(
+def _build_chat_messages(
     message: str,
     conversation_history: List[dict],
     roadmap_context: Optional[dict] = None
-) -> str:
-    """Generate a chat response using Emergent LLM."""
-    
+) -> List[dict]:
     system_msg = CHAT_SYSTEM_PROMPT
     
     # Add roadmap context if available
@@ -236,21 +679,27 @@ User's Current Roadmap Context:
 - Progress: {roadmap_context.get('completion_percentage', 0)}%
 - Current Phase: {roadmap_context.get('current_phase', 'Not started')}"""
     
+    # Recent history within the budget; older turns are summarized
+    return token_budgeter.fit_chat(
+        "chat", system_msg, conversation_history, message,
+        max_tokens=settings.PROMPT_BUDGET_CHAT_TOKENS,
+        max_turns=10,
+    )
+
+
+async def chat_response(
+    message: str,
+    conversation_history: List[dict],
+    roadmap_context: Optional[dict] = None
+) -> str:
+    """Generate a chat response using Emergent LLM."""
+    
     try:
-        messages = [{"role": "system", "content": system_msg}]
-        
-        # Add conversation history
-        for msg in conversation_history[-10:]:
-            messages.append({"role": msg["role"], "content": msg["content"]})
+        messages = _build_chat_messages(message, conversation_history, roadmap_context)
         
-        # Add current message
-        messages.append({"role": "user", "content": message})
-        
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="chat_response",
             messages=messages,
-            temperature=0.7,
-            max_tokens=1000,
         )
         
         return response.choices[0].message.content
@@ -260,53 +709,23 @@ User's Current Roadmap Context:
         raise
 
 
-RESUME_ANALYSIS_PROMPT = """Analyze this resume and provide:
-1. A list of identified skills with proficiency levels
-2. Years of experience estimation
-3. Strengths and areas for improvement
-4. Recommendations for the target role (if provided)
-
-Be HONEST - no sugar-coating. The user needs to know their real gaps.
-
-Output as JSON:
-{
-  "skills": [{"name": "skill", "proficiency": "beginner|intermediate|advanced"}],
-  "experience_years": number,
-  "strengths": ["strength 1", "strength 2"],
-  "improvements": ["area 1", "area 2"],
-  "recommendations": ["recommendation 1", "recommendation 2"],
-  "match_score": 0-100 (if target role provided)
-}"""
-
-
-async def analyze_resume(
-    resume_text: str,
-    target_role: Optional[str] = None
-) -> dict:
-    """Analyze a resume using OpenAI."""
+async def stream_chat_response(
+    message: str,
+    conversation_history: List[dict],
+    roadmap_context: Optional[dict] = None
+) -> AsyncIterator[str]:
+    """Stream a chat response token by token. Closing the iterator aborts the upstream call."""
+    
+    messages = _build_chat_messages(message, conversation_history, roadmap_context)
     
-    user_prompt = f"""Analyze this resume:
-
-{resume_text}
-
-{f"Target Role: {target_role}" if target_role else ""}"""
-
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": RESUME_ANALYSIS_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.5,
-            max_tokens=2000,
-            response_format={"type": "json_object"}
-        )
-        
-        return json.loads(response.choices[0].message.content)
-        
+        async for token in llm_gateway.stream(
+            feature="stream_chat_response",
+            messages=messages,
+        ):
+            yield token
     except Exception as e:
-        print(f"Resume analysis error: {e}")
+        print(f"AI chat stream error: {e}")
         raise
 
 
@@ -337,24 +756,25 @@ Generate:
 Output as JSON with keys: tagline, bio, resume_bullets, linkedin_posts, projects, certificates"""
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_portfolio_content",
             messages=[
                 {"role": "system", "content": "You are a career coach helping users create compelling portfolios."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000,
             response_format={"type": "json_object"}
         )
         
-        return json.loads(response.choices[0].message.content)
+        return await validate_output(
+            AIPortfolioContent, parse_json_content(response.choices[0].message.content), "generate_portfolio_content"
+        )
         
     except Exception as e:
         print(f"Portfolio generation error: {e}")
         raise
 
 
+@coalesce("generate_interview_questions")
 async def generate_interview_questions(
     session_type: str,
     target_role: str,
@@ -424,19 +844,23 @@ Output as JSON with this EXACT format:
 }}"""
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_interview_questions",
             messages=[
                 {"role": "system", "content": f"You are an expert {session_type} interviewer at a top tech company. Generate ONLY {session_type} questions."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
-        questions = result.get("questions", result if isinstance(result, list) else [])
+        result = parse_json_content(response.choices[0].message.content)
+        if isinstance(result, list):
+            result = {"questions": result}
+        validated = await validate_output(AIInterviewQuestions, result, "generate_interview_questions")
+        questions = validated["questions"]
+        for i, question in enumerate(questions):
+            question.setdefault("id", f"q{i + 1}")
+            question.setdefault("type", session_type)
         
         print(f"✅ Generated {len(questions)} {session_type} questions")
         return questions
@@ -454,14 +878,30 @@ async def evaluate_interview_response(
 ) -> dict:
     """Evaluate interview responses"""
     
-    evaluation_data = {
-        "questions": questions,
-        "responses": responses
-    }
+    # Pair each question with its answer and keep only what grading needs;
+    # hints, timestamps and bank metadata are dropped
+    answers = {r.get("question_id"): r.get("response", "") for r in responses or []}
+    per_answer_tokens = settings.PROMPT_BUDGET_INTERVIEW_EVAL_TOKENS // max(len(questions or []), 1)
+    evaluation_data = [
+        {
+            "id": q.get("id"),
+            "type": q.get("type"),
+            "question": q.get("question"),
+            "ideal_answer": truncate_text(q.get("ideal_answer") or "", per_answer_tokens // 3),
+            "answer": truncate_text(answers.get(q.get("id")) or "", per_answer_tokens) or "(no answer)",
+        }
+        for q in questions or []
+    ]
+    interview_data = compact_json(evaluation_data)
+    token_budgeter.record(
+        "interview_evaluation",
+        count_tokens(json.dumps({"questions": questions, "responses": responses}, indent=2)),
+        count_tokens(interview_data),
+    )
     
     prompt = f"""Evaluate this {session_type} interview for a {target_role} position.
 
-Interview data: {json.dumps(evaluation_data, indent=2)}
+Interview data: {interview_data}
 
 Provide:
 1. Overall score (0-100)
@@ -473,14 +913,12 @@ Provide:
 Be HONEST but constructive. Output as JSON."""
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="evaluate_interview_response",
             messages=[
                 {"role": "system", "content": "You are an expert interview evaluator providing honest, constructive feedback."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=2000,
             response_format={"type": "json_object"}
         )
         
@@ -0,0 +1,229 @@
+"""
+Idempotency Keys
+Safe client retries for expensive POST endpoints.
+
+A request carrying an `Idempotency-Key` header claims (user, scope, key) in
+the idempotency_keys table before doing any work. Then:
+- the first request runs and its response is stored for IDEMPOTENCY_TTL_SECONDS
+- duplicates arriving while it runs wait for it (event in-process, polling across workers)
+- later duplicates get the stored response, marked with `Idempotent-Replayed: true`
+- reusing a key with a different request body is rejected with 422
+
+Failed requests release the key so the client can retry. While the handler
+runs, its claim is extended every third of IDEMPOTENCY_LOCK_SECONDS, so a
+slow generation (timeouts times retries) never loses the key to a duplicate.
+A claim whose worker died stops being extended and is taken over once
+IDEMPOTENCY_LOCK_SECONDS have passed.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(payload: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, ttl_seconds: int, lock_seconds: int, wait_seconds: float, poll_interval: float):
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        # Claims owned by this process; set when the outcome is stored or released
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Event] = {}
+        self.replays = 0
+        self.waits = 0
+
+    async def _claim(self, user_id: str, scope: str, key: str, fingerprint: str) -> Optional[dict]:
+        """None if this request now owns the key, else the stored outcome of the original request"""
+        local_key = (user_id, scope, key)
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while True:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(IdempotencyKey).where(
+                        IdempotencyKey.user_id == uuid.UUID(user_id),
+                        IdempotencyKey.scope == scope,
+                        IdempotencyKey.key == key,
+                    )
+                )
+                record = result.scalar_one_or_none()
+                now = datetime.utcnow()
+
+                if record is not None and record.expires_at <= now:
+                    await session.delete(record)
+                    await session.flush()
+                    record = None
+
+                if record is None:
+                    session.add(IdempotencyKey(
+                        user_id=uuid.UUID(user_id),
+                        scope=scope,
+                        key=key,
+                        request_hash=fingerprint,
+                        status="in_progress",
+                        expires_at=now + timedelta(seconds=self.lock_seconds),
+                    ))
+                    try:
+                        await session.commit()
+                    except IntegrityError:
+                        await session.rollback()
+                        continue  # Another worker claimed it first
+                    self._inflight[local_key] = asyncio.Event()
+                    return None
+
+                if record.request_hash != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Idempotency-Key was already used with a different request body"
+                    )
+                if record.status == "completed":
+                    return {"status_code": record.status_code, "response": record.response}
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": str(max(1, int(self.poll_interval * 4)))},
+                )
+            if not waited:
+                waited = True
+                self.waits += 1
+                print(f"⏳ Waiting on in-flight request for idempotency key {scope}:{key[:16]}")
+            event = self._inflight.get(local_key)
+            try:
+                if event is not None:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+                else:
+                    await asyncio.sleep(min(self.poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _keep_claim(self, user_id: str, scope: str, key: str) -> None:
+        """Extend this request's in-progress claim until the handler finishes"""
+        while True:
+            await asyncio.sleep(self.lock_seconds / 3)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(
+                        update(IdempotencyKey)
+                        .where(
+                            IdempotencyKey.user_id == uuid.UUID(user_id),
+                            IdempotencyKey.scope == scope,
+                            IdempotencyKey.key == key,
+                            IdempotencyKey.status == "in_progress",
+                        )
+                        .values(expires_at=datetime.utcnow() + timedelta(seconds=self.lock_seconds))
+                    )
+                    await session.commit()
+            except Exception as e:
+                print(f"⚠ Failed to extend idempotency claim {scope}:{key[:16]}: {e}")
+
+    async def _finish(self, user_id: str, scope: str, key: str, status_code: Optional[int], body: Optional[dict]) -> None:
+        """Store the outcome, or release the claim when `body` is None"""
+        try:
+            async with AsyncSessionLocal() as session:
+                filters = (
+                    IdempotencyKey.user_id == uuid.UUID(user_id),
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                )
+                if body is None:
+                    await session.execute(delete(IdempotencyKey).where(*filters))
+                else:
+                    result = await session.execute(select(IdempotencyKey).where(*filters))
+                    record = result.scalar_one_or_none()
+                    if record is not None:
+                        record.status = "completed"
+                        record.status_code = status_code
+                        record.response = body
+                        record.expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                await session.commit()
+        except Exception as e:
+            print(f"⚠ Failed to update idempotency key {scope}:{key[:16]}: {e}")
+        finally:
+            event = self._inflight.pop((user_id, scope, key), None)
+            if event is not None:
+                event.set()
+
+    async def run(
+        self,
+        user_id: str,
+        scope: str,
+        key: Optional[str],
+        payload: dict,
+        response: Response,
+        handler: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Run `handler` once per (user, scope, key); duplicates get the first response"""
+        if not key or not settings.IDEMPOTENCY_ENABLED:
+            return await handler()
+        if len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"
+            )
+
+        stored = await self._claim(user_id, scope, key, request_fingerprint(payload))
+        if stored is not None:
+            self.replays += 1
+            print(f"♻️ Replaying stored response for idempotency key {scope}:{key[:16]}")
+            response.status_code = stored["status_code"]
+            response.headers["Idempotent-Replayed"] = "true"
+            return stored["response"]
+
+        keep_claim = asyncio.create_task(self._keep_claim(user_id, scope, key))
+        try:
+            body = await handler()
+        except BaseException:
+            keep_claim.cancel()
+            await asyncio.shield(self._finish(user_id, scope, key, None, None))
+            raise
+        keep_claim.cancel()
+
+        await self._finish(user_id, scope, key, response.status_code or status.HTTP_200_OK, jsonable_encoder(body))
+        return body
+
+    async def purge_expired(self) -> int:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "replays": self.replays,
+            "waits": self.waits,
+        }
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    poll_interval=settings.IDEMPOTENCY_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,289 @@
+"""
+Interview Question Bank Service
+Serves interview questions from a pre-generated bank instead of a live LLM call.
+
+Questions are bucketed by (session_type, role family, difficulty). A background
+refiller keeps every known bucket above a watermark, so starting a session is a
+few indexed DB reads (one random sample per bucket). Users never see the same
+banked question twice: served questions are recorded in
+interview_question_served and excluded in SQL. Live generation is only used
+when a bucket is cold (or exhausted for that user), and its output is banked
+for the next caller. Only one worker refills at a time (advisory lock).
+"""
+
+import asyncio
+import re
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.locks import try_advisory_lock
+from app.models.portfolio import InterviewQuestion, InterviewQuestionServed
+from app.services.ai_service import generate_interview_questions
+from app.services.llm_telemetry import llm_telemetry
+
+
+QUESTION_TYPES = ("coding", "system_design", "behavioral")
+DIFFICULTY_LEVELS = ("easy", "medium", "hard")
+DEFAULT_DIFFICULTY = "medium"
+
+# Questions per session, matching the counts requested from the generator
+SESSION_COMPOSITION = {
+    "coding": {"coding": 3},
+    "system_design": {"system_design": 3},
+    "behavioral": {"behavioral": 5},
+    "full_mock": {"coding": 2, "system_design": 2, "behavioral": 4},
+}
+
+# Role family -> (keywords, representative role used when refilling)
+ROLE_FAMILIES = {
+    "frontend": (["frontend", "front-end", "front end", "react", "angular", "vue", "ui engineer", "web developer"], "Frontend Engineer"),
+    "backend": (["backend", "back-end", "back end", "api", "server", "java developer", "python developer", "golang", "node"], "Backend Engineer"),
+    "fullstack": (["full stack", "fullstack", "full-stack"], "Full Stack Engineer"),
+    "mobile": (["mobile", "ios", "android", "flutter", "react native"], "Mobile Engineer"),
+    "data_engineering": (["data engineer", "etl", "data platform", "analytics engineer"], "Data Engineer"),
+    "data_science": (["data scientist", "data science", "data analyst", "analytics", "statistician"], "Data Scientist"),
+    "ml": (["machine learning", "ml engineer", "ai engineer", "deep learning", "nlp", "computer vision", "llm"], "Machine Learning Engineer"),
+    "devops": (["devops", "sre", "site reliability", "platform engineer", "cloud engineer", "infrastructure"], "DevOps Engineer"),
+    "security": (["security", "cyber", "penetration", "appsec"], "Security Engineer"),
+    "qa": (["qa", "quality assurance", "test engineer", "sdet"], "QA Engineer"),
+    "product": (["product manager", "product owner", "program manager"], "Product Manager"),
+}
+
+DEFAULT_ROLE_FAMILY = "general"
+DEFAULT_ROLE = "Software Engineer"
+
+# Buckets requested since startup; the refiller keeps these warm
+_demanded_buckets: Set[str] = set()
+
+
+def normalize_role_family(target_role: str) -> str:
+    """Map a free-form role title to a role family"""
+    role = (target_role or "").lower()
+    # Full stack first so "full stack react developer" is not classified as frontend
+    for family in ["fullstack"] + [f for f in ROLE_FAMILIES if f != "fullstack"]:
+        keywords, _ = ROLE_FAMILIES[family]
+        if any(re.search(rf"\b{re.escape(k)}\b", role) for k in keywords):
+            return family
+    return DEFAULT_ROLE_FAMILY
+
+
+def normalize_session_type(session_type: str) -> str:
+    value = (session_type or "").lower().strip()
+    return value if value in SESSION_COMPOSITION else "coding"
+
+
+def normalize_difficulty(difficulty: str) -> str:
+    """One of DIFFICULTY_LEVELS; free-form values fall back to medium so they never create buckets"""
+    value = (difficulty or "").lower().strip()
+    value = {"beginner": "easy", "intermediate": "medium", "advanced": "hard"}.get(value, value)
+    return value if value in DIFFICULTY_LEVELS else DEFAULT_DIFFICULTY
+
+
+def bucket_key(session_type: str, role_family: str, difficulty: str) -> str:
+    return f"{session_type}:{role_family}:{difficulty}"
+
+
+def _split_bucket(key: str) -> Optional[Tuple[str, str, str]]:
+    """(question type, role family, difficulty), or None for a key the refiller must not fill"""
+    parts = key.split(":")
+    if len(parts) != 3:
+        return None
+    q_type, role_family, difficulty = parts
+    if q_type not in QUESTION_TYPES or difficulty not in DIFFICULTY_LEVELS:
+        return None
+    if role_family not in ROLE_FAMILIES and role_family != DEFAULT_ROLE_FAMILY:
+        return None
+    return q_type, role_family, difficulty
+
+
+async def _sample_bucket(
+    db: AsyncSession,
+    key: str,
+    count: int,
+    user_uuid: uuid.UUID
+) -> Optional[List[InterviewQuestion]]:
+    """`count` random questions from a bucket that this user has not been served yet"""
+    already_served = (
+        select(InterviewQuestionServed.question_id)
+        .where(
+            InterviewQuestionServed.user_id == user_uuid,
+            InterviewQuestionServed.question_id == InterviewQuestion.id,
+        )
+        .exists()
+    )
+    result = await db.execute(
+        select(InterviewQuestion)
+        .where(InterviewQuestion.bucket_key == key, ~already_served)
+        .order_by(func.random())
+        .limit(count)
+    )
+    picked = result.scalars().all()
+    return list(picked) if len(picked) == count else None
+
+
+async def bank_questions(
+    db: AsyncSession,
+    session_type: str,
+    role_family: str,
+    difficulty: str,
+    questions: List[dict]
+) -> List[InterviewQuestion]:
+    """Store generated questions in their bucket"""
+    rows = []
+    for q in questions:
+        # full_mock sessions mix types, so each question is banked under its own type
+        q_type = q.get("type") if q.get("type") in QUESTION_TYPES else session_type
+        row = InterviewQuestion(
+            bucket_key=bucket_key(q_type, role_family, difficulty),
+            session_type=q_type,
+            role_family=role_family,
+            difficulty=difficulty,
+            question={k: v for k, v in q.items() if k not in ("id", "bank_id")},
+        )
+        db.add(row)
+        rows.append(row)
+    await db.flush()
+    return rows
+
+
+async def get_session_questions(
+    db: AsyncSession,
+    user_id: str,
+    session_type: str,
+    target_role: str,
+    difficulty: str
+) -> List[dict]:
+    """
+    Questions for a new interview session.
+
+    Samples from the bank without repeats for this user. When any required
+    bucket is cold, falls back to live generation and banks the result.
+    """
+    session_type = normalize_session_type(session_type)
+    role_family = normalize_role_family(target_role)
+    level = normalize_difficulty(difficulty)
+    composition = SESSION_COMPOSITION[session_type]
+
+    for q_type in composition:
+        _demanded_buckets.add(bucket_key(q_type, role_family, level))
+
+    if settings.INTERVIEW_BANK_ENABLED:
+        user_uuid = uuid.UUID(user_id)
+        sampled: List[InterviewQuestion] = []
+        for q_type, count in composition.items():
+            picked = await _sample_bucket(db, bucket_key(q_type, role_family, level), count, user_uuid)
+            if picked is None:
+                sampled = None
+                break
+            sampled.extend(picked)
+
+        llm_telemetry.record_cache("interview_question_bank", hit=bool(sampled))
+        if sampled:
+            await db.execute(
+                update(InterviewQuestion)
+                .where(InterviewQuestion.id.in_([q.id for q in sampled]))
+                .values(times_served=InterviewQuestion.times_served + 1)
+            )
+            db.add_all(InterviewQuestionServed(user_id=user_uuid, question_id=q.id) for q in sampled)
+            print(f"⚡ Served {len(sampled)} banked {session_type} questions ({role_family}/{level})")
+            return [
+                {**q.question, "id": f"q{i + 1}", "bank_id": str(q.id)}
+                for i, q in enumerate(sampled)
+            ]
+
+        print(f"🧊 Cold question bank for {session_type}:{role_family}:{level}, generating live")
+
+    questions = await generate_interview_questions(
+        session_type=session_type,
+        target_role=target_role,
+        difficulty=level
+    )
+
+    if settings.INTERVIEW_BANK_ENABLED and questions:
+        rows = await bank_questions(db, session_type, role_family, level, questions)
+        for q, row in zip(questions, rows):
+            q["bank_id"] = str(row.id)
+        db.add_all(InterviewQuestionServed(user_id=uuid.UUID(user_id), question_id=row.id) for row in rows)
+
+    return questions
+
+
+# ============================================================
+# BACKGROUND REFILLER
+# ============================================================
+
+async def _bucket_counts(db: AsyncSession, key: Optional[str] = None) -> Dict[str, int]:
+    query = select(InterviewQuestion.bucket_key, func.count(InterviewQuestion.id))
+    if key is not None:
+        query = query.where(InterviewQuestion.bucket_key == key)
+    result = await db.execute(query.group_by(InterviewQuestion.bucket_key))
+    return {bucket: count for bucket, count in result.all()}
+
+
+async def refill_once() -> int:
+    """Top up every known bucket that is below the watermark. Returns questions added."""
+    async with try_advisory_lock("interview_bank_refill") as acquired:
+        if not acquired:
+            # Another worker is refilling; buckets are shared, so one pass is enough
+            return 0
+        return await _refill_buckets()
+
+
+async def _refill_buckets() -> int:
+    """
+    Refill every bucket below the watermark
+
+    No session is held across the LLM calls: each bucket is counted in one
+    short session and its new questions are inserted in another.
+    """
+    async with AsyncSessionLocal() as db:
+        buckets = set(await _bucket_counts(db)) | _demanded_buckets
+
+    added = 0
+    for key in sorted(buckets):
+        parsed = _split_bucket(key)
+        if parsed is None:
+            _demanded_buckets.discard(key)
+            continue
+        session_type, role_family, level = parsed
+        _, role = ROLE_FAMILIES.get(role_family, (None, DEFAULT_ROLE))
+        try:
+            async with AsyncSessionLocal() as db:
+                count = (await _bucket_counts(db, key)).get(key, 0)
+            if count >= settings.INTERVIEW_BANK_WATERMARK:
+                continue
+            questions = await generate_interview_questions(
+                session_type=session_type,
+                target_role=role,
+                difficulty=level
+            )
+            async with AsyncSessionLocal() as db:
+                await bank_questions(db, session_type, role_family, level, questions)
+                await db.commit()
+        except Exception as e:
+            print(f"⚠ Question bank refill failed for {key}: {e}")
+            continue
+        added += len(questions)
+    return added
+
+
+async def run_refiller(stop_event: asyncio.Event) -> None:
+    """Refill loop started from the application lifespan"""
+    if not settings.INTERVIEW_BANK_ENABLED:
+        return
+    while not stop_event.is_set():
+        try:
+            added = await refill_once()
+            if added:
+                print(f"✅ Question bank refilled with {added} questions")
+        except Exception as e:
+            print(f"⚠ Question bank refill pass failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.INTERVIEW_BANK_REFILL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
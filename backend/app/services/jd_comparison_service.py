@@ -5,18 +5,17 @@ Allows users to save multiple JDs and compare skill requirements
 
 from typing import Dict, List
 from collections import Counter
-import json
 
-from openai import AsyncOpenAI
-from app.core.config import settings
+from app.services.llm_gateway import llm_gateway
+from app.services.llm_output import parse_json_content, validate_output
+from app.schemas.ai_outputs import AIJDSkills
+from app.services.single_flight import coalesce, make_key
 
 
 class JDComparisonService:
     """Service for comparing job descriptions"""
 
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-
+    @coalesce("extract_skills_from_jd", key_fn=lambda self, job_description: make_key(job_description))
     async def extract_skills_from_jd(self, job_description: str) -> Dict:
         """Extract skills and requirements from a job description"""
         prompt = f"""Analyze this job description and extract structured information.
@@ -40,20 +39,14 @@ Return a JSON object with:
 Be specific with skill names. Return ONLY valid JSON."""
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
+            response = await llm_gateway.complete(
+                feature="extract_skills_from_jd",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=1000
             )
             
-            content = response.choices[0].message.content.strip()
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            
-            return json.loads(content)
+            return await validate_output(
+                AIJDSkills, parse_json_content(response.choices[0].message.content), "extract_skills_from_jd"
+            )
         except Exception as e:
             print(f"Error extracting skills: {e}")
             return {
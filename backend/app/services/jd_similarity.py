@@ -0,0 +1,203 @@
+"""
+Near-Duplicate Job Description Index
+MinHash signatures + LSH banding over Roadmap.job_description shingles.
+
+Many roadmaps are generated from the same posting with whitespace or
+boilerplate differences. Before calling the LLM, create_roadmap asks this
+index for an existing roadmap at the same skill level whose description is
+above the similarity threshold, and clones it instead.
+
+- Word 5-gram shingles over normalized text
+- 128 permutation MinHash signatures (multiply-shift hashing of 64-bit
+  shingle hashes), vectorised with numpy when it is installed and computed
+  in a worker thread otherwise, so signatures never block the event loop
+- 16 bands x 8 rows for candidate lookup, verified by signature agreement
+- Incremental add/remove; bounded-time rebuild from the DB at startup
+"""
+
+import asyncio
+import hashlib
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import or_, select
+
+from app.core.config import settings
+from app.db.models import Roadmap
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+_MASK_64 = (1 << 64) - 1
+_MAX_HASH = 1 << 32  # Above every 32-bit permuted value; signature of empty text
+
+
+def shingles(text: str, k: int = 5) -> Set[int]:
+    """Hashed word k-gram shingles of normalized text"""
+    words = re.sub(r"[^a-z0-9+#.\s]", " ", (text or "").lower()).split()
+    if not words:
+        return set()
+    k = min(k, len(words))
+    grams = (" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+        for g in grams
+    }
+
+
+class MinHasher:
+    """Fixed family of hash permutations shared by every signature in an index"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        # h(x) = ((a * x + b) mod 2^64) >> 32 with odd a; wraps natively in uint64 arrays
+        self._params = [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self._params], dtype=np.uint64)[:, None]
+            self._b = np.array([b for _, b in self._params], dtype=np.uint64)[:, None]
+
+    @property
+    def vectorized(self) -> bool:
+        return np is not None
+
+    def signature(self, shingle_hashes: Set[int]) -> Tuple[int, ...]:
+        if not shingle_hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        if np is not None:
+            x = np.fromiter(shingle_hashes, dtype=np.uint64, count=len(shingle_hashes))
+            permuted = (self._a * x + self._b) >> np.uint64(32)
+            return tuple(permuted.min(axis=1).tolist())
+        return tuple(
+            min(((a * x + b) & _MASK_64) >> 32 for x in shingle_hashes)
+            for a, b in self._params
+        )
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity from two MinHash signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class JDSimilarityIndex:
+    """LSH index of roadmap job descriptions, partitioned by skill level"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.85):
+        assert num_perm % bands == 0, "num_perm must be divisible by bands"
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[str, int, int], Set[str]] = defaultdict(set)
+        self._signatures: Dict[str, Tuple[str, Tuple[int, ...]]] = {}
+        self.ready = False
+        self.lookups = 0
+        self.matches = 0
+
+    def _band_keys(self, skill_level: str, signature: Tuple[int, ...]):
+        level = (skill_level or "").lower()
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield (level, band, hash(chunk))
+
+    def _signature(self, job_description: str) -> Tuple[int, ...]:
+        return self.hasher.signature(shingles(job_description))
+
+    async def signature(self, job_description: str) -> Tuple[int, ...]:
+        """Signature of a description, off the event loop unless numpy makes it cheap"""
+        if self.hasher.vectorized:
+            return self._signature(job_description)
+        return await asyncio.to_thread(self._signature, job_description)
+
+    async def add(self, roadmap_id: str, job_description: str, skill_level: str) -> None:
+        self._insert(str(roadmap_id), skill_level, await self.signature(job_description))
+
+    def _insert(self, roadmap_id: str, skill_level: str, signature: Tuple[int, ...]) -> None:
+        self.remove(roadmap_id)
+        self._signatures[roadmap_id] = ((skill_level or "").lower(), signature)
+        for key in self._band_keys(skill_level, signature):
+            self._buckets[key].add(roadmap_id)
+
+    def remove(self, roadmap_id: str) -> None:
+        roadmap_id = str(roadmap_id)
+        entry = self._signatures.pop(roadmap_id, None)
+        if entry is None:
+            return
+        skill_level, signature = entry
+        for key in self._band_keys(skill_level, signature):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(roadmap_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    async def query(self, job_description: str, skill_level: str) -> Optional[Tuple[str, float]]:
+        """Best (roadmap_id, similarity) at the same skill level above the threshold, if any"""
+        self.lookups += 1
+        signature = await self.signature(job_description)
+        candidates: Set[str] = set()
+        for key in self._band_keys(skill_level, signature):
+            candidates |= self._buckets.get(key, set())
+
+        best = None
+        for roadmap_id in candidates:
+            similarity = estimate_similarity(signature, self._signatures[roadmap_id][1])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (roadmap_id, similarity)
+
+        if best:
+            self.matches += 1
+        return best
+
+    async def rebuild_from_db(self, session_factory, limit: int, time_budget_seconds: float) -> int:
+        """
+        Index the most recent roadmaps, stopping at `limit` rows or after the time budget.
+
+        Signatures are computed a small batch at a time in a worker thread, and
+        the budget is checked after every batch, so it can be started as a
+        background task without stalling requests.
+        """
+        started = time.monotonic()
+        indexed = 0
+        batch_size = 200
+        signature_batch = 20
+
+        def signatures(rows):
+            return [self._signature(job_description) for _, job_description, _ in rows]
+
+        async with session_factory() as db:
+            result = await db.stream(
+                select(Roadmap.id, Roadmap.job_description, Roadmap.skill_level)
+                # Rule-based local roadmaps are never clone sources
+                .where(or_(Roadmap.generation.is_(None), Roadmap.generation == "llm"))
+                .order_by(Roadmap.generated_at.desc())
+                .limit(limit)
+                .execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions(signature_batch):
+                for (roadmap_id, _, skill_level), signature in zip(partition, await asyncio.to_thread(signatures, partition)):
+                    self._insert(str(roadmap_id), skill_level, signature)
+                indexed += len(partition)
+                if time.monotonic() - started > time_budget_seconds:
+                    print(f"⚠ JD index rebuild stopped at time budget after {indexed} roadmaps")
+                    break
+        self.ready = True
+        print(f"✅ JD similarity index built with {indexed} roadmaps in {time.monotonic() - started:.2f}s")
+        return indexed
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "indexed_roadmaps": len(self._signatures),
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "matches": self.matches,
+        }
+
+
+jd_similarity_index = JDSimilarityIndex(threshold=settings.ROADMAP_DEDUP_THRESHOLD)
@@ -0,0 +1,336 @@
+"""
+Background Job Queue
+Asyncio-native execution of long-running AI work outside the request cycle.
+
+Endpoints enqueue a job and return its ID immediately; a pool of worker
+tasks runs the registered handler and stores the result on the job row,
+which clients poll via GET /jobs/{id}.
+
+Backends:
+- database: workers poll the background_jobs table, so queued work survives
+  restarts and is shared by every uvicorn worker
+- local: in-process asyncio.Queue, for tests and single-process development
+
+Claiming is always done with a conditional UPDATE (queued -> running), so a
+job runs once even when several workers see it. The worker running a job
+refreshes its heartbeat_at lease; jobs whose lease is older than
+JOB_LEASE_SECONDS belonged to a crashed process and are requeued, while jobs
+still running on live workers are left alone. A job that has already been
+claimed JOB_MAX_ATTEMPTS times is marked failed instead of requeued, so a
+job that kills its worker cannot take the pool down forever.
+"""
+
+import asyncio
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.jobs import BackgroundJob
+
+# job_type -> handler(db, user_id, payload) -> result dict
+JobHandler = Callable[[AsyncSession, str, dict], Awaitable[dict]]
+_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job(job_type: str):
+    """Register an async handler for a job type"""
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+# ============================================================
+# QUEUE BACKENDS
+# ============================================================
+
+class LocalQueueBackend:
+    """In-process queue of job IDs"""
+
+    def __init__(self):
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+
+    async def push(self, job_id: str) -> None:
+        await self._queue.put(job_id)
+
+    async def pop(self) -> str:
+        return await self._queue.get()
+
+
+class DatabaseQueueBackend:
+    """Polls the job table for queued work; pushes in this process wake pollers immediately"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, poll_interval: float = 1.0):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+
+    async def push(self, job_id: str) -> None:
+        self._wakeup.set()
+
+    async def pop(self) -> str:
+        while True:
+            # Cleared before looking, so a push during the query is not lost
+            self._wakeup.clear()
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(BackgroundJob.id)
+                    .where(BackgroundJob.status == "queued")
+                    .order_by(BackgroundJob.created_at)
+                    .limit(1)
+                )
+                job_id = result.scalar_one_or_none()
+            if job_id is not None:
+                return str(job_id)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# ============================================================
+# JOB QUEUE
+# ============================================================
+
+def serialize_job(job: BackgroundJob) -> dict:
+    return {
+        "id": str(job.id),
+        "job_type": job.job_type,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class JobQueue:
+    """Enqueue jobs and run them on a bounded pool of worker tasks"""
+
+    def __init__(
+        self,
+        backend,
+        concurrency: int = 4,
+        session_factory=AsyncSessionLocal,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 3,
+    ):
+        self.backend = backend
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._workers: List[asyncio.Task] = []
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        job_type: str,
+        payload: Optional[dict] = None
+    ) -> BackgroundJob:
+        if job_type not in _handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = BackgroundJob(
+            user_id=uuid.UUID(user_id),
+            job_type=job_type,
+            payload=payload or {},
+            status="queued",
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        await self.backend.push(str(job.id))
+        print(f"📥 Queued {job_type} job {job.id}")
+        return job
+
+    async def _claim(self, job_id: str) -> Optional[BackgroundJob]:
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == uuid.UUID(job_id), BackgroundJob.status == "queued")
+                .values(
+                    status="running",
+                    started_at=now,
+                    heartbeat_at=now,
+                    attempts=BackgroundJob.attempts + 1,
+                )
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                return None
+            job_result = await db.execute(select(BackgroundJob).where(BackgroundJob.id == uuid.UUID(job_id)))
+            return job_result.scalar_one_or_none()
+
+    async def _finish(self, job_id, status: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id)
+                .values(status=status, result=result, error=error, finished_at=datetime.utcnow())
+            )
+            await db.commit()
+
+    async def _heartbeat(self, job_id) -> None:
+        """Keep the lease of a running job fresh until the job finishes"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(BackgroundJob)
+                        .where(BackgroundJob.id == job_id, BackgroundJob.status == "running")
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"⚠ Job heartbeat failed for {job_id}: {e}")
+
+    async def run_job(self, job_id: str) -> None:
+        job = await self._claim(job_id)
+        if job is None:
+            return
+
+        handler = _handlers.get(job.job_type)
+        if handler is None:
+            await self._finish(job.id, "failed", error=f"No handler for job type {job.job_type}")
+            return
+
+        print(f"⚙️ Running {job.job_type} job {job.id}")
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            async with self.session_factory() as db:
+                result = await handler(db, str(job.user_id), job.payload or {})
+                await db.commit()
+        except HTTPException as e:
+            await self._finish(job.id, "failed", error=str(e.detail))
+            return
+        except Exception as e:
+            traceback.print_exc()
+            await self._finish(job.id, "failed", error=str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._finish(job.id, "succeeded", result=result)
+        print(f"✅ Finished {job.job_type} job {job.id}")
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self.backend.pop()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                print(f"⚠ Job worker error for {job_id}: {e}")
+
+    async def requeue_expired(self, push: bool = True) -> List[str]:
+        """
+        Requeue running jobs whose lease expired (their worker crashed); jobs
+        on live workers are untouched. Expired jobs that used up max_attempts
+        are failed instead. Returns the requeued job IDs.
+        """
+        expired_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        lease_expired = (
+            BackgroundJob.status == "running",
+            func.coalesce(BackgroundJob.heartbeat_at, BackgroundJob.started_at) < expired_before,
+        )
+        async with self.session_factory() as db:
+            result = await db.execute(select(BackgroundJob.id, BackgroundJob.attempts).where(*lease_expired))
+            expired = result.all()
+            requeued = []
+            failed = []
+            for job_id, attempts in expired:
+                if (attempts or 0) >= self.max_attempts:
+                    values = {
+                        "status": "failed",
+                        "error": f"Worker lost {attempts} times; giving up after {self.max_attempts} attempts",
+                        "finished_at": datetime.utcnow(),
+                    }
+                else:
+                    values = {"status": "queued"}
+                # Conditional per job, so a heartbeat that lands meanwhile keeps the job where it runs
+                update_result = await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == job_id, *lease_expired)
+                    .values(**values)
+                )
+                if update_result.rowcount == 1:
+                    (failed if values["status"] == "failed" else requeued).append(str(job_id))
+            await db.commit()
+        if failed:
+            print(f"💀 Failed {len(failed)} jobs that exhausted {self.max_attempts} attempts")
+        if push:
+            for job_id in requeued:
+                await self.backend.push(job_id)
+        return requeued
+
+    async def recover(self) -> int:
+        """Requeue jobs left running by a crashed process and re-push queued jobs to the backend"""
+        await self.requeue_expired(push=False)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(BackgroundJob.id).where(BackgroundJob.status == "queued")
+            )
+            queued = [str(job_id) for job_id in result.scalars().all()]
+        for job_id in queued:
+            await self.backend.push(job_id)
+        return len(queued)
+
+    async def _reaper(self) -> None:
+        """Periodically requeue jobs of workers that died while this process keeps running"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                requeued = await self.requeue_expired()
+                if requeued:
+                    print(f"🔁 Requeued {len(requeued)} jobs with expired leases")
+            except Exception as e:
+                print(f"⚠ Job recovery failed: {e}")
+
+    async def start(self, recover: bool = True) -> None:
+        if recover:
+            recovered = await self.recover()
+            if recovered:
+                print(f"🔁 Recovered {recovered} queued jobs")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        if recover:
+            self._workers.append(asyncio.create_task(self._reaper()))
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+
+def create_job_queue() -> JobQueue:
+    """Build the job queue configured in settings"""
+    if settings.JOB_QUEUE_BACKEND.lower() == "local":
+        backend = LocalQueueBackend()
+    else:
+        backend = DatabaseQueueBackend(poll_interval=settings.JOB_POLL_INTERVAL_SECONDS)
+    return JobQueue(
+        backend,
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+job_queue = create_job_queue()
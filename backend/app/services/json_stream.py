@@ -0,0 +1,80 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+The model streams a single JSON object. IncrementalArrayParser watches the
+top-level keys named in `array_keys` and returns each object element of those
+arrays as soon as its closing brace arrives, so callers can forward phases
+and projects long before the whole document is complete.
+"""
+
+import json
+from typing import Iterable, List, Tuple
+
+
+class IncrementalArrayParser:
+    """Emit completed objects from top-level JSON arrays while the document is still streaming"""
+
+    def __init__(self, array_keys: Iterable[str]):
+        self.array_keys = set(array_keys)
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = None
+        self._current_key = None
+        self._array_key = None
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> List[Tuple[str, dict]]:
+        """Consume a chunk and return (array_key, item) pairs completed by it"""
+        self.buffer += chunk
+        completed = []
+        buf = self.buffer
+
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = buf[self._string_start + 1:self._pos]
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and self._current_key in self.array_keys:
+                    self._array_key = self._current_key
+                elif ch == "{" and self._depth == 2 and self._array_key:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._depth == 2 and self._item_start >= 0:
+                    raw = buf[self._item_start:self._pos + 1]
+                    self._item_start = -1
+                    try:
+                        completed.append((self._array_key, json.loads(raw)))
+                    except json.JSONDecodeError:
+                        pass
+                elif ch == "]" and self._depth == 1:
+                    self._array_key = None
+
+            self._pos += 1
+
+        return completed
+
+    def document(self) -> dict:
+        """Parse the full buffered document once the stream has finished"""
+        return json.loads(self.buffer)
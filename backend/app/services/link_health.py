@@ -0,0 +1,335 @@
+"""
+Link Health Checker
+Scheduled, concurrent health checks for the curated resource URLs.
+
+One pooled aiohttp session serves a whole pass, bounded by a global and a
+per-host concurrency limit. Each URL is probed with HEAD, falling back to a
+one-byte ranged GET for servers that reject HEAD. Validators from the last
+successful check (ETag / Last-Modified) are sent back, so unchanged pages
+answer 304 without a body.
+
+Hosts that time out, refuse connections or answer 429/5xx are backed off
+exponentially and their remaining URLs are skipped until the backoff expires.
+
+Results are written to LearningResource (consecutive_failures, validators,
+last_verified_at) with a ResourceHealthCheck row per check, and published
+through resource_health_store to the health state every worker serves from.
+A resource is served with its fallback after LINK_HEALTH_FAILURE_THRESHOLD
+failed checks in a row, or once RESOURCE_REPORT_DEMOTION_THRESHOLD distinct
+users have reported it (whatever the checks say).
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from sqlalchemy import or_, select
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.locks import try_advisory_lock
+from app.models.resources import LearningResource, ResourceHealthCheck
+from app.services.resource_catalog import catalog_row_fields
+from app.services.resource_health_store import resource_health_store
+from app.services.resource_service_v2 import _set_resource_health, get_catalog
+
+# HEAD answers that mean "ask again with GET" rather than "broken"
+HEAD_UNSUPPORTED = {403, 404, 405, 501}
+
+
+class LinkCheckResult(NamedTuple):
+    url: str
+    is_healthy: bool
+    http_status: int = 0
+    response_time_ms: int = 0
+    error_message: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    skipped: bool = False  # Host in backoff; nothing was checked
+
+
+class LinkHealthChecker:
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        per_host_concurrency: int = 2,
+        timeout_seconds: float = 10.0,
+        backoff_base_seconds: float = 60.0,
+        backoff_max_seconds: float = 3600.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._host_failures: Dict[str, int] = {}
+        self._host_retry_at: Dict[str, float] = {}
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    def backoff_remaining(self, host: str) -> float:
+        return max(0.0, self._host_retry_at.get(host, 0.0) - time.monotonic())
+
+    def _record_host(self, host: str, failed: bool) -> None:
+        if not failed:
+            self._host_failures.pop(host, None)
+            self._host_retry_at.pop(host, None)
+            return
+        if self.backoff_remaining(host):
+            return  # Other in-flight checks already backed this host off
+        failures = self._host_failures.get(host, 0) + 1
+        self._host_failures[host] = failures
+        delay = min(self.backoff_base_seconds * 2 ** (failures - 1), self.backoff_max_seconds)
+        self._host_retry_at[host] = time.monotonic() + delay
+        print(f"🔁 Backing off {host} for {delay:.0f}s after {failures} failed check(s)")
+
+    async def _probe(self, session: aiohttp.ClientSession, method: str, url: str, headers: Dict[str, str]):
+        async with session.request(method, url, headers=headers, allow_redirects=True) as response:
+            return response.status, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    async def check(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> LinkCheckResult:
+        host = urlsplit(url).hostname or ""
+        # Host slot first, so URLs queued behind a slow host do not hold global slots
+        async with self._host_limit(host), self._limit:
+            if self.backoff_remaining(host):
+                return LinkCheckResult(url, is_healthy=False, error_message="Host in backoff", skipped=True)
+
+            headers = {}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+            started = time.perf_counter()
+            try:
+                try:
+                    status, new_etag, new_last_modified = await self._probe(session, "HEAD", url, headers)
+                except aiohttp.ClientResponseError:
+                    status = 405
+                if status in HEAD_UNSUPPORTED:
+                    status, new_etag, new_last_modified = await self._probe(
+                        session, "GET", url, {**headers, "Range": "bytes=0-0"}
+                    )
+            except asyncio.TimeoutError:
+                self._record_host(host, failed=True)
+                return LinkCheckResult(url, False, 0, int((time.perf_counter() - started) * 1000), "Timeout")
+            except aiohttp.ClientError as e:
+                self._record_host(host, failed=True)
+                return LinkCheckResult(url, False, 0, int((time.perf_counter() - started) * 1000), str(e)[:500])
+            except Exception as e:
+                return LinkCheckResult(url, False, 0, int((time.perf_counter() - started) * 1000), str(e)[:500])
+
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            # 429 and 5xx say something about the host rather than the page
+            self._record_host(host, failed=status == 429 or status >= 500)
+            is_healthy = status < 400
+            if status == 304:
+                # Unchanged since the last check; keep the validators we sent
+                new_etag, new_last_modified = etag, last_modified
+            return LinkCheckResult(
+                url,
+                is_healthy,
+                status,
+                elapsed_ms,
+                "" if is_healthy else f"HTTP {status}",
+                new_etag if is_healthy else etag,
+                new_last_modified if is_healthy else last_modified,
+            )
+
+    async def check_many(
+        self,
+        targets: Iterable[Tuple[str, str, Optional[str], Optional[str]]],
+    ) -> Dict[str, LinkCheckResult]:
+        """Check (key, url, etag, last_modified) targets over one pooled session"""
+        targets = list(targets)
+        if not targets:
+            return {}
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_concurrency,
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"User-Agent": "PathWise-LinkChecker/1.0"},
+        ) as session:
+            async def one(key: str, url: str, etag: Optional[str], last_modified: Optional[str]):
+                return key, await self.check(session, url, etag, last_modified)
+
+            results = await asyncio.gather(*(one(*target) for target in targets))
+        return dict(results)
+
+
+link_health_checker = LinkHealthChecker(
+    max_concurrency=settings.LINK_HEALTH_MAX_CONCURRENCY,
+    per_host_concurrency=settings.LINK_HEALTH_PER_HOST_CONCURRENCY,
+    timeout_seconds=settings.LINK_HEALTH_TIMEOUT_SECONDS,
+    backoff_base_seconds=settings.LINK_HEALTH_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.LINK_HEALTH_BACKOFF_MAX_SECONDS,
+)
+
+
+def _catalog_entries() -> List[Tuple[str, str, Mapping]]:
+    return [
+        (resource["id"], category, resource)
+        for category, resources in get_catalog().resources_by_category.items()
+        for resource in resources
+        if resource.get("url")
+    ]
+
+
+def _health_state(row: LearningResource, result: Optional[LinkCheckResult] = None) -> Dict:
+    user_reported = (row.report_count or 0) >= settings.RESOURCE_REPORT_DEMOTION_THRESHOLD
+    failing = (row.consecutive_failures or 0) >= settings.LINK_HEALTH_FAILURE_THRESHOLD
+    return {
+        "is_healthy": not (failing or user_reported),
+        "http_status": result.http_status if result else None,
+        "error_message": row.last_failure_reason or ("Reported by users" if user_reported else ""),
+        "consecutive_failures": row.consecutive_failures or 0,
+        "user_reported": user_reported,
+        "checked_at": row.last_verified_at.isoformat() if row.last_verified_at else None,
+    }
+
+
+async def run_health_pass(force: bool = False) -> Dict[str, Dict]:
+    """
+    Check every catalog URL that is due and persist the results
+
+    Resources checked within the last half interval are skipped unless `force`.
+    One worker at a time runs a pass (advisory lock); the others return an
+    empty result. No database session is open while the URLs are checked:
+    due rows are read in one short session and results written in another.
+    Returns resource id -> health state for the resources checked.
+    """
+    async with try_advisory_lock("link_health_pass") as acquired:
+        if not acquired:
+            print("🔗 Link health pass already running on another worker, skipping")
+            return {}
+        return await _health_pass(force)
+
+
+async def _health_pass(force: bool) -> Dict[str, Dict]:
+    entries = _catalog_entries()
+    now = datetime.utcnow()
+    fresh_after = now - timedelta(seconds=settings.LINK_HEALTH_INTERVAL_SECONDS / 2)
+    checked: Dict[str, Dict] = {}
+
+    async with AsyncSessionLocal() as session:
+        # Matched on url, which is unique, so rows without a slug are found too
+        result = await session.execute(
+            select(LearningResource).where(LearningResource.url.in_([r["url"] for _, _, r in entries]))
+        )
+        by_url = {row.url: row for row in result.scalars()}
+        rows: Dict[str, LearningResource] = {}
+        for slug, category, resource in entries:
+            rows[slug] = by_url.get(resource["url"])
+            if rows[slug] is None:
+                rows[slug] = LearningResource(**catalog_row_fields(category, dict(resource)), consecutive_failures=0)
+                session.add(rows[slug])
+        await session.flush()
+
+        row_ids = {slug: row.id for slug, row in rows.items()}
+        due = [
+            (slug, rows[slug].url, rows[slug].etag, rows[slug].last_modified)
+            for slug, _, _ in entries
+            if force or rows[slug].last_verified_at is None or rows[slug].last_verified_at < fresh_after
+        ]
+        await session.commit()
+
+    started = time.perf_counter()
+    results = await link_health_checker.check_many(due)
+    skipped = sum(1 for check in results.values() if check.skipped)
+    results = {slug: check for slug, check in results.items() if not check.skipped}
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(LearningResource).where(LearningResource.id.in_([row_ids[slug] for slug in results]))
+        )
+        by_id = {row.id: row for row in result.scalars()}
+        for slug, check in results.items():
+            row = by_id.get(row_ids[slug])
+            if row is None:
+                continue  # Removed from the catalog while it was being checked
+            row.last_verified_at = datetime.utcnow()
+            if check.is_healthy:
+                row.consecutive_failures = 0
+                row.last_failure_reason = None
+                row.etag = check.etag
+                row.last_modified = check.last_modified
+            else:
+                row.consecutive_failures = (row.consecutive_failures or 0) + 1
+                row.last_failure_reason = check.error_message[:500]
+            session.add(ResourceHealthCheck(
+                resource_id=row.id,
+                check_timestamp=row.last_verified_at,
+                http_status=check.http_status or None,
+                response_time_ms=check.response_time_ms,
+                is_healthy=check.is_healthy,
+                error_message=check.error_message[:500] or None,
+            ))
+            checked[slug] = _health_state(row, check)
+        await session.commit()
+
+    await resource_health_store.set_many(checked)
+
+    unhealthy = sum(1 for state in checked.values() if not state["is_healthy"])
+    print(
+        f"🔗 Link health pass: {len(checked)} checked, {unhealthy} unhealthy, {skipped} skipped (host backoff), "
+        f"{len(entries) - len(due)} fresh, {time.perf_counter() - started:.1f}s"
+    )
+    return checked
+
+
+async def load_persisted_health() -> int:
+    """Seed the in-memory health state from the last persisted checks"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(LearningResource).where(
+                LearningResource.slug.isnot(None),
+                or_(
+                    LearningResource.last_verified_at.isnot(None),
+                    LearningResource.report_count >= settings.RESOURCE_REPORT_DEMOTION_THRESHOLD,
+                ),
+            )
+        )
+        rows = result.scalars().all()
+    for row in rows:
+        _set_resource_health(row.slug, _health_state(row))
+    return len(rows)
+
+
+async def run_health_scheduler(stop_event: asyncio.Event) -> None:
+    """Health check loop started from the application lifespan"""
+    if not settings.LINK_HEALTH_ENABLED:
+        return
+    try:
+        await load_persisted_health()
+    except Exception as e:
+        print(f"⚠ Failed to load persisted link health: {e}")
+    while not stop_event.is_set():
+        try:
+            await run_health_pass()
+        except Exception as e:
+            print(f"⚠ Link health pass failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.LINK_HEALTH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,331 @@
+"""
+LLM Gateway
+Single entry point for every OpenAI completion made by the backend.
+
+Features:
+- One pooled AsyncOpenAI client shared by all services
+- Global cap on in-flight requests
+- Retries on 429/5xx/timeouts with jittered exponential backoff
+- Per-call timeouts
+- Circuit breaker that fails fast while the provider is degraded
+- Per-call telemetry tagged with the calling feature (see llm_telemetry)
+- Model, max_tokens, temperature and timeout chosen per feature (see model_router)
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services.llm_replay import create_llm_client
+from app.services.llm_telemetry import llm_telemetry, current_llm_feature
+from app.services.model_router import model_router
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and calls are rejected without reaching the provider"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls pass; `failure_threshold` consecutive failures open the circuit
+    open      -> calls are rejected until `recovery_seconds` have elapsed
+    half_open -> a single probe call is allowed; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                raise CircuitOpenError("AI service is temporarily unavailable. Please try again shortly.")
+            self.state = "half_open"
+            self._probe_in_flight = False
+
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                raise CircuitOpenError("AI service is recovering. Please try again shortly.")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠ LLM circuit breaker opened after {self.consecutive_failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.RateLimitError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class LLMGateway:
+    """Bounded, retrying, circuit-broken access to the chat completions API"""
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        max_concurrency: int = 32,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        timeout_seconds: float = 90.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # Retries are handled here, so the SDK's own retry loop is disabled.
+        # LLM_CLIENT_MODE can swap in the offline replay/record stand-in.
+        self.client = client or create_llm_client(lambda: AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,
+            timeout=timeout_seconds,
+        ))
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.total_calls = 0
+        self.total_retries = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+
+    @asynccontextmanager
+    async def _slot(self):
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.retry_max_delay)
+        # Full jitter keeps retry waves from synchronizing across workers
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @asynccontextmanager
+    async def _call_with_retries(self, make_call, timeout: float, call_stats: dict):
+        """
+        Yield the result of the first successful attempt while holding a concurrency slot
+
+        Each attempt takes its own slot, so a call sleeping in backoff does not
+        keep another request waiting. The breaker counts the whole call once:
+        one failure when every retry is exhausted, not one per attempt.
+        """
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.total_rejected += 1
+            raise
+
+        attempt = 0
+        while True:
+            async with self._slot():
+                try:
+                    result = await asyncio.wait_for(make_call(), timeout=timeout)
+                except Exception as e:
+                    error = e
+                else:
+                    self.breaker.record_success()
+                    yield result
+                    return
+
+            if not _is_retryable(error):
+                # Client errors say nothing about provider health
+                self.breaker.record_success()
+                self.total_failures += 1
+                raise error
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                self.total_failures += 1
+                raise error
+            if self.breaker.state == "open":
+                # Other calls already exhausted their retries; stop adding load
+                self.total_failures += 1
+                raise error
+            delay = self._backoff(attempt, error)
+            attempt += 1
+            self.total_retries += 1
+            call_stats["retries"] = attempt
+            print(f"⚠ LLM call failed ({type(error).__name__}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _apply_route(self, feature: str, timeout: Optional[float], kwargs: dict) -> float:
+        """Fill model/max_tokens/temperature from the feature's route unless passed explicitly; returns the timeout"""
+        route, model = model_router.select(feature)
+        kwargs.setdefault("model", model)
+        if route.max_tokens is not None:
+            kwargs.setdefault("max_tokens", route.max_tokens)
+        if route.temperature is not None:
+            kwargs.setdefault("temperature", route.temperature)
+        return timeout or route.timeout_seconds or self.timeout_seconds
+
+    async def complete(self, feature: str = "unknown", timeout: Optional[float] = None, **kwargs):
+        """
+        Create a chat completion. Accepts the same arguments as client.chat.completions.create.
+
+        `feature` names the calling code path for telemetry and selects its
+        route (model, max_tokens, temperature, timeout) in model_router.
+        """
+        self.total_calls += 1
+        timeout = self._apply_route(feature, timeout, kwargs)
+        current_llm_feature.set(feature)
+        call_stats = {"retries": 0}
+        started_at = time.monotonic()
+        try:
+            async with self._call_with_retries(
+                lambda: self.client.chat.completions.create(**kwargs),
+                timeout,
+                call_stats,
+            ) as response:
+                pass
+        except Exception as e:
+            elapsed = time.monotonic() - started_at
+            if isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+                model_router.observe(feature, kwargs["model"], elapsed)
+            llm_telemetry.record_call(
+                feature, kwargs.get("model"), elapsed,
+                retries=call_stats["retries"], error=type(e).__name__,
+            )
+            raise
+        
+        latency = time.monotonic() - started_at
+        model_router.observe(feature, kwargs["model"], latency)
+        usage = getattr(response, "usage", None)
+        llm_telemetry.record_call(
+            feature, kwargs.get("model"), latency,
+            ttft_seconds=latency,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            retries=call_stats["retries"],
+        )
+        return response
+
+    async def stream(self, feature: str = "unknown", timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream content deltas of a chat completion.
+
+        Opening the stream is retried like `complete`; once tokens are flowing a
+        failure is raised to the caller. `timeout` bounds the wait for each chunk.
+        The upstream HTTP stream is closed when the iterator exits or is cancelled.
+        """
+        self.total_calls += 1
+        timeout = self._apply_route(feature, timeout, kwargs)
+        # Ask for a final usage chunk so streamed calls report tokens too
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        current_llm_feature.set(feature)
+        call_stats = {"retries": 0}
+        started_at = time.monotonic()
+        ttft = None
+        usage = None
+        error = None
+        try:
+            async with self._call_with_retries(
+                lambda: self.client.chat.completions.create(stream=True, **kwargs),
+                timeout,
+                call_stats,
+            ) as stream:
+                try:
+                    iterator = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(iterator.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        if getattr(chunk, "usage", None):
+                            usage = chunk.usage
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            if ttft is None:
+                                ttft = time.monotonic() - started_at
+                            yield chunk.choices[0].delta.content
+                except Exception as e:
+                    if _is_retryable(e):
+                        self.breaker.record_failure()
+                    self.total_failures += 1
+                    raise
+                finally:
+                    await stream.close()
+        except BaseException as e:
+            # GeneratorExit/CancelledError mean the consumer stopped early
+            error = type(e).__name__ if isinstance(e, Exception) else "Cancelled"
+            if ttft is None and isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+                model_router.observe(feature, kwargs["model"], time.monotonic() - started_at)
+            raise
+        finally:
+            if ttft is not None:
+                model_router.observe(feature, kwargs["model"], ttft)
+            llm_telemetry.record_call(
+                feature, kwargs.get("model"), time.monotonic() - started_at,
+                ttft_seconds=ttft,
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                retries=call_stats["retries"],
+                error=error,
+            )
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "circuit_state": self.breaker.state,
+            "total_calls": self.total_calls,
+            "total_retries": self.total_retries,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+        }
+
+
+llm_gateway = LLMGateway(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_retries=settings.LLM_MAX_RETRIES,
+    retry_base_delay=settings.LLM_RETRY_BASE_DELAY,
+    retry_max_delay=settings.LLM_RETRY_MAX_DELAY,
+    timeout_seconds=settings.LLM_TIMEOUT_SECONDS,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        recovery_seconds=settings.LLM_BREAKER_RECOVERY_SECONDS,
+    ),
+)
@@ -0,0 +1,224 @@
+"""
+LLM Output Validation
+Parse structured completions and repair only the parts that fail validation.
+
+Responses are validated against the models in app.schemas.ai_outputs. When
+validation fails, each error is traced to the smallest list item enclosing it
+(one phase, one skill, one resource) and only that fragment is sent back to
+the model with a short repair prompt, instead of re-running the whole
+generation. Fragments that still fail after the last round are dropped when
+their list can spare them (listed in the result's `dropped`, so callers can
+avoid caching incomplete output); otherwise OutputValidationError is raised.
+"""
+
+import asyncio
+import json
+import re
+import types
+import typing
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.services.llm_gateway import llm_gateway
+from app.services.token_budget import count_tokens
+
+Path = Tuple[Any, ...]
+
+_FENCE = re.compile(r"^```[\w-]*\s*(.*?)\s*```$", re.S)
+
+REPAIR_SYSTEM_PROMPT = """You fix JSON fragments that failed schema validation.
+Keep every valid field unchanged; only add or correct the fields named in the errors.
+Respond with a JSON object of the form {"value": <corrected fragment>}."""
+
+
+class OutputValidationError(ValueError):
+    """Structured LLM output failed validation and could not be repaired"""
+
+
+class ValidatedOutput(dict):
+    """Validated output as a dict; `dropped` names the fragments removed because they could not be repaired"""
+
+    def __init__(self, data: dict, dropped: List[str] = ()):
+        super().__init__(data)
+        self.dropped = list(dropped)
+
+
+def parse_json_content(content: str) -> Any:
+    """json.loads that tolerates ``` fences and prose around the object"""
+    text = (content or "").strip()
+    fenced = _FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(text[start:end + 1])
+
+
+def _unwrap(annotation: Any) -> Any:
+    """Strip Annotated[...] and Optional[...] down to the underlying type"""
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Annotated:
+            annotation = typing.get_args(annotation)[0]
+        elif origin in (typing.Union, types.UnionType):
+            args = [a for a in typing.get_args(annotation) if a is not type(None)]
+            annotation = args[0] if len(args) == 1 else Any
+        else:
+            return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _annotation_at(model: Type[BaseModel], path: Path) -> Any:
+    """Declared type of the value at `path` inside `model`"""
+    annotation: Any = model
+    for step in path:
+        annotation = _unwrap(annotation)
+        if isinstance(step, int):
+            args = typing.get_args(annotation)
+            annotation = args[0] if args else Any
+        elif _is_model(annotation) and step in annotation.model_fields:
+            annotation = annotation.model_fields[step].annotation
+        else:
+            return Any
+    return _unwrap(annotation)
+
+
+def _shape(annotation: Any, depth: int = 0) -> Any:
+    """Compact JSON outline of a type for the repair prompt ("?" marks optional fields)"""
+    annotation = _unwrap(annotation)
+    if _is_model(annotation):
+        if depth > 3:
+            return "object"
+        return {
+            (name if field.is_required() else f"{name}?"): _shape(field.annotation, depth + 1)
+            for name, field in annotation.model_fields.items()
+        }
+    if typing.get_origin(annotation) is list:
+        args = typing.get_args(annotation)
+        return [_shape(args[0], depth + 1) if args else "any"]
+    return {str: "string", int: "integer", float: "number", bool: "boolean"}.get(annotation, "any")
+
+
+def _fragment_path(loc: Path) -> Path:
+    """Smallest list item enclosing an error location, or its top-level field"""
+    last_index = max((i for i, step in enumerate(loc) if isinstance(step, int)), default=None)
+    return tuple(loc[:1]) if last_index is None else tuple(loc[:last_index + 1])
+
+
+def _group_errors(errors: List[dict]) -> Dict[Path, List[str]]:
+    """Error messages keyed by fragment path; fragments inside another failing fragment are merged into it"""
+    grouped: Dict[Path, List[str]] = {}
+    for error in errors:
+        loc = tuple(error.get("loc", ()))
+        path = _fragment_path(loc)
+        field = ".".join(map(str, loc[len(path):])) or "(fragment)"
+        grouped.setdefault(path, []).append(f"{field}: {error.get('msg', 'invalid')}")
+
+    merged: Dict[Path, List[str]] = {}
+    for path in sorted(grouped, key=len):
+        outer = next((p for p in merged if path[:len(p)] == p), None)
+        if outer is None:
+            merged[path] = grouped[path]
+        else:
+            inner = ".".join(map(str, path[len(outer):]))
+            merged[outer].extend(f"{inner}.{message}" for message in grouped[path])
+    return merged
+
+
+def _get(data: Any, path: Path) -> Any:
+    for step in path:
+        if isinstance(step, int):
+            data = data[step] if isinstance(data, list) and step < len(data) else None
+        else:
+            data = data.get(step) if isinstance(data, dict) else None
+    return data
+
+
+def _set(data: Any, path: Path, value: Any) -> None:
+    _get(data, path[:-1])[path[-1]] = value
+
+
+def _label(path: Path) -> str:
+    return ".".join(map(str, path))
+
+
+async def _repair_fragment(feature: str, annotation: Any, fragment: Any, errors: List[str]) -> Any:
+    fragment_json = json.dumps(fragment, separators=(",", ":"), ensure_ascii=False, default=str)
+    prompt = f"""Validation errors:
+{chr(10).join(f"- {e}" for e in errors)}
+
+Expected shape:
+{json.dumps(_shape(annotation), separators=(",", ":"))}
+
+Fragment:
+{fragment_json}"""
+
+    response = await llm_gateway.complete(
+        feature=f"{feature}_repair",
+        messages=[
+            {"role": "system", "content": REPAIR_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=min(settings.LLM_REPAIR_MAX_TOKENS, 256 + 2 * count_tokens(fragment_json)),
+        response_format={"type": "json_object"}
+    )
+    parsed = parse_json_content(response.choices[0].message.content)
+    if not isinstance(parsed, dict) or "value" not in parsed:
+        raise ValueError("repair response had no \"value\"")
+    return parsed["value"]
+
+
+async def validate_output(model: Type[BaseModel], data: Any, feature: str) -> ValidatedOutput:
+    """
+    Validate parsed LLM output against `model`, repairing failing fragments.
+
+    Returns the validated data as a dict, with defaults filled in and unknown
+    fields kept; its `dropped` attribute is non-empty when unrepairable list
+    items had to be removed. `data` may be modified in place.
+    """
+    for round_number in range(settings.LLM_REPAIR_MAX_ROUNDS + 1):
+        try:
+            return ValidatedOutput(model.model_validate(data).model_dump(exclude_none=True))
+        except ValidationError as e:
+            grouped = _group_errors(e.errors())
+
+        if not isinstance(data, dict) or () in grouped or round_number == settings.LLM_REPAIR_MAX_ROUNDS:
+            break
+
+        print(f"🩹 Repairing {feature} output: {', '.join(_label(p) for p in grouped)}")
+        results = await asyncio.gather(
+            *(
+                _repair_fragment(feature, _annotation_at(model, path), _get(data, path), messages)
+                for path, messages in grouped.items()
+            ),
+            return_exceptions=True,
+        )
+        for path, repaired in zip(grouped, results):
+            if isinstance(repaired, Exception):
+                print(f"⚠ Repair of {feature} {_label(path)} failed: {repaired}")
+            else:
+                _set(data, path, repaired)
+
+    # Last resort: drop list items that are still invalid (deepest/last first so indices stay valid)
+    dropped: List[str] = []
+    if isinstance(data, dict):
+        for path in sorted((p for p in grouped if p and isinstance(p[-1], int)), reverse=True):
+            print(f"⚠ Dropping invalid {feature} fragment {_label(path)}")
+            del _get(data, path[:-1])[path[-1]]
+            dropped.append(_label(path))
+
+    try:
+        return ValidatedOutput(model.model_validate(data).model_dump(exclude_none=True), dropped)
+    except ValidationError as e:
+        raise OutputValidationError(
+            f"{feature} output failed validation ({e.error_count()} errors): {e.errors()[0].get('msg')}"
+        ) from e
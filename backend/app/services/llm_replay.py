@@ -0,0 +1,417 @@
+"""
+LLM Record/Replay
+OpenAI-compatible stand-in for load tests and benchmarks without network or spend.
+
+Modes (settings.LLM_CLIENT_MODE):
+- live:   the real AsyncOpenAI client (default)
+- replay: answers from recorded cassettes, or synthetic responses for
+          features that have none, with simulated latency and injected errors
+- record: calls the real API and appends every response to the cassettes
+
+Cassettes are JSON files, one per feature (the gateway's `feature=` tag), in
+settings.LLM_REPLAY_CASSETTE_DIR. Each holds a list of recorded responses
+(content, usage, latency, time to first token); replay picks one at random,
+so recording a handful of calls per feature is enough.
+
+Only the surface the gateway uses is implemented:
+client.chat.completions.create(...) with and without stream=True.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+import types
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import openai
+
+from app.core.config import settings
+from app.services.llm_telemetry import current_llm_feature
+from app.services.local_roadmap_service import build_local_roadmap
+
+_FAKE_REQUEST = httpx.Request("POST", "https://replay.local/v1/chat/completions")
+
+
+# ============================================================
+# RESPONSE OBJECTS
+# ============================================================
+
+def _usage(prompt_tokens: int, completion_tokens: int):
+    return types.SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+def _completion(content: str, model: str, usage) -> object:
+    message = types.SimpleNamespace(role="assistant", content=content)
+    return types.SimpleNamespace(
+        id=f"chatcmpl-replay-{uuid.uuid4().hex[:12]}",
+        model=model,
+        choices=[types.SimpleNamespace(index=0, message=message, finish_reason="stop")],
+        usage=usage,
+    )
+
+
+def _chunk(content: Optional[str], model: str, usage=None) -> object:
+    choices = [] if content is None else [
+        types.SimpleNamespace(index=0, delta=types.SimpleNamespace(content=content), finish_reason=None)
+    ]
+    return types.SimpleNamespace(model=model, choices=choices, usage=usage)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text or "") // 4)
+
+
+# ============================================================
+# CASSETTES
+# ============================================================
+
+class CassetteStore:
+    """Recorded responses on disk, keyed by feature"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cache: Dict[str, List[dict]] = {}
+
+    def _path(self, feature: str) -> str:
+        safe = re.sub(r"[^a-zA-Z0-9_.-]", "_", feature)
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def load(self, feature: str) -> List[dict]:
+        if feature not in self._cache:
+            try:
+                with open(self._path(feature), encoding="utf-8") as f:
+                    self._cache[feature] = json.load(f)
+            except FileNotFoundError:
+                self._cache[feature] = []
+        return self._cache[feature]
+
+    def append(self, feature: str, entry: dict) -> None:
+        entries = self.load(feature)
+        entries.append(entry)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(feature) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._path(feature))
+
+
+# ============================================================
+# SYNTHETIC RESPONSES
+# Used when a feature has no cassette, so every path works out of the box
+# ============================================================
+
+def _user_text(messages: List[dict]) -> str:
+    return next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+
+def _synthetic_content(feature: str, messages: List[dict], json_mode: bool) -> str:
+    user_text = _user_text(messages)
+
+    if feature in ("roadmap", "roadmap_stream"):
+        return json.dumps(build_local_roadmap(user_text, "intermediate"))
+
+    if feature == "roadmap_outline":
+        roadmap = build_local_roadmap(user_text, "intermediate")
+        for phase in roadmap["phases"]:
+            phase["skills"] = [
+                {k: s[k] for k in ("name", "category", "difficulty", "importance", "interview_frequency", "estimated_hours")}
+                for s in phase["skills"]
+            ]
+        return json.dumps(roadmap)
+
+    if feature == "roadmap_phase_detail":
+        match = re.search(r"Skills:\n(\[.*\])", user_text)
+        names = [s.get("name") for s in json.loads(match.group(1))] if match else []
+        return json.dumps({"skills": [
+            {
+                "name": name,
+                "description": f"Core concepts and everyday use of {name}.",
+                "why_this_matters": f"{name} appears in most interviews for this role.",
+                "what_if_skipped": f"You will struggle with {name} questions in technical screens.",
+                "resources": [
+                    {
+                        "title": f"{name} guide part {i + 1}",
+                        "url": f"https://example.com/{re.sub(r'[^a-z0-9]+', '-', name.lower())}/{i + 1}",
+                        "type": ["video", "documentation", "article", "course", "video"][i],
+                        "difficulty": "intermediate",
+                        "duration_minutes": 30 + 15 * i,
+                        "quality_score": 0.85,
+                    }
+                    for i in range(5)
+                ],
+            }
+            for name in names
+        ]})
+
+    if feature == "generate_interview_questions":
+        system_text = messages[0].get("content", "") if messages else ""
+        match = re.search(r"expert (\w+) interviewer", system_text)
+        q_type = match.group(1) if match and match.group(1) != "full_mock" else "behavioral"
+        return json.dumps({"questions": [
+            {
+                "id": f"q{i + 1}",
+                "type": q_type,
+                "question": f"Replayed {q_type} question {i + 1}: walk me through how you would approach it.",
+                "hints": ["Clarify requirements first", "Discuss trade-offs"],
+                "ideal_answer": "States assumptions, outlines an approach, analyses trade-offs and complexity.",
+                "time_limit_minutes": 15,
+            }
+            for i in range(5 if q_type == "behavioral" else 3)
+        ]})
+
+    if feature == "evaluate_interview_response":
+        return json.dumps({
+            "overall_score": 68,
+            "feedback": {"summary": "Solid structure; answers need more concrete detail."},
+            "strengths": ["Clear communication", "Structured approach", "Good trade-off awareness"],
+            "improvements": ["Quantify impact", "Cover edge cases", "Discuss testing"],
+            "recommendations": ["Practice STAR stories with metrics"],
+        })
+
+    if feature == "analyze_resume":
+        return json.dumps({
+            "skills": [{"name": "Python", "proficiency": "intermediate", "years": 2},
+                       {"name": "SQL", "proficiency": "intermediate", "years": 2}],
+            "experience_years": 3,
+            "strengths": ["Backend development", "Data modelling"],
+            "improvements": ["Cloud deployment", "System design"],
+            "recommendations": ["Add measurable outcomes to each role"],
+            "summary": "Early-career backend engineer.",
+            "match_score": 62,
+        })
+
+    if json_mode:
+        return "{}"
+    return ("This is a replayed response from the offline LLM stand-in. "
+            "It stands in for a real answer so latency and throughput can be measured.")
+
+
+# ============================================================
+# REPLAY CLIENT
+# ============================================================
+
+class _ReplayStream:
+    """Async iterator of chunks, paced to the sampled latency"""
+
+    def __init__(self, content: str, model: str, usage, ttft: float, total: float, include_usage: bool):
+        self._content = content
+        self._model = model
+        self._usage = usage
+        self._ttft = ttft
+        self._include_usage = include_usage
+        # ~4 characters per token, emitted a few tokens per chunk
+        self._pieces = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+        self._gap = max(total - ttft, 0.0) / len(self._pieces)
+        self._closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        await asyncio.sleep(self._ttft)
+        for i, piece in enumerate(self._pieces):
+            if self._closed:
+                return
+            if i:
+                await asyncio.sleep(self._gap)
+            yield _chunk(piece, self._model)
+        if self._include_usage:
+            yield _chunk(None, self._model, usage=self._usage)
+
+    async def close(self) -> None:
+        self._closed = True
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class ReplayClient:
+    """Offline replacement for AsyncOpenAI"""
+
+    def __init__(
+        self,
+        store: CassetteStore,
+        latency_mode: str = "recorded",
+        latency_median_seconds: float = 1.0,
+        latency_sigma: float = 0.5,
+        ttft_seconds: float = 0.3,
+        speed_factor: float = 1.0,
+        error_rate: float = 0.0,
+        error_kinds: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.store = store
+        self.latency_mode = latency_mode
+        self.latency_median_seconds = latency_median_seconds
+        self.latency_sigma = latency_sigma
+        self.ttft_seconds = ttft_seconds
+        self.speed_factor = speed_factor
+        self.error_rate = error_rate
+        self.error_kinds = error_kinds or ["rate_limit", "server_error", "timeout"]
+        self._rng = random.Random(seed)
+        self.chat = types.SimpleNamespace(completions=_Completions(self._create))
+
+    def _sample_latency(self, entry: Optional[dict]) -> tuple:
+        """(ttft, total) in seconds"""
+        if self.latency_mode == "recorded" and entry and entry.get("latency_seconds") is not None:
+            total = entry["latency_seconds"]
+            ttft = entry.get("ttft_seconds") or min(self.ttft_seconds, total)
+        elif self.latency_mode == "fixed":
+            total = self.latency_median_seconds
+            ttft = min(self.ttft_seconds, total)
+        else:
+            # Log-normal around the median: long right tail like real LLM latency
+            total = self.latency_median_seconds * math.exp(self._rng.gauss(0, self.latency_sigma))
+            ttft = min(self.ttft_seconds * math.exp(self._rng.gauss(0, self.latency_sigma / 2)), total)
+        return ttft * self.speed_factor, total * self.speed_factor
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate <= 0 or self._rng.random() >= self.error_rate:
+            return
+        kind = self._rng.choice(self.error_kinds)
+        if kind == "timeout":
+            raise openai.APITimeoutError(request=_FAKE_REQUEST)
+        if kind == "rate_limit":
+            response = httpx.Response(429, request=_FAKE_REQUEST, headers={"retry-after": "1"})
+            raise openai.RateLimitError("Injected rate limit", response=response, body=None)
+        response = httpx.Response(500, request=_FAKE_REQUEST)
+        raise openai.InternalServerError("Injected server error", response=response, body=None)
+
+    async def _create(self, stream: bool = False, **kwargs):
+        feature = current_llm_feature.get()
+        model = kwargs.get("model", "replay")
+        messages = kwargs.get("messages", [])
+
+        entries = self.store.load(feature)
+        entry = self._rng.choice(entries) if entries else None
+        ttft, total = self._sample_latency(entry)
+
+        if entry:
+            content = entry["content"]
+            usage = _usage(**entry["usage"]) if entry.get("usage") else None
+        else:
+            json_mode = (kwargs.get("response_format") or {}).get("type") == "json_object"
+            content = _synthetic_content(feature, messages, json_mode)
+            usage = None
+        if usage is None:
+            prompt_tokens = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+            usage = _usage(prompt_tokens, _estimate_tokens(content))
+
+        if stream:
+            # Errors surface when the stream is opened, like the real API
+            self._maybe_fail()
+            include_usage = bool((kwargs.get("stream_options") or {}).get("include_usage"))
+            return _ReplayStream(content, model, usage, ttft, total, include_usage)
+
+        await asyncio.sleep(total)
+        self._maybe_fail()
+        return _completion(content, model, usage)
+
+
+# ============================================================
+# RECORDING CLIENT
+# ============================================================
+
+class _RecordingStream:
+    def __init__(self, stream, on_done):
+        self._stream = stream
+        self._on_done = on_done
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        started_at = time.monotonic()
+        ttft = None
+        parts: List[str] = []
+        usage = None
+        async for chunk in self._stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                if ttft is None:
+                    ttft = time.monotonic() - started_at
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        self._on_done("".join(parts), usage, ttft, time.monotonic() - started_at)
+
+    async def close(self) -> None:
+        await self._stream.close()
+
+
+class RecordingClient:
+    """Wraps a real client and appends every successful response to the cassettes"""
+
+    def __init__(self, client, store: CassetteStore):
+        self.client = client
+        self.store = store
+        self.chat = types.SimpleNamespace(completions=_Completions(self._create))
+
+    def _record(self, feature: str, content: str, usage, ttft: Optional[float], latency: float) -> None:
+        self.store.append(feature, {
+            "content": content,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+            } if usage else None,
+            "ttft_seconds": round(ttft, 4) if ttft is not None else None,
+            "latency_seconds": round(latency, 4),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        })
+        print(f"📼 Recorded {feature} response ({len(content)} chars)")
+
+    async def _create(self, stream: bool = False, **kwargs):
+        feature = current_llm_feature.get()
+        started_at = time.monotonic()
+        if stream:
+            real_stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            return _RecordingStream(
+                real_stream,
+                lambda content, usage, ttft, latency: self._record(feature, content, usage, ttft, latency),
+            )
+        response = await self.client.chat.completions.create(**kwargs)
+        latency = time.monotonic() - started_at
+        self._record(feature, response.choices[0].message.content or "", response.usage, None, latency)
+        return response
+
+
+def create_llm_client(live_client_factory: Callable[[], Any]):
+    """
+    Client for the configured LLM_CLIENT_MODE
+
+    `live_client_factory` builds the real AsyncOpenAI; it is only called in
+    live and record mode, so replay works without an API key.
+    """
+    mode = settings.LLM_CLIENT_MODE.lower()
+    if mode == "live":
+        return live_client_factory()
+
+    store = CassetteStore(settings.LLM_REPLAY_CASSETTE_DIR)
+    if mode == "record":
+        print(f"📼 LLM recorder writing cassettes to {settings.LLM_REPLAY_CASSETTE_DIR}")
+        return RecordingClient(live_client_factory(), store)
+    if mode == "replay":
+        print(f"📼 LLM replay mode: cassettes from {settings.LLM_REPLAY_CASSETTE_DIR}, no network calls")
+        return ReplayClient(
+            store,
+            latency_mode=settings.LLM_REPLAY_LATENCY_MODE,
+            latency_median_seconds=settings.LLM_REPLAY_LATENCY_MEDIAN_SECONDS,
+            latency_sigma=settings.LLM_REPLAY_LATENCY_SIGMA,
+            ttft_seconds=settings.LLM_REPLAY_TTFT_SECONDS,
+            speed_factor=settings.LLM_REPLAY_SPEED_FACTOR,
+            error_rate=settings.LLM_REPLAY_ERROR_RATE,
+            error_kinds=[k.strip() for k in settings.LLM_REPLAY_ERROR_KINDS.split(",") if k.strip()],
+        )
+    raise ValueError(f"Unknown LLM_CLIENT_MODE: {settings.LLM_CLIENT_MODE}")
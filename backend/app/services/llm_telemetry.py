@@ -0,0 +1,218 @@
+"""
+LLM Telemetry
+Per-call metrics for every completion made through the LLM gateway.
+
+Each call is tagged with the feature that made it (e.g. "roadmap",
+"chat_response") and records model, prompt/completion tokens, estimated
+cost, time to first token, total latency, retries and errors. Cache layers
+report hits/misses per feature so avoided calls show up next to real ones.
+
+Exposed as Prometheus text on GET /metrics and as a per-feature JSON summary
+on GET /api/v1/system/llm-usage (admins only).
+"""
+
+import bisect
+import contextvars
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# USD per 1M (prompt, completion) tokens; unknown models are costed at 0
+MODEL_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+# Feature of the LLM call currently in progress; set by the gateway so the
+# client underneath (e.g. the replay stand-in) can see who is calling
+current_llm_feature: contextvars.ContextVar[str] = contextvars.ContextVar("current_llm_feature", default="unknown")
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prices = MODEL_PRICES_PER_MILLION.get(model)
+    if prices is None:
+        # Dated snapshots (gpt-4o-2024-08-06) are priced like their base model
+        prices = next(
+            (p for name, p in sorted(MODEL_PRICES_PER_MILLION.items(), key=lambda i: -len(i[0]))
+             if model.startswith(name)),
+            (0.0, 0.0),
+        )
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        out = []
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-th observation"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, total in self.cumulative():
+            if total >= target:
+                return float(bound) if bound != "+Inf" else float(self.buckets[-1])
+        return None
+
+
+class FeatureStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.models: Dict[str, int] = defaultdict(int)
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.ttft = Histogram(LATENCY_BUCKETS)
+        self.prompt_token_hist = Histogram(TOKEN_BUCKETS)
+        self.completion_token_hist = Histogram(TOKEN_BUCKETS)
+
+
+class LLMTelemetry:
+    """In-process metrics registry (per worker; Prometheus aggregates across workers)"""
+
+    def __init__(self):
+        self._features: Dict[str, FeatureStats] = defaultdict(FeatureStats)
+        self.started_at = time.time()
+
+    def record_call(
+        self,
+        feature: str,
+        model: str,
+        latency_seconds: float,
+        ttft_seconds: Optional[float] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        stats = self._features[feature or "unknown"]
+        stats.calls += 1
+        stats.retries += retries
+        stats.models[model or "unknown"] += 1
+        stats.latency.observe(latency_seconds)
+        if ttft_seconds is not None:
+            stats.ttft.observe(ttft_seconds)
+        if error:
+            stats.errors[error] += 1
+            return
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        stats.cost_usd += estimate_cost(model or "", prompt_tokens, completion_tokens)
+        stats.prompt_token_hist.observe(prompt_tokens)
+        stats.completion_token_hist.observe(completion_tokens)
+
+    def record_cache(self, feature: str, hit: bool) -> None:
+        stats = self._features[feature]
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+    def latency_quantile(self, feature: str, q: float) -> Optional[float]:
+        stats = self._features.get(feature)
+        return stats.latency.quantile(q) if stats else None
+
+    def summary(self) -> dict:
+        features = {}
+        for name, s in sorted(self._features.items()):
+            total_errors = sum(s.errors.values())
+            lookups = s.cache_hits + s.cache_misses
+            features[name] = {
+                "calls": s.calls,
+                "errors": total_errors,
+                "error_rate": round(total_errors / s.calls, 4) if s.calls else 0.0,
+                "errors_by_type": dict(s.errors),
+                "retries": s.retries,
+                "models": dict(s.models),
+                "prompt_tokens": s.prompt_tokens,
+                "completion_tokens": s.completion_tokens,
+                "avg_prompt_tokens": round(s.prompt_tokens / (s.calls - total_errors), 1) if s.calls > total_errors else 0,
+                "cost_usd": round(s.cost_usd, 4),
+                "latency_avg_seconds": round(s.latency.sum / s.latency.count, 3) if s.latency.count else None,
+                "latency_p50_seconds": s.latency.quantile(0.5),
+                "latency_p95_seconds": s.latency.quantile(0.95),
+                "ttft_p50_seconds": s.ttft.quantile(0.5),
+                "ttft_p95_seconds": s.ttft.quantile(0.95),
+                "cache_hits": s.cache_hits,
+                "cache_hit_rate": round(s.cache_hits / lookups, 4) if lookups else None,
+            }
+        return {
+            "since": self.started_at,
+            "total_calls": sum(f["calls"] for f in features.values()),
+            "total_cost_usd": round(sum(f["cost_usd"] for f in features.values()), 4),
+            "features": features,
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def counter(name: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in samples:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        def histogram(name: str, help_text: str, attr: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for feature, s in sorted(self._features.items()):
+                hist: Histogram = getattr(s, attr)
+                for bound, total in hist.cumulative():
+                    lines.append(f'{name}_bucket{{feature="{feature}",le="{bound}"}} {total}')
+                lines.append(f'{name}_sum{{feature="{feature}"}} {hist.sum}')
+                lines.append(f'{name}_count{{feature="{feature}"}} {hist.count}')
+
+        items = sorted(self._features.items())
+        counter("pathwise_llm_calls_total", "LLM calls by feature and model",
+                [(f'feature="{f}",model="{m}"', n) for f, s in items for m, n in sorted(s.models.items())])
+        counter("pathwise_llm_errors_total", "Failed LLM calls by feature and error type",
+                [(f'feature="{f}",error="{e}"', n) for f, s in items for e, n in sorted(s.errors.items())])
+        counter("pathwise_llm_retries_total", "LLM call retries by feature",
+                [(f'feature="{f}"', s.retries) for f, s in items])
+        counter("pathwise_llm_tokens_total", "LLM tokens by feature and kind",
+                [(f'feature="{f}",kind="prompt"', s.prompt_tokens) for f, s in items]
+                + [(f'feature="{f}",kind="completion"', s.completion_tokens) for f, s in items])
+        counter("pathwise_llm_cost_usd_total", "Estimated LLM spend in USD by feature",
+                [(f'feature="{f}"', round(s.cost_usd, 6)) for f, s in items])
+        counter("pathwise_llm_cache_requests_total", "Response cache lookups by feature and result",
+                [(f'feature="{f}",result="hit"', s.cache_hits) for f, s in items]
+                + [(f'feature="{f}",result="miss"', s.cache_misses) for f, s in items])
+        histogram("pathwise_llm_latency_seconds", "Total LLM call latency", "latency")
+        histogram("pathwise_llm_ttft_seconds", "Time to first token", "ttft")
+        histogram("pathwise_llm_prompt_tokens", "Prompt tokens per call", "prompt_token_hist")
+        histogram("pathwise_llm_completion_tokens", "Completion tokens per call", "completion_token_hist")
+        return "\n".join(lines) + "\n"
+
+
+llm_telemetry = LLMTelemetry()
@@ -0,0 +1,242 @@
+"""
+Local Roadmap Builder
+Deterministic, LLM-free roadmap assembled from the resource_service_v2 taxonomy.
+
+Used as the fast path when the LLM misses its latency budget: skills are
+detected in the job description via SKILL_CATEGORY_MAP / OFFICIAL_DOCS terms,
+grouped into fixed phases by category, and filled from the resource catalog.
+The output has the same shape as an AI roadmap so it can be stored and later
+replaced in place when the LLM result arrives.
+"""
+
+import math
+import re
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.services.resource_service_v2 import (
+    OFFICIAL_DOCS,
+    SKILL_CATEGORY_MAP,
+    get_resources_for_skill,
+    get_skill_category,
+)
+from app.services.skill_matcher import SkillMatcher
+
+# OFFICIAL_DOCS entries that SKILL_CATEGORY_MAP does not cover
+EXTRA_CATEGORIES = {
+    "mongodb": "sql",
+    "tailwindcss": "html_css",
+    "tailwind": "html_css",
+}
+
+# Canonical display names; aliases that share a name are one skill
+DISPLAY_NAMES = {
+    "python": "Python", "python3": "Python", "python programming": "Python",
+    "django": "Django", "flask": "Flask", "fastapi": "FastAPI", "pandas": "pandas", "numpy": "NumPy",
+    "javascript": "JavaScript", "js": "JavaScript", "es6": "JavaScript (ES6+)", "es2015": "JavaScript (ES6+)",
+    "ecmascript": "JavaScript",
+    "typescript": "TypeScript", "ts": "TypeScript",
+    "react": "React", "react.js": "React", "reactjs": "React", "react hooks": "React Hooks", "redux": "Redux",
+    "node": "Node.js", "node.js": "Node.js", "nodejs": "Node.js",
+    "express": "Express", "express.js": "Express", "nestjs": "NestJS",
+    "next.js": "Next.js", "nextjs": "Next.js",
+    "sql": "SQL", "mysql": "MySQL", "postgresql": "PostgreSQL", "postgres": "PostgreSQL",
+    "database": "Databases", "databases": "Databases", "sqlite": "SQLite", "mongodb": "MongoDB",
+    "git": "Git", "github": "Git", "version control": "Git", "gitlab": "Git",
+    "docker": "Docker", "containers": "Docker", "containerization": "Docker",
+    "kubernetes": "Kubernetes", "k8s": "Kubernetes",
+    "aws": "AWS", "amazon web services": "AWS", "cloud": "Cloud Computing", "cloud computing": "Cloud Computing",
+    "ec2": "AWS EC2", "s3": "AWS S3", "lambda": "AWS Lambda",
+    "system design": "System Design", "architecture": "System Design", "scalability": "System Design",
+    "distributed systems": "Distributed Systems", "microservices": "Microservices",
+    "data structures": "Data Structures & Algorithms", "algorithms": "Data Structures & Algorithms",
+    "dsa": "Data Structures & Algorithms", "leetcode": "Data Structures & Algorithms",
+    "coding interview": "Data Structures & Algorithms",
+    "html": "HTML & CSS", "css": "HTML & CSS", "html5": "HTML & CSS", "css3": "HTML & CSS",
+    "html/css": "HTML & CSS", "web fundamentals": "HTML & CSS",
+    "tailwindcss": "Tailwind CSS", "tailwind": "Tailwind CSS",
+    "api": "REST APIs", "rest api": "REST APIs", "restful": "REST APIs", "graphql": "GraphQL",
+    "testing": "Testing", "unit testing": "Testing", "jest": "Jest", "pytest": "pytest",
+    "test driven development": "Test-Driven Development", "tdd": "Test-Driven Development",
+}
+
+# (phase name, description, categories) in learning order
+PHASE_LAYOUT = [
+    ("Foundations", "Core language, web and tooling skills every later phase builds on",
+     ["python", "javascript", "html_css", "git"]),
+    ("Frameworks & Data", "The frameworks, APIs and databases named in the job description",
+     ["typescript", "react", "nodejs", "api_design", "sql"]),
+    ("Production Engineering", "Testing, packaging and deploying software the way teams ship it",
+     ["testing", "docker", "aws"]),
+    ("Interview Readiness", "Problem solving and design skills tested in technical interviews",
+     ["data_structures", "system_design"]),
+]
+
+# Share of technical interviews that probe each category (rough industry estimates)
+INTERVIEW_FREQUENCY = {
+    "data_structures": 90, "system_design": 75, "sql": 70, "python": 70, "javascript": 70,
+    "react": 65, "api_design": 60, "nodejs": 55, "typescript": 50, "git": 45, "testing": 45,
+    "docker": 40, "aws": 40, "html_css": 40,
+}
+
+HOURS_BY_LEVEL = {"beginner": 30, "intermediate": 20, "advanced": 12}
+HOURS_PER_WEEK = 10
+
+# Always covered so every roadmap prepares for interviews
+ESSENTIAL_TERMS = ["git", "data structures"]
+DEFAULT_TERMS = ["python", "git", "sql", "rest api", "data structures"]
+
+_TITLE_LINE = re.compile(r"(?im)^\s*(?:job\s*title|title|position|role)\s*[:\-]\s*(.{3,80})$")
+_ROLE_WORDS = re.compile(
+    r"\b(engineer|developer|scientist|analyst|manager|designer|architect|administrator|specialist|consultant)\b",
+    re.I,
+)
+
+
+def _category_for(term: str) -> Optional[str]:
+    return SKILL_CATEGORY_MAP.get(term) or EXTRA_CATEGORIES.get(term) or get_skill_category(term)
+
+
+@lru_cache(maxsize=1)
+def _term_matcher() -> SkillMatcher:
+    """Every known skill term mapped to its category, matched on word boundaries"""
+    terms = list(SKILL_CATEGORY_MAP) + list(EXTRA_CATEGORIES) + list(OFFICIAL_DOCS)
+    return SkillMatcher((t, _category_for(t)) for t in terms if _category_for(t))
+
+
+def extract_skills(job_description: str) -> List[Tuple[str, str, int]]:
+    """(display name, category, mentions) for each skill in the JD, in order of first mention"""
+    found: Dict[str, List] = {}
+    for match in _term_matcher().find_all(job_description):
+        term, category = match.alias, match.value
+        name = DISPLAY_NAMES.get(term, term.title())
+        if name in found:
+            found[name][2] += 1
+        else:
+            found[name] = [name, category, 1]
+    return [tuple(v) for v in found.values()]
+
+
+def extract_job_title(job_description: str) -> str:
+    text = job_description or ""
+    labelled = _TITLE_LINE.search(text)
+    if labelled:
+        return labelled.group(1).strip()
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    if len(first_line) <= 80 and _ROLE_WORDS.search(first_line):
+        return first_line.rstrip(".:")
+    return "Software Engineer"
+
+
+def _build_skill(name: str, category: str, mentions: int, skill_level: str, job_title: str) -> dict:
+    level = skill_level if skill_level in HOURS_BY_LEVEL else "beginner"
+    frequency = INTERVIEW_FREQUENCY.get(category, 40)
+    return {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "category": "technical",
+        "difficulty": level,
+        "importance": "critical" if mentions >= 2 or frequency >= 70 else "important",
+        "interview_frequency": frequency,
+        "estimated_hours": HOURS_BY_LEVEL[level],
+        "description": f"{name} as used day to day by a {job_title}.",
+        "why_this_matters": f"{name} is expected for this role and comes up in roughly {frequency}% of technical interviews.",
+        "what_if_skipped": f"Gaps in {name} tend to surface in technical screens and slow you down in the first weeks on the job.",
+        "resources": get_resources_for_skill(name, user_tier="standard"),
+    }
+
+
+def _build_projects(skills: List[Tuple[str, str, int]], skill_level: str) -> List[dict]:
+    level = skill_level if skill_level in HOURS_BY_LEVEL else "beginner"
+    has = {category for _, category, _ in skills}
+    skill_names = [name for name, _, _ in skills]
+
+    def names_in(categories: set) -> List[str]:
+        return [name for name, category, _ in skills if category in categories][:4]
+
+    projects = []
+
+    if has & {"react", "javascript", "html_css", "typescript"}:
+        projects.append({
+            "title": "Responsive Web Dashboard",
+            "description": "A responsive single-page dashboard that fetches data from a public API, with loading and error states.",
+            "skills": names_in({"react", "javascript", "html_css", "typescript"}),
+            "estimated_hours": 20,
+        })
+    if has & {"python", "nodejs", "api_design", "sql"}:
+        projects.append({
+            "title": "REST API with Authentication",
+            "description": "A REST API with user sign-up, token authentication, a relational data model and input validation.",
+            "skills": names_in({"python", "nodejs", "api_design", "sql"}),
+            "estimated_hours": 25,
+        })
+    if has & {"docker", "aws", "testing"}:
+        projects.append({
+            "title": "Tested, Containerized Deployment",
+            "description": "Add automated tests and CI to an earlier project, containerize it and deploy it to the cloud.",
+            "skills": names_in({"docker", "aws", "testing"}),
+            "estimated_hours": 15,
+        })
+    projects.append({
+        "title": "Capstone: Job-Ready Portfolio Project",
+        "description": "An end-to-end project combining the core skills from this roadmap, documented for recruiters.",
+        "skills": skill_names[:5],
+        "estimated_hours": 40,
+    })
+
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "difficulty": level,
+            "resume_bullet": f"Built {p['title'].lower()} using {', '.join(p['skills'][:3]) or 'modern tooling'}",
+            "interview_talking_points": [
+                "Why you chose this architecture and what you would change at 10x scale",
+                "The hardest bug you hit and how you tracked it down",
+            ],
+            "steps": ["Plan features and data model", "Build the core functionality", "Add tests", "Write a README and deploy"],
+            **p,
+        }
+        for p in projects[:4]
+    ]
+
+
+def build_local_roadmap(job_description: str, skill_level: str, industry: Optional[str] = None) -> dict:
+    """Assemble a roadmap from the JD without calling the LLM"""
+    job_title = extract_job_title(job_description)
+    skills = extract_skills(job_description)
+    if not skills:
+        skills = [(DISPLAY_NAMES[t], _category_for(t), 1) for t in DEFAULT_TERMS]
+    present = {name for name, _, _ in skills}
+    for term in ESSENTIAL_TERMS:
+        if DISPLAY_NAMES[term] not in present:
+            skills.append((DISPLAY_NAMES[term], _category_for(term), 1))
+
+    phases = []
+    for name, description, categories in PHASE_LAYOUT:
+        phase_skills = [
+            _build_skill(skill_name, category, mentions, skill_level, job_title)
+            for skill_name, category, mentions in skills
+            if category in categories
+        ]
+        if not phase_skills:
+            continue
+        phase_skills.sort(key=lambda s: s["interview_frequency"], reverse=True)
+        hours = sum(s["estimated_hours"] for s in phase_skills)
+        phases.append({
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "description": description,
+            "order": len(phases) + 1,
+            "estimated_weeks": max(1, math.ceil(hours / HOURS_PER_WEEK)),
+            "skills": phase_skills,
+        })
+
+    return {
+        "job_title": job_title,
+        "industry": industry or "Technology",
+        "estimated_weeks": sum(p["estimated_weeks"] for p in phases),
+        "why_this_roadmap": "Skills detected in the job description, ordered from foundations to interview readiness.",
+        "phases": phases,
+        "projects": _build_projects(skills, skill_level),
+    }
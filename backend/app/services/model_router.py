@@ -0,0 +1,177 @@
+"""
+Model Router
+Per-task model, token limit, temperature and timeout for every LLM call.
+
+Each feature tag used with the LLM gateway maps to a Route. Heavy generation
+(roadmaps, projects, resume analysis) stays on the primary model; light tasks
+(concept explanations, quizzes, JD skill extraction, output repair) run on
+the fast model. Routes can be overridden per feature with LLM_ROUTES, e.g.
+LLM_ROUTES='{"generate_quiz": {"tier": "primary", "max_tokens": 1500}}'.
+
+Routes with a latency SLO are watched: when the p95 latency of the primary
+model over the recent window exceeds the SLO, the feature is served by the
+fast model for LLM_SLO_DOWNGRADE_SECONDS, then the primary is tried again.
+Streamed features are judged on time to first token.
+"""
+
+import math
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class Route(NamedTuple):
+    tier: str  # primary, fast
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    timeout_seconds: Optional[float] = None
+    slo_p95_seconds: Optional[float] = None
+
+
+DEFAULT_ROUTE = Route("primary")
+
+ROUTES: Dict[str, Route] = {
+    # Roadmaps (the full roadmap has its own local fallback instead of an SLO)
+    "roadmap": Route("primary", 4000, 0.7, 90.0),
+    "roadmap_stream": Route("primary", 4000, 0.7, 90.0),
+    "roadmap_outline": Route("primary", 1500, 0.7, 30.0, slo_p95_seconds=15.0),
+    "roadmap_phase_detail": Route("primary", 3000, 0.7, 60.0, slo_p95_seconds=30.0),
+    # Chat (streamed variants are judged on time to first token)
+    "chat_response": Route("primary", 1000, 0.7, 45.0, slo_p95_seconds=10.0),
+    "stream_chat_response": Route("primary", 1000, 0.7, 45.0, slo_p95_seconds=3.0),
+    "chat_with_study_buddy": Route("primary", 1500, 0.7, 45.0, slo_p95_seconds=10.0),
+    "stream_chat_with_study_buddy": Route("primary", 1500, 0.7, 45.0, slo_p95_seconds=3.0),
+    "chat_interview_mode": Route("primary", 1000, 0.9, 45.0, slo_p95_seconds=10.0),
+    "stream_chat_interview_mode": Route("primary", 1000, 0.9, 45.0, slo_p95_seconds=3.0),
+    # Study buddy
+    "explain_concept": Route("fast", 1500, 0.5, 30.0),
+    "generate_quiz": Route("fast", 2000, 0.7, 30.0),
+    "debug_code": Route("primary", 2000, 0.7, 60.0, slo_p95_seconds=30.0),
+    "review_project": Route("primary", 2000, 0.7, 60.0),
+    "suggest_learning_path": Route("primary", 2500, 0.7, 60.0),
+    # Interview
+    "generate_interview_questions": Route("primary", 3000, 0.7, 60.0),
+    "evaluate_interview_response": Route("primary", 2000, 0.5, 60.0, slo_p95_seconds=30.0),
+    # Resume, portfolio, job descriptions
+    "analyze_resume": Route("primary", 3000, 0.5, 60.0),
+    "calculate_skill_gap": Route("primary", 2500, 0.5, 60.0),
+    "optimize_resume_for_ats": Route("primary", 3000, 0.5, 60.0),
+    "generate_cover_letter": Route("primary", 1500, 0.7, 60.0),
+    "generate_portfolio_content": Route("primary", 2000, 0.7, 60.0),
+    "extract_skills_from_jd": Route("fast", 1000, 0.3, 20.0),
+    # Projects
+    "generate_project_idea": Route("primary", 3000, 0.8, 60.0),
+    "generate_implementation_guide": Route("primary", 4000, 0.6, 90.0),
+    "generate_test_cases": Route("primary", 3000, 0.5, 60.0),
+    "review_project_code": Route("primary", 3000, 0.5, 60.0),
+    "suggest_project_improvements": Route("primary", 2500, 0.7, 60.0),
+    # Fragment repair of structured output (any "<feature>_repair")
+    "repair": Route("fast", None, 0.2, 30.0),
+}
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        routes: Dict[str, Route],
+        tier_models: Dict[str, str],
+        slo_enabled: bool = True,
+        window_seconds: float = 300.0,
+        min_samples: int = 20,
+        downgrade_seconds: float = 120.0,
+    ):
+        self.routes = routes
+        self.tier_models = tier_models
+        self.slo_enabled = slo_enabled
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.downgrade_seconds = downgrade_seconds
+        self._windows: Dict[str, Deque[Tuple[float, float]]] = defaultdict(deque)
+        self._downgraded_until: Dict[str, float] = {}
+        self.downgrades: Dict[str, int] = defaultdict(int)
+
+    def route(self, feature: str) -> Route:
+        if feature in self.routes:
+            return self.routes[feature]
+        if feature.endswith("_repair"):
+            return self.routes.get("repair", DEFAULT_ROUTE)
+        return DEFAULT_ROUTE
+
+    def model_for(self, feature: str) -> str:
+        """Configured model for a feature, ignoring any SLO downgrade"""
+        return self.tier_models[self.route(feature).tier]
+
+    def is_downgraded(self, feature: str) -> bool:
+        return self._downgraded_until.get(feature, 0.0) > time.monotonic()
+
+    def select(self, feature: str) -> Tuple[Route, str]:
+        """Route and model to use for the next call"""
+        route = self.route(feature)
+        if route.tier != "fast" and self.is_downgraded(feature):
+            return route, self.tier_models["fast"]
+        return route, self.tier_models[route.tier]
+
+    def _p95(self, feature: str) -> Optional[float]:
+        window = self._windows.get(feature)
+        if not window:
+            return None
+        latencies = sorted(latency for _, latency in window)
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def observe(self, feature: str, model: str, latency_seconds: float) -> None:
+        """Record a primary-model latency and downgrade the feature if its p95 breaks the SLO"""
+        route = self.route(feature)
+        if not self.slo_enabled or route.slo_p95_seconds is None or model != self.tier_models[route.tier]:
+            return
+        if self.tier_models[route.tier] == self.tier_models["fast"]:
+            return
+
+        now = time.monotonic()
+        window = self._windows[feature]
+        window.append((now, latency_seconds))
+        while window and window[0][0] < now - self.window_seconds:
+            window.popleft()
+        if len(window) < self.min_samples:
+            return
+
+        p95 = self._p95(feature)
+        if p95 > route.slo_p95_seconds:
+            self._downgraded_until[feature] = now + self.downgrade_seconds
+            self.downgrades[feature] += 1
+            window.clear()
+            print(
+                f"🐢 {feature}: p95 {p95:.1f}s > SLO {route.slo_p95_seconds:.1f}s on {model}, "
+                f"using {self.tier_models['fast']} for {self.downgrade_seconds:.0f}s"
+            )
+
+    def stats(self) -> dict:
+        features = {}
+        for feature, route in sorted(self.routes.items()):
+            _, model = self.select(feature)
+            features[feature] = {
+                **route._asdict(),
+                "model": model,
+                "downgraded": self.is_downgraded(feature),
+                "downgrades": self.downgrades.get(feature, 0),
+                "window_p95_seconds": self._p95(feature),
+            }
+        return {"tier_models": self.tier_models, "features": features}
+
+
+def _configured_routes() -> Dict[str, Route]:
+    routes = dict(ROUTES)
+    for feature, overrides in settings.LLM_ROUTES.items():
+        routes[feature] = routes.get(feature, DEFAULT_ROUTE)._replace(**overrides)
+    return routes
+
+
+model_router = ModelRouter(
+    routes=_configured_routes(),
+    tier_models={"primary": settings.OPENAI_MODEL, "fast": settings.OPENAI_FAST_MODEL},
+    slo_enabled=settings.LLM_SLO_ENABLED,
+    window_seconds=settings.LLM_SLO_WINDOW_SECONDS,
+    min_samples=settings.LLM_SLO_MIN_SAMPLES,
+    downgrade_seconds=settings.LLM_SLO_DOWNGRADE_SECONDS,
+)
@@ -1,11 +1,8 @@
 """AI Project Generator service."""
 from typing import List, Optional
-from openai import AsyncOpenAI
 import uuid
 
-from app.core.config import settings
-
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+from app.services.llm_gateway import llm_gateway
 
 
 async def generate_project_idea(
@@ -51,14 +48,12 @@ Generate a detailed project in JSON format:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_project_idea",
             messages=[
                 {"role": "system", "content": "You are a creative project idea generator. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.8,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
@@ -119,14 +114,12 @@ Provide a comprehensive guide in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_implementation_guide",
             messages=[
                 {"role": "system", "content": "You are a senior software engineer creating implementation guides. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.6,
-            max_tokens=4000,
             response_format={"type": "json_object"}
         )
         
@@ -167,14 +160,12 @@ Create test cases in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_test_cases",
             messages=[
                 {"role": "system", "content": "You are a QA engineer creating test cases. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
@@ -221,14 +212,12 @@ Provide detailed review in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="review_project_code",
             messages=[
                 {"role": "system", "content": "You are a senior code reviewer. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
@@ -272,14 +261,12 @@ Provide suggestions in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="suggest_project_improvements",
             messages=[
                 {"role": "system", "content": "You are a product manager suggesting improvements. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2500,
             response_format={"type": "json_object"}
         )
         
@@ -0,0 +1,115 @@
+"""
+In-Memory Redis
+Minimal asyncio stand-in for the Redis commands the Redis-backed services use.
+
+Selected with the "redis-memory" backends of the roadmap cache and the
+resource health store, so tests and single-process development exercise the
+same code paths as production without a Redis server.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+
+class InMemoryPubSub:
+    """Subscriber side of InMemoryRedis publish/subscribe"""
+
+    def __init__(self, redis: "InMemoryRedis"):
+        self._redis = redis
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue()
+        self.channels: set = set()
+
+    async def subscribe(self, *channels: str) -> None:
+        self.channels.update(channels)
+        self._redis._subscribers.add(self)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout or 0.001)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._redis._subscribers.discard(self)
+
+    aclose = close
+
+
+class InMemoryRedis:
+    """Minimal asyncio Redis stand-in implementing the commands the Redis-backed services use"""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Optional[float], str]] = {}
+        self._zsets: Dict[str, Dict[str, float]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._subscribers: set = set()
+
+    def _alive(self, key: str) -> bool:
+        entry = self._values.get(key)
+        if entry is None:
+            return False
+        expires_at = entry[0]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return False
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._values[key][1] if self._alive(key) else None
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._values[key] = (expires_at, value)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._values.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    async def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        zset = self._zsets.setdefault(name, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update(mapping)
+        return added
+
+    async def zcard(self, name: str) -> int:
+        return len(self._zsets.get(name, {}))
+
+    async def zrange(self, name: str, start: int, end: int) -> list:
+        members = sorted(self._zsets.get(name, {}).items(), key=lambda item: item[1])
+        end = len(members) if end == -1 else end + 1
+        return [member for member, _ in members[start:end]]
+
+    async def zrem(self, name: str, *members: str) -> int:
+        zset = self._zsets.get(name, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    async def incr(self, name: str) -> int:
+        value = int(await self.get(name) or 0) + 1
+        self._values[name] = (None, str(value))
+        return value
+
+    async def hset(self, name: str, key: Optional[str] = None, value: Optional[str] = None, mapping: Optional[Dict[str, str]] = None) -> int:
+        fields = dict(mapping or {})
+        if key is not None:
+            fields[key] = value
+        hash_ = self._hashes.setdefault(name, {})
+        added = sum(1 for field in fields if field not in hash_)
+        hash_.update(fields)
+        return added
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self._hashes.get(name, {}))
+
+    async def publish(self, channel: str, message: str) -> int:
+        receivers = [s for s in self._subscribers if channel in s.channels]
+        for subscriber in receivers:
+            subscriber._queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    def pubsub(self) -> InMemoryPubSub:
+        return InMemoryPubSub(self)
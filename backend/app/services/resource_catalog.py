@@ -0,0 +1,162 @@
+"""
+Resource Catalog
+Learning resources served from the learning_resources table.
+
+Requests read an immutable in-memory snapshot (resource_service_v2.get_catalog),
+never the database. Every catalog edit bumps resource_catalog_state.version in
+the same transaction. Each worker polls that single row every
+RESOURCE_CATALOG_POLL_SECONDS; when the version has moved it loads the active
+rows, compiles a new snapshot and swaps it in atomically, so edits go live on
+every worker without a restart or redeploy.
+
+Until the table is seeded (python -m scripts.seed_resource_catalog) the
+built-in VERIFIED_RESOURCES snapshot (version 0) is served.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.resources import LearningResource, ResourceCatalogState
+from app.services.resource_service_v2 import VERIFIED_RESOURCES, get_catalog, install_catalog
+
+
+def catalog_row_fields(category: str, resource: dict) -> dict:
+    """LearningResource column values for a catalog entry"""
+    return {
+        "slug": resource["id"],
+        "title": resource.get("title", resource["id"]),
+        "url": resource["url"],
+        "description": resource.get("description"),
+        "skill_category": category,
+        "resource_type": resource.get("type", "article"),
+        "provider": resource.get("provider"),
+        "difficulty": resource.get("difficulty", "beginner"),
+        "quality_score": resource.get("quality_score", 0.8),
+        "duration_minutes": resource.get("duration_minutes"),
+        "tier_required": resource.get("tier_required", "free"),
+        "is_official": resource.get("is_official", False),
+        "is_verified": resource.get("verified", False),
+        "last_verified_at": datetime.fromisoformat(resource["last_verified"]) if resource.get("last_verified") else None,
+    }
+
+
+def _resource_from_row(row: LearningResource, slugs_by_id: Dict) -> dict:
+    resource = {
+        "id": row.slug or str(row.id),
+        "title": row.title,
+        "url": row.url,
+        "description": row.description,
+        "type": row.resource_type,
+        "provider": row.provider,
+        "difficulty": row.difficulty,
+        "duration_minutes": row.duration_minutes,
+        "quality_score": row.quality_score,
+        "tier_required": row.tier_required or "free",
+        "is_official": True if row.is_official else None,
+        "verified": bool(row.is_verified),
+        "last_verified": row.last_verified_at.date().isoformat() if row.last_verified_at else None,
+        "fallback_id": slugs_by_id.get(row.fallback_resource_id),
+    }
+    return {key: value for key, value in resource.items() if value is not None}
+
+
+async def current_catalog_version(session: AsyncSession) -> int:
+    state = await session.get(ResourceCatalogState, 1)
+    return state.version if state else 0
+
+
+async def bump_catalog_version(session: AsyncSession) -> int:
+    """Mark the catalog as changed; call inside the transaction that edits learning_resources"""
+    state = await session.get(ResourceCatalogState, 1, with_for_update=True)
+    if state is None:
+        state = ResourceCatalogState(id=1, version=0)
+        session.add(state)
+    state.version = (state.version or 0) + 1
+    return state.version
+
+
+async def refresh_catalog(force: bool = False) -> bool:
+    """Load the database catalog if its version differs from the installed snapshot"""
+    async with AsyncSessionLocal() as session:
+        version = await current_catalog_version(session)
+        if version == 0 or (version == get_catalog().version and not force):
+            return False
+        result = await session.execute(
+            select(LearningResource)
+            .where(LearningResource.is_active.isnot(False))
+            .order_by(LearningResource.skill_category, LearningResource.created_at, LearningResource.slug)
+        )
+        rows = result.scalars().all()
+
+    slugs_by_id = {row.id: row.slug or str(row.id) for row in rows}
+    resources_by_category: Dict[str, List[dict]] = {}
+    for row in rows:
+        resources_by_category.setdefault(row.skill_category, []).append(_resource_from_row(row, slugs_by_id))
+
+    install_catalog(resources_by_category, version)
+    print(f"📚 Resource catalog v{version} loaded: {len(rows)} resources in {len(resources_by_category)} categories")
+    return True
+
+
+async def seed_catalog(overwrite: bool = False) -> Dict[str, int]:
+    """
+    Import VERIFIED_RESOURCES into learning_resources
+
+    New entries are inserted; existing rows (matched by slug, then url) keep their
+    edits unless `overwrite`. Health tracking columns are never touched.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(LearningResource))
+        existing = result.scalars().all()
+        by_slug = {row.slug: row for row in existing if row.slug}
+        by_url = {row.url: row for row in existing}
+
+        rows: Dict[str, LearningResource] = {}
+        for category, resources in VERIFIED_RESOURCES.items():
+            for resource in resources:
+                fields = catalog_row_fields(category, resource)
+                row = by_slug.get(resource["id"]) or by_url.get(resource["url"])
+                if row is None:
+                    row = LearningResource(**fields)
+                    session.add(row)
+                    counts["inserted"] += 1
+                elif overwrite or row.slug is None:
+                    for key, value in fields.items():
+                        if key != "last_verified_at":
+                            setattr(row, key, value)
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+                rows[resource["id"]] = row
+        await session.flush()
+
+        for resources in VERIFIED_RESOURCES.values():
+            for resource in resources:
+                fallback = rows.get(resource.get("fallback_id"))
+                row = rows[resource["id"]]
+                if fallback is not None and (overwrite or row.fallback_resource_id is None):
+                    row.fallback_resource_id = fallback.id
+
+        counts["version"] = await bump_catalog_version(session)
+        await session.commit()
+    return counts
+
+
+async def run_catalog_poller(stop_event: asyncio.Event) -> None:
+    """Catalog version poll started from the application lifespan"""
+    while not stop_event.is_set():
+        try:
+            await refresh_catalog()
+        except Exception as e:
+            print(f"⚠ Resource catalog refresh failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.RESOURCE_CATALOG_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,163 @@
+"""
+Resource Health Store
+Resource health state shared by every worker.
+
+get_resources_for_skill only ever reads the process-local health dict in
+resource_service_v2, so the hot path never leaves the process. This store
+keeps that dict in step with the other workers:
+- writes (broken-link reports, link health passes) are applied locally, saved
+  in a Redis hash and announced on a pub/sub channel
+- every worker listens on the channel and applies announced changes, so all
+  workers converge well within a second
+- on start, after a reconnect, and whenever the shared version counter shows a
+  missed message, the whole hash is reloaded
+
+Backends (RESOURCE_HEALTH_BACKEND):
+- auto (default): redis when REDIS_URL is configured, memory otherwise
+- memory: this process only (single worker, no Redis)
+- redis: shared on settings.REDIS_URL
+- redis-memory: InMemoryRedis stand-in, for tests
+"""
+
+import asyncio
+import json
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.redis_memory import InMemoryRedis
+from app.services.resource_service_v2 import _set_resource_health, mark_resource_unhealthy
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class ResourceHealthStore:
+    def __init__(self, redis_client=None, namespace: str = "pathwise", resync_seconds: float = 30.0):
+        self.redis = redis_client
+        self.hash_key = f"{namespace}:resource_health"
+        self.version_key = f"{namespace}:resource_health:version"
+        self.channel = f"{namespace}:resource_health:changes"
+        self.resync_seconds = resync_seconds
+        self._version = 0  # Last shared version applied here
+        self.published = 0
+        self.received = 0
+        self.resyncs = 0
+        self.errors = 0
+
+    async def set(self, resource_id: str, health: Dict) -> None:
+        """Apply a health status here and announce it to the other workers"""
+        _set_resource_health(resource_id, health)
+        await self._publish({resource_id: health})
+
+    async def set_many(self, states: Dict[str, Dict]) -> None:
+        for resource_id, health in states.items():
+            _set_resource_health(resource_id, health)
+        await self._publish(states)
+
+    async def mark_unhealthy(self, resource_id: str, reason: str) -> Dict:
+        health = mark_resource_unhealthy(resource_id, reason)
+        await self._publish({resource_id: health})
+        return health
+
+    async def _publish(self, states: Dict[str, Dict]) -> None:
+        if self.redis is None or not states:
+            return
+        try:
+            await self.redis.hset(self.hash_key, mapping={rid: json.dumps(h) for rid, h in states.items()})
+            version = await self.redis.incr(self.version_key)
+            await self.redis.publish(self.channel, json.dumps({"version": version, "states": states}))
+            self.published += 1
+        except Exception as e:
+            # Applied locally already; other workers catch up on their next resync
+            self.errors += 1
+            print(f"⚠ Failed to share resource health: {e}")
+
+    async def resync(self) -> int:
+        """Reload the whole shared hash into the local health state"""
+        version = int(_text(await self.redis.get(self.version_key)) or 0)
+        states = await self.redis.hgetall(self.hash_key)
+        for resource_id, raw in states.items():
+            _set_resource_health(_text(resource_id), json.loads(_text(raw)))
+        self._version = version
+        self.resyncs += 1
+        return len(states)
+
+    def _apply(self, message: dict) -> bool:
+        """Apply an announced change; False if messages were missed and a resync is needed"""
+        payload = json.loads(_text(message["data"]))
+        for resource_id, health in payload["states"].items():
+            _set_resource_health(resource_id, health)
+        self.received += 1
+        missed = payload["version"] > self._version + 1
+        self._version = max(self._version, payload["version"])
+        return not missed
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Listener started from the application lifespan"""
+        if self.redis is None:
+            return
+        while not stop_event.is_set():
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                await self.resync()
+                loop = asyncio.get_running_loop()
+                next_resync = loop.time() + self.resync_seconds
+                while not stop_event.is_set():
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    in_order = True
+                    if message and message.get("type") == "message":
+                        in_order = self._apply(message)
+                    if not in_order or loop.time() >= next_resync:
+                        await self.resync()
+                        next_resync = loop.time() + self.resync_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠ Resource health listener failed, reconnecting: {e}")
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory" if self.redis is None else type(self.redis).__name__,
+            "version": self._version,
+            "published": self.published,
+            "received": self.received,
+            "resyncs": self.resyncs,
+            "errors": self.errors,
+        }
+
+
+def create_resource_health_store() -> ResourceHealthStore:
+    """Build the health store configured in settings"""
+    backend_name = settings.RESOURCE_HEALTH_BACKEND.lower()
+    if backend_name == "auto":
+        # REDIS_URL has a localhost default, so only an explicitly configured one counts
+        backend_name = "redis" if "REDIS_URL" in settings.model_fields_set else "memory"
+    redis_client: Optional[object] = None
+
+    if backend_name == "redis":
+        try:
+            import redis.asyncio as redis_asyncio
+            redis_client = redis_asyncio.from_url(settings.REDIS_URL)
+        except Exception as e:
+            print(f"⚠ Redis resource health store unavailable ({e}), keeping health per process")
+    elif backend_name == "redis-memory":
+        redis_client = InMemoryRedis()
+    else:
+        print("⚠ Resource health is kept per process; set REDIS_URL to share it across workers")
+
+    return ResourceHealthStore(redis_client, resync_seconds=settings.RESOURCE_HEALTH_RESYNC_SECONDS)
+
+
+resource_health_store = create_resource_health_store()
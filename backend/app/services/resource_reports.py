@@ -0,0 +1,169 @@
+"""
+Resource Reports
+User reports of broken or outdated learning resources, stored in resource_reports.
+
+Each report is aggregated into LearningResource.report_count, the number of
+distinct users who reported the resource. A user's first report inserts a
+resource_reporters row (primary key (resource_id, user_id), insert ... on
+conflict do nothing) and only the insert that wins increments the count, so
+concurrent first reports from the same user are counted once. Once RESOURCE_REPORT_DEMOTION_THRESHOLD users have
+reported a resource it is served with its fallback on every worker (see
+link_health._health_state and resource_health_store).
+
+The review queue is read newest first with keyset pagination on
+(created_at, id), so a page costs the same however deep it is.
+"""
+
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import engine
+from app.models.resources import LearningResource, ResourceReport, ResourceReporter
+from app.services.link_health import _health_state
+from app.services.resource_catalog import catalog_row_fields
+from app.services.resource_health_store import resource_health_store
+from app.services.resource_service_v2 import get_catalog
+
+
+async def _resource_row(db: AsyncSession, resource_id: str, resource_url: str) -> Optional[LearningResource]:
+    """LearningResource for a catalog id, created from the catalog if the table was never seeded"""
+    result = await db.execute(
+        select(LearningResource).where(
+            or_(LearningResource.slug == resource_id, LearningResource.url == resource_url)
+        )
+    )
+    rows = result.scalars().all()
+    row = next((r for r in rows if r.slug == resource_id), rows[0] if rows else None)
+    if row is not None:
+        return row
+
+    for category, resources in get_catalog().resources_by_category.items():
+        for resource in resources:
+            if resource["id"] == resource_id:
+                row = LearningResource(**catalog_row_fields(category, dict(resource)), consecutive_failures=0)
+                db.add(row)
+                await db.flush()
+                return row
+    return None
+
+
+async def submit_report(
+    db: AsyncSession,
+    user_id: str,
+    resource_id: str,
+    resource_url: str,
+    report_type: str,
+    description: Optional[str] = None,
+    suggested_replacement_url: Optional[str] = None,
+) -> Optional[Tuple[ResourceReport, LearningResource]]:
+    """Store a report and update the resource's reporter count; None if the resource is unknown"""
+    row = await _resource_row(db, resource_id, resource_url)
+    if row is None:
+        return None
+
+    user_uuid = uuid.UUID(user_id)
+    insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    inserted = await db.execute(
+        insert(ResourceReporter)
+        .values(resource_id=row.id, user_id=user_uuid, first_reported_at=datetime.utcnow())
+        .on_conflict_do_nothing()
+    )
+    first_from_user = inserted.rowcount == 1
+
+    report = ResourceReport(
+        resource_id=row.id,
+        user_id=user_uuid,
+        report_type=report_type,
+        description=description,
+        suggested_replacement_url=suggested_replacement_url,
+        status="pending",
+        created_at=datetime.utcnow(),
+    )
+    db.add(report)
+
+    if first_from_user:
+        # Incremented in SQL so concurrent reports on other workers are not lost
+        result = await db.execute(
+            update(LearningResource)
+            .where(LearningResource.id == row.id)
+            .values(report_count=func.coalesce(LearningResource.report_count, 0) + 1)
+            .returning(LearningResource.report_count)
+        )
+        row.report_count = result.scalar_one()
+    await db.commit()
+
+    if first_from_user and row.report_count == settings.RESOURCE_REPORT_DEMOTION_THRESHOLD and row.slug:
+        await resource_health_store.set(row.slug, _health_state(row))
+        print(f"🚩 Resource {row.slug} demoted after {row.report_count} user reports")
+    return report, row
+
+
+def _encode_cursor(report: ResourceReport) -> str:
+    return f"{report.created_at.isoformat()}_{report.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    created_at, report_id = cursor.rsplit("_", 1)
+    return datetime.fromisoformat(created_at), uuid.UUID(report_id)
+
+
+async def list_reports(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of the review queue, newest first
+
+    `cursor` is the next_cursor of the previous page. Raises ValueError for a
+    malformed cursor.
+    """
+    query = (
+        select(ResourceReport, LearningResource.slug, LearningResource.url)
+        .join(LearningResource, LearningResource.id == ResourceReport.resource_id)
+    )
+    if status:
+        query = query.where(ResourceReport.status == status)
+    if cursor:
+        created_at, report_id = _decode_cursor(cursor)
+        query = query.where(or_(
+            ResourceReport.created_at < created_at,
+            and_(ResourceReport.created_at == created_at, ResourceReport.id < report_id),
+        ))
+    query = query.order_by(ResourceReport.created_at.desc(), ResourceReport.id.desc()).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = result.all()
+    page = rows[:limit]
+    reports = [
+        {
+            "id": str(report.id),
+            "resource_id": slug or str(report.resource_id),
+            "resource_url": url,
+            "report_type": report.report_type,
+            "description": report.description,
+            "suggested_replacement_url": report.suggested_replacement_url,
+            "user_id": str(report.user_id),
+            "status": report.status,
+            "created_at": report.created_at.isoformat(),
+        }
+        for report, slug, url in page
+    ]
+    next_cursor = _encode_cursor(page[-1][0]) if len(rows) > limit else None
+    return reports, next_cursor
+
+
+async def count_reports(db: AsyncSession, status: Optional[str] = None) -> int:
+    query = select(func.count()).select_from(ResourceReport)
+    if status:
+        query = query.where(ResourceReport.status == status)
+    result = await db.execute(query)
+    return result.scalar_one()
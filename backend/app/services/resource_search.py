@@ -0,0 +1,247 @@
+"""
+Resource Search
+Inverted index with BM25 ranking over the verified resource catalog.
+
+Each resource is indexed on its title, provider, category and the skill
+aliases that map to its category ("k8s", "version control", ...). Terms are
+lowercased and lightly stemmed; "c++", "c#" and "node.js" stay whole.
+
+Query terms are resolved to index terms in order of preference:
+- exact term
+- edge n-gram prefix for the last term, so "kube" finds "kubernetes" while typing
+- one edit away via a deletion index, so "pyhton" finds "python"
+
+A resource must match every term of a one- or two-term query and at least
+three quarters of a longer one (stopwords are ignored), so "machine learning"
+does not return everything with "learn" in the title. Resources that miss
+some terms of a long query are scaled down by the share they match.
+
+Scores are BM25 over field-weighted term frequencies, blended with the
+resource's quality_score. Tier access is checked while walking posting lists,
+so inaccessible resources are never scored. When a new catalog snapshot is
+installed only the resources that changed are re-indexed.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from app.services.resource_service_v2 import (
+    SKILL_CATEGORY_MAP,
+    TIER_ORDER,
+    ResourceCatalog,
+    get_catalog,
+    on_catalog_change,
+)
+
+# Term frequency weight per field
+FIELD_WEIGHTS = {"title": 2.0, "provider": 1.0, "category": 1.5, "alias": 1.0}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Share of the final score driven by quality_score (0..1)
+QUALITY_WEIGHT = 0.3
+# Matches through a prefix or a typo count for less than exact matches
+PREFIX_PENALTY = 0.7
+TYPO_PENALTY = 0.5
+
+MIN_PREFIX = 2
+MIN_TYPO_LENGTH = 4
+
+# Queries longer than this many terms may leave some unmatched
+ALL_TERMS_UP_TO = 2
+MIN_TERM_SHARE = 0.75
+# Query words that say nothing about the resource
+STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "the", "to", "with"})
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*")
+
+
+def _stem(token: str) -> str:
+    """Light plural/gerund stemming ("databases" -> "database", "testing" -> "test")"""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("ing") and len(token) >= 7:
+        return token[:-3]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN.findall((text or "").lower().replace("_", " "))]
+
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class ResourceSearchIndex:
+    def __init__(self, aliases_by_category: Optional[Dict[str, List[str]]] = None):
+        self.aliases_by_category = aliases_by_category or {}
+        # term -> {resource id: field-weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._prefixes: Dict[str, Set[str]] = defaultdict(set)
+        self._deletions: Dict[str, Set[str]] = defaultdict(set)
+        self._docs: Dict[str, Tuple[Mapping, str]] = {}  # id -> (resource, category)
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._tier_level: Dict[str, int] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _add_term(self, term: str) -> None:
+        for end in range(MIN_PREFIX, len(term) + 1):
+            self._prefixes[term[:end]].add(term)
+        if len(term) >= MIN_TYPO_LENGTH:
+            for variant in _deletes(term):
+                self._deletions[variant].add(term)
+
+    def _drop_term(self, term: str) -> None:
+        del self._postings[term]
+        for end in range(MIN_PREFIX, len(term) + 1):
+            self._prefixes[term[:end]].discard(term)
+            if not self._prefixes[term[:end]]:
+                del self._prefixes[term[:end]]
+        if len(term) >= MIN_TYPO_LENGTH:
+            for variant in _deletes(term):
+                self._deletions[variant].discard(term)
+                if not self._deletions[variant]:
+                    del self._deletions[variant]
+
+    def add(self, resource: Mapping, category: str) -> None:
+        """Index a resource, replacing any earlier version with the same id"""
+        resource_id = resource["id"]
+        if resource_id in self._docs:
+            self.remove(resource_id)
+
+        fields = {
+            "title": resource.get("title", ""),
+            "provider": resource.get("provider", ""),
+            "category": category,
+            "alias": " ".join(self.aliases_by_category.get(category, [])),
+        }
+        terms: Dict[str, float] = defaultdict(float)
+        for field, text in fields.items():
+            for token in tokenize(text):
+                terms[token] += FIELD_WEIGHTS[field]
+
+        for term, weight in terms.items():
+            if term not in self._postings:
+                self._add_term(term)
+            self._postings[term][resource_id] = weight
+
+        self._docs[resource_id] = (resource, category)
+        self._doc_terms[resource_id] = dict(terms)
+        self._doc_length[resource_id] = sum(terms.values())
+        self._tier_level[resource_id] = TIER_ORDER.get(resource.get("tier_required", "free"), 0)
+        self._total_length += self._doc_length[resource_id]
+
+    def remove(self, resource_id: str) -> None:
+        if resource_id not in self._docs:
+            return
+        for term in self._doc_terms.pop(resource_id):
+            self._postings[term].pop(resource_id, None)
+            if not self._postings[term]:
+                self._drop_term(term)
+        self._total_length -= self._doc_length.pop(resource_id)
+        del self._docs[resource_id]
+        del self._tier_level[resource_id]
+
+    def _expand(self, token: str, is_last: bool) -> List[Tuple[str, float]]:
+        """Index terms a query token resolves to, with a weight for how it matched"""
+        if token in self._postings:
+            matches = [(token, 1.0)]
+        else:
+            matches = []
+        if is_last and len(token) >= MIN_PREFIX:
+            matches += [(t, PREFIX_PENALTY) for t in self._prefixes.get(token, ()) if t != token]
+        if not matches and len(token) >= MIN_TYPO_LENGTH:
+            candidates = set(self._deletions.get(token, ()))  # one letter missing from the query
+            for variant in _deletes(token):
+                if variant in self._postings:
+                    candidates.add(variant)  # one extra letter in the query
+                candidates |= self._deletions.get(variant, set())  # substitution or transposition
+            matches = [(t, TYPO_PENALTY) for t in candidates]
+        return matches
+
+    def search(self, query: str, user_tier: str = "free") -> List[Tuple[float, Mapping, str]]:
+        """(score, resource, category) for every accessible match, best first"""
+        tokens = list(dict.fromkeys(t for t in tokenize(query) if t not in STOPWORDS))
+        if not tokens or not self._docs:
+            return []
+        if len(tokens) <= ALL_TERMS_UP_TO:
+            required = len(tokens)
+        else:
+            required = max(ALL_TERMS_UP_TO, math.floor(len(tokens) * MIN_TERM_SHARE))
+
+        level = TIER_ORDER.get(user_tier, 0)
+        doc_count = len(self._docs)
+        avg_length = self._total_length / doc_count
+        scores: Dict[str, float] = defaultdict(float)
+        matched: Dict[str, int] = defaultdict(int)
+
+        for position, token in enumerate(tokens):
+            # Best-matching expansion of this token per resource
+            token_scores: Dict[str, float] = {}
+            for term, match_weight in self._expand(token, position == len(tokens) - 1):
+                postings = self._postings[term]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for resource_id, tf in postings.items():
+                    if self._tier_level[resource_id] > level:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_length[resource_id] / avg_length)
+                    score = match_weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    if score > token_scores.get(resource_id, 0.0):
+                        token_scores[resource_id] = score
+            for resource_id, score in token_scores.items():
+                scores[resource_id] += score
+                matched[resource_id] += 1
+
+        results = []
+        for resource_id, score in scores.items():
+            if matched[resource_id] < required:
+                continue
+            score *= matched[resource_id] / len(tokens)
+            resource, category = self._docs[resource_id]
+            quality = resource.get("quality_score", 0)
+            results.append((score * (1 - QUALITY_WEIGHT + QUALITY_WEIGHT * quality), resource, category))
+        results.sort(key=lambda r: r[0], reverse=True)
+        return results
+
+    @classmethod
+    def from_catalog(
+        cls,
+        resources_by_category: Dict[str, Iterable[Mapping]],
+        aliases: Dict[str, str],
+    ) -> "ResourceSearchIndex":
+        aliases_by_category: Dict[str, List[str]] = defaultdict(list)
+        for alias, category in aliases.items():
+            aliases_by_category[category].append(alias)
+        index = cls(dict(aliases_by_category))
+        for category, resources in resources_by_category.items():
+            for resource in resources:
+                index.add(resource, category)
+        return index
+
+    def sync(self, old: ResourceCatalog, new: ResourceCatalog) -> None:
+        """Apply the difference between two catalog snapshots"""
+        old_categories = {rid: c for c, rs in old.resources_by_category.items() for rid in (r["id"] for r in rs)}
+        new_categories = {}
+        for category, resources in new.resources_by_category.items():
+            for resource in resources:
+                new_categories[resource["id"]] = category
+                previous = old.by_id.get(resource["id"])
+                if previous is None or previous != resource or old_categories.get(resource["id"]) != category:
+                    self.add(resource, category)
+        for resource_id in old_categories.keys() - new_categories.keys():
+            self.remove(resource_id)
+
+
+resource_search_index = ResourceSearchIndex.from_catalog(get_catalog().resources_by_category, SKILL_CATEGORY_MAP)
+on_catalog_change(resource_search_index.sync)
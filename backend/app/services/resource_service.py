@@ -16,6 +16,8 @@ import aiohttp
 from datetime import datetime, timedelta
 import json
 
+from app.services.skill_matcher import SkillMatcher
+
 # Curated resource database - organized by skill category
 CURATED_RESOURCES = {
     # Programming Languages
@@ -534,6 +536,10 @@ TIER_RESOURCE_LIMITS = {
 }
 
 
+# Compiled once; lookups are memoized on the normalized skill name
+_skill_matcher = SkillMatcher(SKILL_CATEGORY_MAP.items())
+
+
 def get_skill_category(skill_name: str) -> Optional[str]:
     """Map a skill name to its resource category"""
     normalized = skill_name.lower().strip()
@@ -559,12 +565,8 @@ def get_resources_for_skill(
     category = get_skill_category(skill_name)
     
     if not category:
-        # Try partial matching
-        normalized = skill_name.lower().strip()
-        for key, cat in SKILL_CATEGORY_MAP.items():
-            if key in normalized or normalized in key:
-                category = cat
-                break
+        # Try partial matching on whole words
+        category = _skill_matcher.lookup(skill_name)
     
     if not category:
         print(f"⚠️ No resources found for skill: {skill_name}")
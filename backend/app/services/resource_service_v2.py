@@ -10,12 +10,15 @@ Features:
 - Tier-based access control
 """
 
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Mapping, Optional, Tuple
+from types import MappingProxyType
 import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 import re
 
+from app.services.skill_matcher import SkillMatcher
+
 # ============================================================
 # OFFICIAL DOCUMENTATION - VERSION AGNOSTIC URLS
 # These are stable, maintained by official teams
@@ -123,6 +126,8 @@ OFFICIAL_DOCS = {
 # ============================================================
 # VERIFIED CURATED RESOURCES
 # Each resource has been manually verified and has fallbacks
+# Seed data for the learning_resources table (scripts/seed_resource_catalog.py),
+# served as-is until the table is seeded
 # ============================================================
 
 VERIFIED_RESOURCES = {
@@ -813,31 +818,161 @@ TIER_RESOURCE_LIMITS = {
     "premium": 15,
 }
 
+TIER_ORDER = {"free": 0, "standard": 1, "premium": 2}
+
 # Resource health status cache (in production, use Redis)
 _resource_health_cache: Dict[str, Dict] = {}
 
+# Bumped whenever a resource flips between healthy and unhealthy; invalidates resolved views
+_health_version = 0
+
+
+def _quality_order(resources) -> Tuple[Mapping, ...]:
+    return tuple(sorted(
+        resources,
+        key=lambda x: (x.get("is_official", False), x.get("quality_score", 0)),
+        reverse=True
+    ))
+
+
+class ResourceCatalog:
+    """
+    Immutable snapshot of the resource catalog, compiled into read-only lookup structures
+    
+    - version: 0 for the built-in VERIFIED_RESOURCES, else the database catalog version
+    - resources_by_category: category -> resources in catalog order
+    - by_id: resource id -> resource
+    - views: (category, tier, difficulty) -> resources the tier can access, best first.
+      difficulty None is the unfiltered view; a difficulty with no matches maps to it.
+    """
+    
+    def __init__(self, resources_by_category: Dict[str, List[Dict]], version: int = 0):
+        self.version = version
+        self.resources_by_category: Dict[str, Tuple[Mapping, ...]] = {}
+        self.by_id: Dict[str, Mapping] = {}
+        self.views: Dict[Tuple[str, str, Optional[str]], Tuple[Mapping, ...]] = {}
+        
+        for category, resources in resources_by_category.items():
+            frozen = [MappingProxyType(dict(r)) for r in resources]
+            self.resources_by_category[category] = tuple(frozen)
+            for resource in frozen:
+                self.by_id.setdefault(resource["id"], resource)
+            difficulties = {r.get("difficulty") for r in frozen if r.get("difficulty")}
+            
+            for tier, level in TIER_ORDER.items():
+                accessible = [
+                    r for r in frozen
+                    if TIER_ORDER.get(r.get("tier_required", "free"), 0) <= level
+                ]
+                unfiltered = _quality_order(accessible)
+                self.views[(category, tier, None)] = unfiltered
+                for difficulty in difficulties:
+                    matching = [r for r in accessible if r.get("difficulty") == difficulty]
+                    self.views[(category, tier, difficulty)] = _quality_order(matching) if matching else unfiltered
+    
+    def view(self, category: str, tier: str, difficulty: Optional[str] = None) -> Tuple[Mapping, ...]:
+        tier = tier if tier in TIER_ORDER else "free"
+        view = self.views.get((category, tier, difficulty))
+        if view is None:
+            view = self.views.get((category, tier, None), ())
+        return view
+
+
+# Current snapshot; replaced as a whole by install_catalog, never mutated
+RESOURCE_CATALOG = ResourceCatalog(VERIFIED_RESOURCES)
+
+# Called with (old, new) after each swap, e.g. to update the search index
+_catalog_listeners: List[Callable[[ResourceCatalog, ResourceCatalog], None]] = []
+
+# (category, tier, difficulty, include_fallbacks) -> view with fallbacks applied, valid for _resolved_version
+_resolved_views: Dict[Tuple[str, str, Optional[str], bool], Tuple[Mapping, ...]] = {}
+_resolved_version: Tuple[int, int] = (0, 0)
+
+
+def get_catalog() -> ResourceCatalog:
+    """Current catalog snapshot; hold on to it for the duration of one request"""
+    return RESOURCE_CATALOG
+
+
+def install_catalog(resources_by_category: Dict[str, List[Dict]], version: int) -> ResourceCatalog:
+    """Compile a new snapshot and swap it in atomically"""
+    global RESOURCE_CATALOG
+    catalog = ResourceCatalog(resources_by_category, version)
+    previous, RESOURCE_CATALOG = RESOURCE_CATALOG, catalog
+    for listener in _catalog_listeners:
+        try:
+            listener(previous, catalog)
+        except Exception as e:
+            print(f"⚠ Catalog listener failed: {e}")
+    return catalog
+
+
+def on_catalog_change(listener: Callable[[ResourceCatalog, ResourceCatalog], None]) -> None:
+    _catalog_listeners.append(listener)
+
+
+def resource_state_version() -> Tuple[int, int]:
+    """(catalog version, health version); changes whenever get_resources_for_skill results may change"""
+    return (RESOURCE_CATALOG.version, _health_version)
+
+
+def _is_unhealthy(resource_id: str) -> bool:
+    return _resource_health_cache.get(resource_id, {}).get("is_healthy") == False
+
+
+def _set_resource_health(resource_id: str, health: Dict) -> None:
+    """Record a health status, invalidating resolved views if the resource changed state"""
+    global _health_version
+    was_unhealthy = _is_unhealthy(resource_id)
+    _resource_health_cache[resource_id] = health
+    if _is_unhealthy(resource_id) != was_unhealthy:
+        _health_version += 1
+
+
+def _resolve_view(category: str, tier: str, difficulty: Optional[str], include_fallbacks: bool) -> Tuple[Mapping, ...]:
+    """Catalog view with unhealthy resources swapped for their fallbacks, memoized per health and catalog version"""
+    global _resolved_version
+    catalog = RESOURCE_CATALOG
+    if _resolved_version != (_health_version, catalog.version):
+        _resolved_views.clear()
+        _resolved_version = (_health_version, catalog.version)
+    
+    key = (category, tier, difficulty, include_fallbacks)
+    resolved = _resolved_views.get(key)
+    if resolved is not None:
+        return resolved
+    
+    view = catalog.view(category, tier, difficulty)
+    resolved = view
+    if include_fallbacks and any(_is_unhealthy(r["id"]) for r in view):
+        substituted = []
+        for resource in view:
+            fallback = catalog.by_id.get(resource.get("fallback_id")) if _is_unhealthy(resource["id"]) else None
+            if fallback is not None:
+                substituted.append(MappingProxyType({**fallback, "is_fallback": True, "original_id": resource["id"]}))
+            else:
+                substituted.append(resource)
+        resolved = _quality_order(substituted)
+    
+    _resolved_views[key] = resolved
+    return resolved
+
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
+# Compiled once; lookups are memoized on the normalized skill name
+_skill_matcher = SkillMatcher(SKILL_CATEGORY_MAP.items())
+
+
 def get_skill_category(skill_name: str) -> Optional[str]:
     """Map a skill name to its resource category"""
     if not skill_name:
         return None
     
-    normalized = skill_name.lower().strip()
-    
-    # Direct match
-    if normalized in SKILL_CATEGORY_MAP:
-        return SKILL_CATEGORY_MAP[normalized]
-    
-    # Partial match
-    for key, category in SKILL_CATEGORY_MAP.items():
-        if key in normalized or normalized in key:
-            return category
-    
-    return None
+    # Exact alias, then the longest whole-word alias in the name, then an alias containing the name
+    return _skill_matcher.lookup(skill_name)
 
 
 def get_official_doc(skill_name: str) -> Optional[Dict]:
@@ -901,61 +1036,13 @@ def get_resources_for_skill(
             "is_fallback": True,
         }]
     
-    all_resources = VERIFIED_RESOURCES.get(category, [])
-    
-    # Filter by tier access
-    tier_order = {"free": 0, "standard": 1, "premium": 2}
-    user_tier_level = tier_order.get(user_tier, 0)
-    
-    accessible_resources = [
-        r.copy() for r in all_resources
-        if tier_order.get(r.get("tier_required", "free"), 0) <= user_tier_level
-    ]
-    
-    # Filter by difficulty if specified
-    if difficulty:
-        difficulty_resources = [
-            r for r in accessible_resources
-            if r.get("difficulty") == difficulty
-        ]
-        # If no resources match difficulty, keep all accessible
-        if difficulty_resources:
-            accessible_resources = difficulty_resources
-    
-    # Check health status and add fallbacks
-    healthy_resources = []
-    for resource in accessible_resources:
-        resource_id = resource.get("id")
-        health = _resource_health_cache.get(resource_id, {})
-        
-        # If marked as unhealthy, try fallback
-        if health.get("is_healthy") == False and include_fallbacks:
-            fallback_id = resource.get("fallback_id")
-            if fallback_id:
-                fallback = next(
-                    (r for r in all_resources if r.get("id") == fallback_id),
-                    None
-                )
-                if fallback:
-                    fallback_copy = fallback.copy()
-                    fallback_copy["is_fallback"] = True
-                    fallback_copy["original_id"] = resource_id
-                    healthy_resources.append(fallback_copy)
-                    continue
-        
-        healthy_resources.append(resource)
+    # Pre-sorted view for the tier and difficulty, with fallbacks for unhealthy resources
+    resources = _resolve_view(category, user_tier, difficulty, include_fallbacks)
     
     # Apply tier limit
     limit = TIER_RESOURCE_LIMITS.get(user_tier, 3)
     
-    # Sort by quality score and return limited results
-    sorted_resources = sorted(
-        healthy_resources,
-        key=lambda x: (x.get("is_official", False), x.get("quality_score", 0)),
-        reverse=True
-    )
-    
-    return sorted_resources[:limit]
+    return [dict(r) for r in resources[:limit]]
 
 
 def get_all_resources_for_roadmap(
@@ -1020,37 +1107,24 @@ async def check_all_resources_health() -> Dict[str, Dict]:
     """
     Check health of all resources in the database
     Returns a dictionary of resource_id -> health_status
-    """
-    results = {}
     
-    for category, resources in VERIFIED_RESOURCES.items():
-        for resource in resources:
-            resource_id = resource.get("id")
-            url = resource.get("url")
-            
-            if url:
-                is_healthy, status, error = await check_resource_health(url)
-                results[resource_id] = {
-                    "is_healthy": is_healthy,
-                    "http_status": status,
-                    "error_message": error,
-                    "checked_at": datetime.utcnow().isoformat(),
-                }
-                
-                # Update cache
-                _resource_health_cache[resource_id] = results[resource_id]
+    Runs a forced pass of the pooled link health checker, which also persists the results.
+    """
+    from app.services.link_health import run_health_pass
     
-    return results
+    return await run_health_pass(force=True)
 
 
-def mark_resource_unhealthy(resource_id: str, reason: str):
-    """Mark a resource as unhealthy (called when user reports broken link)"""
-    _resource_health_cache[resource_id] = {
+def mark_resource_unhealthy(resource_id: str, reason: str) -> Dict:
+    """Mark a resource as unhealthy in this process (called when user reports broken link)"""
+    health = {
         "is_healthy": False,
         "error_message": reason,
         "checked_at": datetime.utcnow().isoformat(),
         "user_reported": True,
     }
+    _set_resource_health(resource_id, health)
+    return health
 
 
 def get_resource_health(resource_id: str) -> Optional[Dict]:
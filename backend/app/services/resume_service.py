@@ -2,10 +2,11 @@
 from typing import List, Optional
 import PyPDF2
 import io
-from openai import AsyncOpenAI
 from app.core.config import settings
-
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+from app.services.llm_gateway import llm_gateway
+from app.services.llm_output import parse_json_content, validate_output
+from app.schemas.ai_outputs import AIResumeAnalysis
+from app.services.token_budget import token_budgeter
 
 
 async def parse_resume_pdf(file_content: bytes) -> str:
@@ -30,7 +31,7 @@ async def analyze_resume(resume_text: str, target_role: Optional[str] = None) ->
     prompt = f"""Analyze this resume and extract:
 
 Resume:
-{resume_text}
+{token_budgeter.fit_text("resume_analysis", resume_text, settings.PROMPT_BUDGET_RESUME_TOKENS)}
 
 {f"Target Role: {target_role}" if target_role else ""}
 
@@ -53,19 +54,18 @@ Provide a detailed analysis in JSON format:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="analyze_resume",
             messages=[
                 {"role": "system", "content": "You are an expert resume analyzer. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
-        import json
-        return json.loads(response.choices[0].message.content)
+        return await validate_output(
+            AIResumeAnalysis, parse_json_content(response.choices[0].message.content), "analyze_resume"
+        )
         
     except Exception as e:
         print(f"Resume analysis error: {e}")
@@ -86,7 +86,7 @@ async def calculate_skill_gap(
 {skills_text}
 
 **Job Description:**
-{job_description}
+{token_budgeter.fit_text("skill_gap", job_description, settings.PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS)}
 
 Provide analysis in JSON:
 {{
@@ -103,14 +103,12 @@ Provide analysis in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="calculate_skill_gap",
             messages=[
                 {"role": "system", "content": "You are a career advisor analyzing skill gaps. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=2500,
             response_format={"type": "json_object"}
         )
         
@@ -128,10 +126,10 @@ async def optimize_resume_for_ats(resume_text: str, job_description: str) -> dic
     prompt = f"""Optimize this resume for ATS systems for this job:
 
 **Resume:**
-{resume_text}
+{token_budgeter.fit_text("ats_optimization", resume_text, settings.PROMPT_BUDGET_RESUME_TOKENS)}
 
 **Job Description:**
-{job_description}
+{token_budgeter.fit_text("ats_optimization", job_description, settings.PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS)}
 
 Provide optimization suggestions in JSON:
 {{
@@ -149,14 +147,12 @@ Provide optimization suggestions in JSON:
 }}"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="optimize_resume_for_ats",
             messages=[
                 {"role": "system", "content": "You are an ATS optimization expert. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=3000,
             response_format={"type": "json_object"}
         )
         
@@ -180,10 +176,10 @@ async def generate_cover_letter(
 
 **Job:** {job_title} at {company_name}
 **Job Description:**
-{job_description}
+{token_budgeter.fit_text("cover_letter", job_description, settings.PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS)}
 
 **Candidate's Resume:**
-{resume_text}
+{token_budgeter.fit_text("cover_letter", resume_text, settings.PROMPT_BUDGET_RESUME_TOKENS)}
 
 Write a professional, engaging cover letter that:
 1. Shows enthusiasm for the role
@@ -195,14 +191,12 @@ Write a professional, engaging cover letter that:
 Keep it to 3-4 paragraphs, professional but personable."""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_cover_letter",
             messages=[
                 {"role": "system", "content": "You are an expert cover letter writer."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=1500,
         )
         
         return response.choices[0].message.content
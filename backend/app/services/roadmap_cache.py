@@ -0,0 +1,244 @@
+"""
+Roadmap Response Cache
+Content-addressed cache in front of AI roadmap generation.
+
+Identical job descriptions at the same skill level produce the same roadmap,
+so the generated document is stored under a hash of the normalized request,
+the model and the system prompt version. Two backends are available:
+- memory: per-process TTL + LRU store
+- redis: shared store on settings.REDIS_URL (redis_memory.InMemoryRedis stands in for tests)
+"""
+
+import copy
+import hashlib
+import json
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.services.llm_telemetry import llm_telemetry
+from app.services.redis_memory import InMemoryRedis
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Collapse whitespace and case so cosmetic differences share a cache key"""
+    if not value:
+        return ""
+    return re.sub(r"\s+", " ", value).strip().lower()
+
+
+def make_roadmap_cache_key(
+    job_description: str,
+    skill_level: str,
+    industry: Optional[str],
+    model: str,
+    prompt_version: str,
+) -> str:
+    """Build the content-addressed key for a roadmap request"""
+    payload = json.dumps(
+        [
+            normalize_text(job_description),
+            normalize_text(skill_level),
+            normalize_text(industry),
+            model,
+            prompt_version,
+        ],
+        separators=(",", ":"),
+    )
+    return "roadmap:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def reassign_roadmap_ids(roadmap: dict) -> dict:
+    """Return a deep copy of a roadmap with fresh UUIDs for every phase, skill, resource and project"""
+    fresh = copy.deepcopy(roadmap)
+    for phase in fresh.get("phases", []):
+        phase["id"] = str(uuid.uuid4())
+        for skill in phase.get("skills", []):
+            skill["id"] = str(uuid.uuid4())
+            for resource in skill.get("resources", []):
+                resource["id"] = str(uuid.uuid4())
+    for project in fresh.get("projects", []):
+        project["id"] = str(uuid.uuid4())
+    return fresh
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+class MemoryCacheBackend:
+    """Per-process cache with TTL expiry and LRU eviction"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Shared cache on Redis.
+
+    TTL is delegated to Redis key expiry. LRU is tracked in a sorted set of
+    last-access timestamps and trimmed to max_entries on every write.
+    """
+
+    def __init__(self, redis_client, max_entries: int = 1000, namespace: str = "pathwise"):
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.lru_key = f"{namespace}:roadmap_cache:lru"
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis.get(self._key(key))
+        if value is None:
+            await self.redis.zrem(self.lru_key, key)
+            return None
+        await self.redis.zadd(self.lru_key, {key: time.time()})
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.redis.set(self._key(key), value, ex=ttl)
+        await self.redis.zadd(self.lru_key, {key: time.time()})
+        overflow = await self.redis.zcard(self.lru_key) - self.max_entries
+        if overflow > 0:
+            evicted = await self.redis.zrange(self.lru_key, 0, overflow - 1)
+            evicted = [k.decode("utf-8") if isinstance(k, bytes) else k for k in evicted]
+            if evicted:
+                await self.redis.delete(*[self._key(k) for k in evicted])
+                await self.redis.zrem(self.lru_key, *evicted)
+
+    async def delete(self, key: str) -> None:
+        await self.redis.delete(self._key(key))
+        await self.redis.zrem(self.lru_key, key)
+
+    async def size(self) -> int:
+        return await self.redis.zcard(self.lru_key)
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class RoadmapCache:
+    """Roadmap cache with hit/miss accounting"""
+
+    def __init__(self, backend, ttl_seconds: int = 86400):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.tokens_saved = 0
+        self.latency_saved_seconds = 0.0
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return a cached roadmap or None. Backend failures count as misses."""
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            print(f"⚠ Roadmap cache read failed: {e}")
+            self.errors += 1
+            raw = None
+
+        if raw is None:
+            self.misses += 1
+            llm_telemetry.record_cache("roadmap", hit=False)
+            return None
+
+        entry = json.loads(raw)
+        self.hits += 1
+        llm_telemetry.record_cache("roadmap", hit=True)
+        self.tokens_saved += entry.get("total_tokens", 0)
+        self.latency_saved_seconds += entry.get("latency_seconds", 0.0)
+        return entry["roadmap"]
+
+    async def set(
+        self,
+        key: str,
+        roadmap: dict,
+        total_tokens: int = 0,
+        latency_seconds: float = 0.0,
+    ) -> None:
+        entry = {
+            "roadmap": roadmap,
+            "total_tokens": total_tokens,
+            "latency_seconds": latency_seconds,
+            "cached_at": time.time(),
+        }
+        try:
+            await self.backend.set(key, json.dumps(entry), self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠ Roadmap cache write failed: {e}")
+            self.errors += 1
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        try:
+            size = await self.backend.size()
+        except Exception:
+            size = None
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": size,
+            "tokens_saved": self.tokens_saved,
+            "latency_saved_seconds": round(self.latency_saved_seconds, 2),
+        }
+
+
+def create_roadmap_cache() -> RoadmapCache:
+    """Build the roadmap cache configured in settings"""
+    backend_name = settings.ROADMAP_CACHE_BACKEND.lower()
+    max_entries = settings.ROADMAP_CACHE_MAX_ENTRIES
+
+    if backend_name == "redis":
+        try:
+            import redis.asyncio as redis_asyncio
+            backend = RedisCacheBackend(
+                redis_asyncio.from_url(settings.REDIS_URL),
+                max_entries=max_entries,
+            )
+        except Exception as e:
+            print(f"⚠ Redis roadmap cache unavailable ({e}), using in-process cache")
+            backend = MemoryCacheBackend(max_entries=max_entries)
+    elif backend_name == "redis-memory":
+        backend = RedisCacheBackend(InMemoryRedis(), max_entries=max_entries)
+    else:
+        backend = MemoryCacheBackend(max_entries=max_entries)
+
+    return RoadmapCache(backend, ttl_seconds=settings.ROADMAP_CACHE_TTL_SECONDS)
+
+
+roadmap_cache = create_roadmap_cache()
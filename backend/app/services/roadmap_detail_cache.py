@@ -0,0 +1,140 @@
+"""
+Roadmap Detail Cache
+Rendered GET /roadmaps/{id} responses with strong ETags.
+
+Building a roadmap detail merges progress into every skill, looks up curated
+resources per skill and serializes the whole document. The result only
+depends on:
+- the roadmap row and its progress rows (fingerprinted by progress_version)
+- the user's tier
+- the resource catalog and health state (resource_state_version)
+so the rendered body is kept per (roadmap_id, tier, progress fingerprint,
+completion, status) in a per-process LRU and dropped whenever the resource
+state version moves. The fingerprint is read from the database on every
+request, so progress written through another worker is never served stale;
+invalidate() additionally drops a roadmap's entries as soon as this process
+changes it.
+
+The ETag is a hash of the body, so every worker produces the same validator
+for the same content and clients get 304 Not Modified on If-None-Match.
+"""
+
+import hashlib
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.services.resource_service_v2 import resource_state_version
+
+
+def progress_version(rows: Iterable) -> str:
+    """Fingerprint of a roadmap's progress rows (id, skill_id, status, time_spent_minutes, completed_at)"""
+    digest = hashlib.sha1()
+    for row in sorted(rows, key=lambda r: (r.skill_id, str(r.id))):
+        completed_at = row.completed_at.isoformat() if row.completed_at else ""
+        digest.update(f"{row.id}|{row.skill_id}|{row.status}|{row.time_spent_minutes}|{completed_at}\n".encode())
+    return digest.hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as required for If-None-Match"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class RenderedDetail(NamedTuple):
+    body: bytes
+    etag: str
+
+    def response(self, if_none_match: Optional[str] = None) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+DetailKey = Tuple[str, str, str, int, str]
+
+
+class RoadmapDetailCache:
+    """Per-process LRU of rendered roadmap details with hit/miss accounting"""
+
+    def __init__(self, max_entries: int = 500, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[DetailKey, RenderedDetail]" = OrderedDict()
+        self._keys_by_roadmap: Dict[str, Set[DetailKey]] = {}
+        self._resource_version: Tuple[int, int] = resource_state_version()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_resource_version(self) -> None:
+        version = resource_state_version()
+        if version != self._resource_version:
+            self._entries.clear()
+            self._keys_by_roadmap.clear()
+            self._resource_version = version
+
+    def get(self, key: DetailKey) -> Optional[RenderedDetail]:
+        self._check_resource_version()
+        rendered = self._entries.get(key)
+        if rendered is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return rendered
+
+    def put(self, key: DetailKey, payload: dict) -> RenderedDetail:
+        """Serialize a detail payload once and keep it for later requests"""
+        body = JSONResponse(content=jsonable_encoder(payload)).body
+        rendered = RenderedDetail(body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+        if not self.enabled:
+            return rendered
+
+        self._check_resource_version()
+        self._entries[key] = rendered
+        self._entries.move_to_end(key)
+        self._keys_by_roadmap.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._discard_key(evicted)
+        return rendered
+
+    def _discard_key(self, key: DetailKey) -> None:
+        keys = self._keys_by_roadmap.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_roadmap[key[0]]
+
+    def invalidate(self, roadmap_id: str) -> None:
+        """Drop every cached rendering of a roadmap (progress, time log, upgrade, delete)"""
+        try:
+            roadmap_id = str(uuid.UUID(str(roadmap_id)))
+        except ValueError:
+            return
+        for key in self._keys_by_roadmap.pop(roadmap_id, ()):
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+roadmap_detail_cache = RoadmapDetailCache(
+    max_entries=settings.ROADMAP_DETAIL_CACHE_MAX_ENTRIES,
+    enabled=settings.ROADMAP_DETAIL_CACHE_ENABLED,
+)
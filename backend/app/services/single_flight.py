@@ -0,0 +1,101 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same normalized input share one upstream LLM call.
+
+The first caller for a key starts the work as a task; callers arriving while it
+is in flight await the same task. The task is shielded, so a disconnecting
+caller does not cancel the work for everyone else. Every caller, the one that
+started the work included, gets its own copy of the result (via `share`), so
+nobody mutates another caller's data.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import json
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.roadmap_cache import normalize_text
+
+
+def make_key(*parts: Any) -> str:
+    """Hash normalized call arguments into a coalescing key"""
+    normalized = [normalize_text(p) if isinstance(p, str) or p is None else p for p in parts]
+    payload = json.dumps(normalized, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Collapse identical in-flight calls into one"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "executed": 0, "collapsed": 0})
+
+    async def do(
+        self,
+        namespace: str,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        share: Callable[[Any], Any] = copy.deepcopy,
+    ) -> Any:
+        stats = self._stats[namespace]
+        stats["calls"] += 1
+        flight_key = f"{namespace}:{key}"
+
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            stats["executed"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        else:
+            stats["collapsed"] += 1
+
+        result = await asyncio.shield(task)
+        return share(result)
+
+    def stats(self) -> dict:
+        total_calls = sum(s["calls"] for s in self._stats.values())
+        total_collapsed = sum(s["collapsed"] for s in self._stats.values())
+        return {
+            "in_flight": len(self._in_flight),
+            "total_calls": total_calls,
+            "total_collapsed": total_collapsed,
+            "collapse_rate": round(total_collapsed / total_calls, 4) if total_calls else 0.0,
+            "by_function": {name: dict(s) for name, s in self._stats.items()},
+        }
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(
+    namespace: str,
+    key_fn: Optional[Callable[..., str]] = None,
+    share: Callable[[Any], Any] = copy.deepcopy,
+):
+    """
+    Decorator that coalesces concurrent calls of an async function.
+
+    `key_fn` receives the same arguments as the function and returns the
+    coalescing key; by default the bound arguments (with defaults applied)
+    are normalized and hashed, so positional and keyword calls share a key.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key_fn:
+                key = key_fn(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = make_key(*bound.arguments.values())
+            return await single_flight.do(namespace, key, lambda: func(*args, **kwargs), share=share)
+        return wrapper
+    return decorator
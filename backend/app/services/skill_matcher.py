@@ -0,0 +1,153 @@
+"""
+Skill Matcher
+Compiled matcher for skill aliases ("react.js", "k8s", "version control").
+
+Built once per alias table: an Aho-Corasick automaton finds every alias in a
+piece of text in a single pass, keeping only whole-word matches and resolving
+overlaps by leftmost-longest precedence ("amazon web services" beats "aws",
+"react hooks" beats "react"). Lookups of single skill names are memoized.
+
+Word boundaries treat ".", "+" and "#" as part of a skill name, so "node.js"
+does not match "js" and "c++" does not match "c", while "python." at the end
+of a sentence still matches "python". An alias may be followed by "+" when it
+ends in a version number ("es6+", "java 8+") and by a plural "s" when it is at
+least three letters long ("apis", "webhooks"), so "ES6+ Features" and
+"APIs" still resolve while "c" never matches "c++" or "cs".
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Generic, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_NAME_CHARS = frozenset("+#")
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatch(NamedTuple):
+    start: int
+    end: int
+    alias: str
+    value: object
+
+
+class SkillMatcher(Generic[V]):
+    """Aho-Corasick automaton over lowercase aliases with whole-word, leftmost-longest matching"""
+
+    def __init__(self, aliases: Iterable[Tuple[str, V]], memo_size: int = 4096):
+        self._values: Dict[str, V] = {}
+        for alias, value in aliases:
+            alias = normalize_skill(alias)
+            if alias and alias not in self._values:
+                self._values[alias] = value
+        self._alias_list: List[str] = list(self._values)
+
+        # Trie: per-state transitions, failure links and alias ids ending at the state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for alias_id, alias in enumerate(self._alias_list):
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (alias_id,)
+
+        # Failure links in BFS order; outputs include those of the failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        # Whole-word fragments of aliases ("web" -> "web fundamentals") for short or partial names
+        self._fragments: Dict[str, V] = {}
+        for alias in self._alias_list:
+            words = alias.split()
+            for size in range(len(words) - 1, 0, -1):
+                for i in range(len(words) - size + 1):
+                    self._fragments.setdefault(" ".join(words[i:i + size]), self._values[alias])
+
+        self.lookup = lru_cache(maxsize=memo_size)(self._lookup)
+
+    def __len__(self) -> int:
+        return len(self._alias_list)
+
+    def _bounded(self, text: str, start: int, end: int) -> bool:
+        if start > 0:
+            before = text[start - 1]
+            if _is_word_char(before) or before in _NAME_CHARS or before == ".":
+                return False
+        if end < len(text):
+            after = text[end]
+            last = text[end - 1]
+            if after == "+" and last.isdigit():
+                end += 1  # Version floor: "es6+"
+            elif after == "s" and end - start >= 3 and last.isalpha() and last != "s":
+                end += 1  # Plural: "apis"
+        if end < len(text):
+            after = text[end]
+            if _is_word_char(after) or after in _NAME_CHARS:
+                return False
+        return True
+
+    def _candidates(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, alias_id) for every whole-word alias occurrence"""
+        found = []
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for alias_id in out[state]:
+                start = i + 1 - len(self._alias_list[alias_id])
+                if self._bounded(text, start, i + 1):
+                    found.append((start, i + 1, alias_id))
+        return found
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """Non-overlapping whole-word matches in `text`, leftmost-longest first"""
+        text = (text or "").lower()
+        matches = []
+        last_end = 0
+        for start, end, alias_id in sorted(self._candidates(text), key=lambda m: (m[0], -m[1])):
+            if start < last_end:
+                continue
+            alias = self._alias_list[alias_id]
+            matches.append(SkillMatch(start, end, alias, self._values[alias]))
+            last_end = end
+        return matches
+
+    def _lookup(self, name: str) -> Optional[V]:
+        normalized = normalize_skill(name)
+        if not normalized:
+            return None
+        if normalized in self._values:
+            return self._values[normalized]
+        # Longest alias inside the name ("advanced react hooks" -> "react hooks")
+        candidates = self._candidates(normalized)
+        if candidates:
+            start, end, alias_id = max(candidates, key=lambda m: (m[1] - m[0], -m[0]))
+            return self._values[self._alias_list[alias_id]]
+        # Name is part of an alias ("distributed" -> "distributed systems")
+        return self._fragments.get(normalized)
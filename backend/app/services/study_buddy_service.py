@@ -1,11 +1,11 @@
 """Personal AI Mentor service (renamed from Study Buddy) for learning assistance and interview preparation."""
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 import uuid
-from openai import AsyncOpenAI
 
 from app.core.config import settings
-
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+from app.services.llm_gateway import llm_gateway
+from app.services.single_flight import coalesce
+from app.services.token_budget import token_budgeter
 
 # Personal AI Mentor System Prompt (world-class)
 STUDY_BUDDY_SYSTEM_PROMPT = """You are PathWise Personal AI Mentor, the world's most effective career guidance AI. Your role is to:
@@ -47,14 +47,12 @@ Interview topics:
 BE STRICT. This is training for real interviews where rejection is the default outcome."""
 
 
-async def chat_with_study_buddy(
+def _build_study_buddy_messages(
     message: str,
     conversation_history: List[dict],
     user_context: Optional[dict] = None,
     additional_context: Optional[str] = None
-) -> str:
-    """Have a conversation with the Personal AI Mentor."""
-    
+) -> List[dict]:
     system_msg = STUDY_BUDDY_SYSTEM_PROMPT
     
     # Add additional context if provided (from frontend)
@@ -70,21 +68,49 @@ User Context:
 - Skill Level: {user_context.get('skill_level', 'beginner')}
 - Recent Topics: {', '.join(user_context.get('recent_topics', []))}"""
     
+    # Recent history within the budget; older turns are summarized
+    return token_budgeter.fit_chat(
+        "study_buddy", system_msg, conversation_history, message,
+        max_tokens=settings.PROMPT_BUDGET_STUDY_BUDDY_TOKENS,
+        max_turns=20,
+    )
+
+
+def _build_interview_messages(
+    message: str,
+    conversation_history: List[dict],
+    user_context: Optional[str] = None
+) -> List[dict]:
+    system_msg = INTERVIEW_MODE_SYSTEM_PROMPT
+    
+    # Add user context if provided
+    if user_context:
+        system_msg += f"\n\n{user_context}"
+    
+    # Recent history within the budget; older turns are summarized
+    return token_budgeter.fit_chat(
+        "study_buddy_interview", system_msg, conversation_history, message,
+        max_tokens=settings.PROMPT_BUDGET_STUDY_BUDDY_TOKENS,
+        max_turns=10,
+    )
+
+
+async def chat_with_study_buddy(
+    message: str,
+    conversation_history: List[dict],
+    user_context: Optional[dict] = None,
+    additional_context: Optional[str] = None
+) -> str:
+    """Have a conversation with the Personal AI Mentor."""
+    
     try:
-        messages = [{"role": "system", "content": system_msg}]
-        
-        # Add conversation history
-        for msg in conversation_history[-20:]:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        
-        # Add current message
-        messages.append({"role": "user", "content": message})
+        messages = _build_study_buddy_messages(
+            message, conversation_history, user_context, additional_context
+        )
         
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="chat_with_study_buddy",
             messages=messages,
-            temperature=0.7,
-            max_tokens=1500,
         )
         
         return response.choices[0].message.content
@@ -94,6 +120,29 @@ User Context:
         raise
 
 
+async def stream_chat_with_study_buddy(
+    message: str,
+    conversation_history: List[dict],
+    user_context: Optional[dict] = None,
+    additional_context: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Stream a Personal AI Mentor reply token by token."""
+    
+    messages = _build_study_buddy_messages(
+        message, conversation_history, user_context, additional_context
+    )
+    
+    try:
+        async for token in llm_gateway.stream(
+            feature="stream_chat_with_study_buddy",
+            messages=messages,
+        ):
+            yield token
+    except Exception as e:
+        print(f"Personal AI Mentor stream error: {e}")
+        raise
+
+
 async def chat_interview_mode(
     message: str,
     conversation_history: List[dict],
@@ -101,27 +150,12 @@ async def chat_interview_mode(
 ) -> str:
     """Interview Pressure Mode - strict interviewer simulation."""
     
-    system_msg = INTERVIEW_MODE_SYSTEM_PROMPT
-    
-    # Add user context if provided
-    if user_context:
-        system_msg += f"\n\n{user_context}"
-    
     try:
-        messages = [{"role": "system", "content": system_msg}]
-        
-        # Add conversation history
-        for msg in conversation_history[-10:]:
-            messages.append({"role": msg["role"], "content": msg["content"]})
-        
-        # Add current message
-        messages.append({"role": "user", "content": message})
+        messages = _build_interview_messages(message, conversation_history, user_context)
         
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="chat_interview_mode",
             messages=messages,
-            temperature=0.9,
-            max_tokens=1000,
         )
         
         return response.choices[0].message.content
@@ -131,6 +165,27 @@ async def chat_interview_mode(
         raise
 
 
+async def stream_chat_interview_mode(
+    message: str,
+    conversation_history: List[dict],
+    user_context: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Stream an Interview Pressure Mode reply token by token."""
+    
+    messages = _build_interview_messages(message, conversation_history, user_context)
+    
+    try:
+        async for token in llm_gateway.stream(
+            feature="stream_chat_interview_mode",
+            messages=messages,
+        ):
+            yield token
+    except Exception as e:
+        print(f"Interview mode stream error: {e}")
+        raise
+
+
+@coalesce("explain_concept")
 async def explain_concept(concept: str, skill_level: str = "beginner") -> str:
     """Get a detailed explanation of a concept."""
     
@@ -146,14 +201,12 @@ Include:
 Keep it clear and engaging."""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="explain_concept",
             messages=[
                 {"role": "system", "content": STUDY_BUDDY_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=1500,
         )
         
         return response.choices[0].message.content
@@ -169,7 +222,7 @@ async def debug_code(code: str, error_message: str, language: str) -> dict:
     prompt = f"""Help debug this {language} code:
 
 ```{language}
-{code}
+{token_budgeter.fit_text("debug_code", code, settings.PROMPT_BUDGET_CODE_TOKENS)}
 ```
 
 Error message:
@@ -182,14 +235,12 @@ Provide:
 4. Best practices to avoid this in the future"""
     
     try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="debug_code",
             messages=[
                 {"role": "system", "content": STUDY_BUDDY_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000,
         )
         
         return {
@@ -202,6 +253,7 @@ Provide:
         raise
 
 
+@coalesce("generate_quiz")
 async def generate_quiz(topic: str, difficulty: str, num_questions: int = 5) -> dict:
     """Generate a quiz to test understanding."""
     
@@ -223,14 +275,12 @@ Output ONLY valid JSON, nothing else."""
     
     try:
         import json
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="generate_quiz",
             messages=[
                 {"role": "system", "content": "You are a quiz generator. Output valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000,
             response_format={"type": "json_object"}
         )
         
@@ -256,7 +306,7 @@ async def review_project(
 {project_description}
 
 **Code/Demo:**
-{code_or_demo}
+{token_budgeter.fit_text("project_review", code_or_demo, settings.PROMPT_BUDGET_CODE_TOKENS)}
 
 **Review Criteria:**
 {criteria_text}
@@ -272,14 +322,12 @@ Format as JSON only."""
     
     try:
         import json
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="review_project",
             messages=[
                 {"role": "system", "content": STUDY_BUDDY_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000,
             response_format={"type": "json_object"}
         )
         
@@ -314,14 +362,12 @@ Format as JSON only."""
     
     try:
         import json
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        response = await llm_gateway.complete(
+            feature="suggest_learning_path",
             messages=[
                 {"role": "system", "content": STUDY_BUDDY_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2500,
             response_format={"type": "json_object"}
         )
         
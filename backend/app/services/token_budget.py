@@ -0,0 +1,207 @@
+"""
+Prompt Token Budgeter
+Keeps LLM payloads inside a per-call token budget.
+
+- Counts tokens with tiktoken when it is installed and its encoding can be
+  loaded, otherwise estimates ~4 characters per token (close enough for
+  budgeting English prompts)
+- Serializes structured data compactly (no indentation, empty fields dropped)
+- Truncates long free text keeping its head and tail
+- Fits chat history newest-first; dropped turns are folded into a short
+  extractive summary instead of being silently lost
+- Records tokens before/after per feature so savings are visible in /system/ai-stats
+"""
+
+import json
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency
+    tiktoken = None
+
+# Per-message framing overhead in the chat format
+_MESSAGE_OVERHEAD_TOKENS = 4
+_CHARS_PER_TOKEN = 4
+
+_encodings: Dict[str, Any] = {}
+
+
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    model = model or settings.OPENAI_MODEL
+    if model not in _encodings:
+        try:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # Encodings are downloaded on first use; offline, fall back to the estimate for good
+            print(f"⚠ tiktoken encoding for {model} unavailable, estimating tokens: {e}")
+            _encodings[model] = None
+    return _encodings[model]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens in a piece of text"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def count_message_tokens(messages: List[dict], model: Optional[str] = None) -> int:
+    """Number of prompt tokens for a list of chat messages"""
+    return sum(
+        count_tokens(m.get("content") or "", model) + _MESSAGE_OVERHEAD_TOKENS
+        for m in messages
+    )
+
+
+def _prune(value: Any) -> Any:
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_prune(v) for v in value]
+    return value
+
+
+def compact_json(data: Any) -> str:
+    """Minimal JSON: no whitespace, no null or empty fields"""
+    return json.dumps(_prune(data), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def truncate_text(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    Trim text to roughly `max_tokens`, keeping the beginning and the end.
+
+    The head carries most of the signal in resumes and job descriptions
+    (summary, recent roles, requirements); the tail keeps closing details.
+    """
+    if not text or max_tokens <= 0:
+        return ""
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text
+
+    # Collapse runs of blank lines/spaces first; PDF extraction produces lots of them
+    text = re.sub(r"[ \t]+", " ", re.sub(r"\n\s*\n+", "\n\n", text)).strip()
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text
+
+    ratio = max_tokens / total
+    keep_chars = max(int(len(text) * ratio) - 40, 0)  # Room for the marker
+    head_chars = int(keep_chars * 0.75)
+    tail_chars = max(keep_chars - head_chars, 0)
+    head = text[:head_chars].rsplit("\n", 1)[0] if "\n" in text[:head_chars] else text[:head_chars]
+    tail = text[len(text) - tail_chars:] if tail_chars else ""
+    return f"{head}\n[... {total - max_tokens} tokens omitted ...]\n{tail}".strip()
+
+
+def _first_sentence(text: str, max_chars: int = 160) -> str:
+    sentence = re.split(r"(?<=[.!?])\s+", (text or "").strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rstrip() + "…"
+
+
+def summarize_history(messages: List[dict]) -> str:
+    """Extractive one-line-per-question summary of older conversation turns"""
+    topics = [_first_sentence(m["content"]) for m in messages if m.get("role") == "user" and m.get("content")]
+    if not topics:
+        return ""
+    return "Earlier in this conversation the user asked about:\n" + "\n".join(f"- {t}" for t in topics)
+
+
+class TokenBudgeter:
+    """Fits prompts to budgets and tracks how many tokens that saved"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "tokens_before": 0, "tokens_after": 0, "tokens_saved": 0}
+        )
+
+    def record(self, feature: str, before: int, after: int) -> None:
+        stats = self._stats[feature]
+        stats["calls"] += 1
+        stats["tokens_before"] += before
+        stats["tokens_after"] += after
+        stats["tokens_saved"] += max(before - after, 0)
+
+    def fit_text(self, feature: str, text: str, max_tokens: int) -> str:
+        """Truncate one free-text field to its budget"""
+        before = count_tokens(text)
+        fitted = truncate_text(text, max_tokens)
+        self.record(feature, before, count_tokens(fitted))
+        return fitted
+
+    def fit_chat(
+        self,
+        feature: str,
+        system_msg: str,
+        history: List[dict],
+        message: str,
+        max_tokens: int,
+        max_turns: int = 20,
+    ) -> List[dict]:
+        """
+        Build chat messages within `max_tokens`.
+
+        The system prompt and the current message always go in (the message is
+        truncated if it alone would blow the budget). History is added newest
+        first until the budget runs out; everything older is summarized.
+        """
+        history = [
+            {"role": m["role"], "content": m.get("content") or ""}
+            for m in history
+            if m.get("role") in ("user", "assistant")
+        ]
+        before = count_message_tokens(
+            [{"content": system_msg}, *history[-max_turns:], {"content": message}]
+        )
+
+        reserved = count_tokens(system_msg) + 2 * _MESSAGE_OVERHEAD_TOKENS
+        message = truncate_text(message, max(max_tokens - reserved, max_tokens // 2))
+        remaining = max_tokens - reserved - count_tokens(message)
+
+        kept: List[dict] = []
+        candidates = history[-max_turns:]
+        for msg in reversed(candidates):
+            cost = count_tokens(msg["content"]) + _MESSAGE_OVERHEAD_TOKENS
+            if cost > remaining:
+                break
+            kept.insert(0, msg)
+            remaining -= cost
+
+        dropped = history[:len(history) - len(kept)]
+        if dropped:
+            summary = summarize_history(dropped)
+            if summary and count_tokens(summary) <= remaining:
+                system_msg = f"{system_msg}\n\n{summary}"
+            elif summary and remaining > 50:
+                system_msg = f"{system_msg}\n\n{truncate_text(summary, remaining)}"
+
+        messages = [{"role": "system", "content": system_msg}, *kept, {"role": "user", "content": message}]
+        self.record(feature, before, count_message_tokens(messages))
+        return messages
+
+    def stats(self) -> dict:
+        total_saved = sum(s["tokens_saved"] for s in self._stats.values())
+        total_before = sum(s["tokens_before"] for s in self._stats.values())
+        return {
+            "tokenizer": "tiktoken" if tiktoken is not None else "estimate",
+            "total_tokens_saved": total_saved,
+            "savings_rate": round(total_saved / total_before, 4) if total_before else 0.0,
+            "by_feature": {name: dict(s) for name, s in self._stats.items()},
+        }
+
+
+token_budgeter = TokenBudgeter()
@@ -0,0 +1,107 @@
+"""
+Benchmark every AI code path against the offline LLM stand-in.
+
+    cd backend
+    python -m benchmarks.ai_paths --requests 50 --concurrency 10
+
+Runs in replay mode (no network, no API key). Uses recorded cassettes from
+LLM_REPLAY_CASSETTE_DIR when present, synthetic responses otherwise. Record
+cassettes first with LLM_CLIENT_MODE=record against the real API to replay
+realistic payloads and latencies.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("LLM_CLIENT_MODE", "replay")
+
+from app.services import ai_service, resume_service, study_buddy_service  # noqa: E402
+from app.services.llm_telemetry import llm_telemetry  # noqa: E402
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+We are looking for a backend engineer with Python, FastAPI, PostgreSQL, Docker and AWS.
+Experience with REST API design, unit testing with pytest and system design is required.
+"""
+
+RESUME = """Jane Doe - Software Engineer
+3 years building Python services with Django and PostgreSQL. Led migration to Docker.
+"""
+
+
+async def _drain(iterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+def _scenarios(i: int) -> dict:
+    # Vary the input so single-flight coalescing and caches do not hide the calls
+    jd = f"{JOB_DESCRIPTION}\nRequisition {i}"
+    return {
+        "roadmap": lambda: ai_service.generate_roadmap(jd, "intermediate"),
+        "roadmap_stream": lambda: _drain(ai_service.stream_roadmap(jd, "beginner")),
+        "chat": lambda: ai_service.chat_response(f"How should I learn SQL? ({i})", []),
+        "chat_stream": lambda: _drain(ai_service.stream_chat_response(f"Explain Docker ({i})", [])),
+        "resume_analysis": lambda: resume_service.analyze_resume(f"{RESUME}\n{i}", "Backend Engineer"),
+        "interview_questions": lambda: ai_service.generate_interview_questions("coding", f"Backend Engineer {i}", "medium"),
+        "interview_evaluation": lambda: ai_service.evaluate_interview_response(
+            [{"id": "q1", "type": "coding", "question": "Reverse a linked list"}],
+            [{"question_id": "q1", "response": f"Iterate with three pointers ({i})"}],
+            "Backend Engineer",
+            "coding",
+        ),
+        "study_buddy": lambda: study_buddy_service.chat_with_study_buddy(f"Quiz me on REST ({i})", []),
+    }
+
+
+async def _run(name: str, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await _scenarios(i)[name]()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "name": name,
+        "ok": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    args = parser.parse_args()
+
+    names = args.only or list(_scenarios(0))
+    print(f"{'scenario':<22}{'ok':>5}{'err':>5}{'req/s':>9}{'p50 s':>9}{'p95 s':>9}")
+    for name in names:
+        r = await _run(name, args.requests, args.concurrency)
+        print(f"{r['name']:<22}{r['ok']:>5}{r['errors']:>5}{r['throughput']:>9.2f}{r['p50']:>9.3f}{r['p95']:>9.3f}")
+
+    summary = llm_telemetry.summary()
+    print(f"\nLLM calls: {summary['total_calls']}, estimated cost if live: ${summary['total_cost_usd']:.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
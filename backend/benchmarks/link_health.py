@@ -0,0 +1,140 @@
+"""
+Exercise the link health checker against a local HTTP stand-in.
+
+    cd backend
+    python -m benchmarks.link_health --urls 200 --latency-ms 50
+
+Starts an aiohttp server on several loopback addresses (one "host" each) that
+serves healthy pages with ETags, pages that reject HEAD, 404s, a host that
+answers 503 and a host that hangs. Then compares:
+- the previous approach: one URL at a time, a new ClientSession per URL
+- LinkHealthChecker.check_many: pooled session, global and per-host limits
+and runs a second pass with the returned validators to show 304 revalidation
+and host backoff. No database or network access is needed.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+from app.services.link_health import LinkHealthChecker
+
+ETAG = '"v1"'
+
+
+def _stand_in(latency: float, hang: float) -> web.Application:
+    async def ok(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304, headers={"ETag": ETAG})
+        return web.Response(text="ok", headers={"ETag": ETAG, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    async def no_head(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        if request.headers.get("Range") == "bytes=0-0":
+            return web.Response(status=206, body=b"o", headers={"Content-Range": "bytes 0-0/2"})
+        return web.Response(text="ok")
+
+    async def gone(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.Response(status=404)
+
+    async def unavailable(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.Response(status=503)
+
+    async def hanging(request: web.Request) -> web.Response:
+        await asyncio.sleep(hang)
+        return web.Response(text="late")
+
+    app = web.Application()
+    for path, handler in (("ok", ok), ("no-head", no_head), ("gone", gone), ("down", unavailable), ("hang", hanging)):
+        app.router.add_route("*", f"/{path}/{{n}}", handler)
+    return app
+
+
+def _urls(count: int, hosts: list, port: int) -> list:
+    """Mostly healthy pages spread over the first hosts; the last two hosts are down and hanging"""
+    healthy_hosts, down_host, hanging_host = hosts[:-2], hosts[-2], hosts[-1]
+    urls = []
+    for i in range(count):
+        host = healthy_hosts[i % len(healthy_hosts)]
+        kind = "no-head" if i % 10 == 1 else "gone" if i % 25 == 2 else "ok"
+        urls.append(f"http://{host}:{port}/{kind}/{i}")
+    urls += [f"http://{down_host}:{port}/down/{i}" for i in range(5)]
+    urls += [f"http://{hanging_host}:{port}/hang/{i}" for i in range(3)]
+    return urls
+
+
+async def _sequential(urls: list, timeout: float) -> int:
+    """check_all_resources_health as it was: one URL at a time, new session each"""
+    healthy = 0
+    for url in urls:
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=True) as response:
+                    healthy += response.status < 400
+        except Exception:
+            pass
+    return healthy
+
+
+def _summary(results: dict) -> str:
+    counts = Counter(
+        "skipped" if r.skipped else str(r.http_status or r.error_message.split(":")[0])
+        for r in results.values()
+    )
+    return ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=200)
+    parser.add_argument("--hosts", type=int, default=6, help="Loopback addresses to serve on (127.0.0.1..N)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    hosts = [f"127.0.0.{i}" for i in range(1, max(args.hosts, 3) + 1)]
+    runner = web.AppRunner(_stand_in(args.latency_ms / 1000, args.timeout * 3))
+    await runner.setup()
+    first = web.TCPSite(runner, hosts[0], 0)
+    await first.start()
+    port = first._server.sockets[0].getsockname()[1]
+    for host in hosts[1:]:
+        await web.TCPSite(runner, host, port).start()
+
+    try:
+        urls = _urls(args.urls, hosts, port)
+        print(f"{len(urls)} URLs on {len(hosts)} hosts, {args.latency_ms:.0f} ms latency, {args.timeout:.1f}s timeout\n")
+
+        if not args.skip_sequential:
+            started = time.perf_counter()
+            healthy = await _sequential(urls, args.timeout)
+            print(f"{'sequential':<22}{time.perf_counter() - started:>8.2f}s  healthy: {healthy}")
+
+        checker = LinkHealthChecker(
+            max_concurrency=20, per_host_concurrency=4, timeout_seconds=args.timeout, backoff_base_seconds=30.0,
+        )
+        targets = [(str(i), url, None, None) for i, url in enumerate(urls)]
+        started = time.perf_counter()
+        results = await checker.check_many(targets)
+        print(f"{'pooled pass 1':<22}{time.perf_counter() - started:>8.2f}s  {_summary(results)}")
+
+        revalidate = [(key, r.url, r.etag, r.last_modified) for key, r in results.items()]
+        started = time.perf_counter()
+        results = await checker.check_many(revalidate)
+        print(f"{'pooled pass 2':<22}{time.perf_counter() - started:>8.2f}s  {_summary(results)}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
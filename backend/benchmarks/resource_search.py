@@ -0,0 +1,69 @@
+"""
+Benchmark /resources/search: substring scan against the BM25 search index.
+
+    cd backend
+    python -m benchmarks.resource_search --rounds 2000
+
+Prints per-query latency for the previous scan over VERIFIED_RESOURCES and for
+ResourceSearchIndex.search, plus the top hits of each for a side-by-side look.
+"""
+
+import argparse
+import time
+
+from app.services.resource_search import resource_search_index
+from app.services.resource_service_v2 import VERIFIED_RESOURCES
+
+QUERIES = [
+    "python", "react hooks", "docker", "kube", "pyhton", "system design interview",
+    "freecodecamp", "sql databases", "k8s", "version control", "typescript handbook", "js",
+    "machine learning", "c++", "intro to docker containers",
+]
+
+TIER_ORDER = {"free": 0, "standard": 1, "premium": 2}
+
+
+def _scan(query: str, user_tier: str) -> list:
+    """search_resources as it was before the index"""
+    query_lower = query.lower()
+    results = []
+    for category, resources in VERIFIED_RESOURCES.items():
+        for resource in resources:
+            if (query_lower in resource.get("title", "").lower() or
+                    query_lower in resource.get("provider", "").lower() or
+                    query_lower in category.lower()):
+                if TIER_ORDER.get(resource.get("tier_required", "free"), 0) <= TIER_ORDER.get(user_tier, 0):
+                    result = resource.copy()
+                    result["category"] = category
+                    results.append(result)
+    results.sort(key=lambda x: x.get("quality_score", 0), reverse=True)
+    return results
+
+
+def _per_query_us(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            fn(query, "premium")
+    return (time.perf_counter() - started) / (rounds * len(QUERIES)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'path':<16}{'us/query':>10}")
+    print(f"{'scan':<16}{_per_query_us(_scan, args.rounds):>10.2f}")
+    print(f"{'index':<16}{_per_query_us(resource_search_index.search, args.rounds):>10.2f}")
+
+    print(f"\n{'query':<26}{'scan hits':>10}{'index hits':>11}  top index result")
+    for query in QUERIES:
+        scanned = _scan(query, "premium")
+        indexed = resource_search_index.search(query, "premium")
+        top = indexed[0][1]["title"] if indexed else "-"
+        print(f"{query:<26}{len(scanned):>10}{len(indexed):>11}  {top}")
+
+
+if __name__ == "__main__":
+    main()
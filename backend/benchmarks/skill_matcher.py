@@ -0,0 +1,130 @@
+"""
+Benchmark skill-name matching before and after the compiled SkillMatcher.
+
+    cd backend
+    python -m benchmarks.skill_matcher --rounds 2000
+
+Compares, per call:
+- get_skill_category: the previous linear substring scan over SKILL_CATEGORY_MAP
+  against the compiled matcher, cold (memo cleared) and warm (memoized)
+- JD skill extraction: one regex search per known skill against a single
+  automaton pass over the text
+
+and checks names the matcher must resolve (EXPECTED_CATEGORIES), exiting
+non-zero if any of them regress.
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from app.api.v1.endpoints.jd_aggregator import JD_SKILLS, extract_skills_from_jd
+from app.services import resource_service_v2
+from app.services.resource_service_v2 import SKILL_CATEGORY_MAP
+
+# Mix of exact aliases, names containing an alias, fragments and unknown skills
+SKILL_NAMES = [
+    "Python", "react hooks", "Advanced React Hooks", "Node.js", "Kubernetes", "distributed",
+    "Amazon Web Services", "Intro to Docker Containers", "PostgreSQL Performance Tuning",
+    "web", "Rust", "Elixir", "Unit Testing with pytest", "GraphQL Federation", "C++",
+    "Version Control with Git", "Terraform", "Machine Learning", "html/css", "Event Sourcing",
+    "ES6+ Features", "APIs",
+]
+
+# Names with a version "+" or a plural after the alias, and near misses that must not match
+EXPECTED_CATEGORIES = {
+    "ES6+ Features": "javascript",
+    "APIs": "api_design",
+    "REST APIs": "api_design",
+    "Docker Containers": "docker",
+    "Node.js": "nodejs",
+    "ES6++": None,
+    "cs": None,
+}
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+We are looking for a backend engineer with Python, FastAPI, PostgreSQL, Docker and AWS.
+Experience with REST API design, unit testing with pytest, Kafka, Redis and Kubernetes.
+Bonus: C++ or C#, Node.js, GraphQL, Terraform, GitHub Actions and SQL Server.
+""" * 4
+
+
+def _linear_category(skill_name: str):
+    """get_skill_category as it was before the compiled matcher"""
+    if not skill_name:
+        return None
+    normalized = skill_name.lower().strip()
+    if normalized in SKILL_CATEGORY_MAP:
+        return SKILL_CATEGORY_MAP[normalized]
+    for key, category in SKILL_CATEGORY_MAP.items():
+        if key in normalized or normalized in key:
+            return category
+    return None
+
+
+def _regex_extract(jd_text: str) -> list:
+    """extract_skills_from_jd as it was before the compiled matcher"""
+    jd_lower = jd_text.lower()
+    return [
+        skill for skill in JD_SKILLS
+        if re.search(r"\b" + re.escape(skill.lower()) + r"\b", jd_lower)
+    ]
+
+
+def _per_call_us(fn, args: list, rounds: int, before_each=None) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        for arg in args:
+            fn(arg)
+        elapsed += time.perf_counter() - started
+    return elapsed / (rounds * len(args)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    matcher = resource_service_v2._skill_matcher
+    results = [
+        ("category: linear scan", _per_call_us(_linear_category, SKILL_NAMES, args.rounds)),
+        ("category: matcher cold", _per_call_us(
+            resource_service_v2.get_skill_category, SKILL_NAMES, args.rounds, matcher.lookup.cache_clear
+        )),
+        ("category: matcher warm", _per_call_us(resource_service_v2.get_skill_category, SKILL_NAMES, args.rounds)),
+        ("jd extract: regex per skill", _per_call_us(_regex_extract, [JOB_DESCRIPTION], max(1, args.rounds // 10))),
+        ("jd extract: matcher", _per_call_us(extract_skills_from_jd, [JOB_DESCRIPTION], max(1, args.rounds // 10))),
+    ]
+
+    print(f"{'path':<30}{'us/call':>10}")
+    for name, us in results:
+        print(f"{name:<30}{us:>10.2f}")
+
+    changed = [
+        (name, _linear_category(name), resource_service_v2.get_skill_category(name))
+        for name in SKILL_NAMES
+        if _linear_category(name) != resource_service_v2.get_skill_category(name)
+    ]
+    if changed:
+        print("\nCategory changes (name: before -> after):")
+        for name, before, after in changed:
+            print(f"  {name}: {before} -> {after}")
+
+    wrong = [
+        (name, expected, resource_service_v2.get_skill_category(name))
+        for name, expected in EXPECTED_CATEGORIES.items()
+        if resource_service_v2.get_skill_category(name) != expected
+    ]
+    if wrong:
+        print("\nUnexpected categories (name: expected -> got):")
+        for name, expected, got in wrong:
+            print(f"  {name}: {expected} -> {got}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
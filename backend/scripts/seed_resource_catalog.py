@@ -0,0 +1,40 @@
+"""
+Import the built-in learning resource catalog into the database.
+
+    cd backend
+    python -m scripts.seed_resource_catalog            # insert new entries only
+    python -m scripts.seed_resource_catalog --overwrite  # also reset edited rows to the built-in values
+
+Copies VERIFIED_RESOURCES into learning_resources, links fallbacks and bumps
+the catalog version, so running workers pick the catalog up within
+RESOURCE_CATALOG_POLL_SECONDS. Safe to run repeatedly.
+"""
+
+import argparse
+import asyncio
+
+from app.db import models  # noqa: F401  (users table for foreign keys)
+from app.db.database import Base, engine
+from app.models import portfolio  # noqa: F401  (User relationships)
+from app.models import resources  # noqa: F401
+from app.services.resource_catalog import seed_catalog
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--overwrite", action="store_true", help="Reset existing rows to the built-in values")
+    args = parser.parse_args()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    counts = await seed_catalog(overwrite=args.overwrite)
+    print(
+        f"✅ Catalog v{counts['version']}: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
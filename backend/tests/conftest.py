@@ -0,0 +1,42 @@
+"""
+Shared test setup
+
+Tests run against a throwaway SQLite database and the offline LLM stand-in,
+so no API key, Redis or PostgreSQL is needed:
+
+    cd backend
+    python -m pytest -q
+"""
+
+import asyncio
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="pathwise-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ.setdefault("LLM_CLIENT_MODE", "replay")
+os.environ.setdefault("RESOURCE_HEALTH_BACKEND", "memory")
+os.environ.setdefault("LLM_REPLAY_SPEED_FACTOR", "0")
+
+import pytest  # noqa: E402
+
+from app.db import models  # noqa: E402,F401
+from app.db.database import Base, engine  # noqa: E402
+from app.models import idempotency, jobs, portfolio, resources  # noqa: E402,F401
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh event loop against empty tables"""
+    def runner(coro):
+        async def wrapped():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            try:
+                return await coro
+            finally:
+                # Pooled aiosqlite connections belong to this loop
+                await engine.dispose()
+        return asyncio.run(wrapped())
+    return runner
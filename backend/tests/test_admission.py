@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.services.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(capacity: int = 1, max_queue_depth: int = 1, free_wait: float = 1.0) -> AdmissionController:
+    return AdmissionController(
+        capacity=capacity,
+        max_queue_depth=max_queue_depth,
+        max_wait_seconds={"enterprise": 1.0, "pro": 1.0, "free": free_wait},
+    )
+
+
+def test_full_queue_sheds_same_tier(run):
+    controller = _controller()
+
+    async def scenario():
+        ticket = await controller.acquire("free")
+        waiting = asyncio.create_task(controller.acquire("free"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("free")
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after >= 1
+
+        ticket.release()
+        (await waiting).release()
+
+    run(scenario())
+    assert controller.shed["free"]["queue_full"] == 1
+    assert controller.in_flight == 0
+
+
+def test_higher_tier_evicts_lower_tier_waiter(run):
+    controller = _controller()
+
+    async def scenario():
+        ticket = await controller.acquire("free")
+        free_waiter = asyncio.create_task(controller.acquire("free"))
+        await asyncio.sleep(0)
+        pro_waiter = asyncio.create_task(controller.acquire("pro"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await free_waiter
+        assert rejected.value.reason == "evicted"
+
+        # The released slot goes straight to the pro request
+        ticket.release()
+        pro_ticket = await pro_waiter
+        assert controller.in_flight == 1
+        pro_ticket.release()
+
+    run(scenario())
+    assert controller.shed["free"]["evicted"] == 1
+    assert controller.admitted["pro"] == 1
+    assert controller.in_flight == 0
+
+
+def test_waiter_is_shed_after_its_tier_max_wait(run):
+    controller = _controller(free_wait=0.05)
+
+    async def scenario():
+        ticket = await controller.acquire("pro")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("free")
+        assert rejected.value.reason == "timeout"
+        assert controller.queue_depth == 0
+        ticket.release()
+
+    run(scenario())
+    assert controller.shed["free"]["timeout"] == 1
+    assert controller.in_flight == 0
+
+
+def test_waiters_are_admitted_by_tier_then_arrival(run):
+    controller = _controller(max_queue_depth=3)
+    order = []
+
+    async def wait_for_slot(tier: str, name: str):
+        ticket = await controller.acquire(tier)
+        order.append(name)
+        ticket.release()
+
+    async def scenario():
+        ticket = await controller.acquire("free")
+        waiters = []
+        for tier, name in (("free", "free-1"), ("enterprise", "enterprise"), ("pro", "pro")):
+            waiters.append(asyncio.create_task(wait_for_slot(tier, name)))
+            await asyncio.sleep(0)
+        ticket.release()
+        await asyncio.gather(*waiters)
+
+    run(scenario())
+    assert order == ["enterprise", "pro", "free-1"]
@@ -0,0 +1,107 @@
+import json
+import types
+import uuid
+
+import httpx
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.db.models import QAHistory, User
+from app.main import app
+from app.services.llm_gateway import LLMGateway
+
+
+def _chunk(content: str):
+    delta = types.SimpleNamespace(content=content)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)], usage=None)
+
+
+class FakeStream:
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent == len(self.tokens):
+            raise StopAsyncIteration
+        self.sent += 1
+        return _chunk(self.tokens[self.sent - 1])
+
+    async def close(self):
+        self.closed = True
+
+
+def _parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _post_as_new_user(path: str, body: dict) -> tuple:
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="learner")
+    async with AsyncSessionLocal() as db:
+        db.add(user)
+        await db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(path, json=body, headers=headers)
+    return user, response
+
+
+def test_stopping_early_closes_the_upstream_stream(run):
+    upstream = FakeStream(["Hel", "lo", " there"])
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return upstream
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    gateway = LLMGateway(client=client, max_retries=0)
+
+    async def scenario():
+        tokens = gateway.stream(feature="stream_chat_response", messages=[])
+        first = await tokens.__anext__()
+        await tokens.aclose()
+        return first
+
+    assert run(scenario()) == "Hel"
+    assert upstream.closed
+    assert upstream.sent == 1
+
+
+def test_chat_stream_saves_the_reply_after_the_last_token(run):
+    async def scenario():
+        user, response = await _post_as_new_user("/api/v1/chat/message/stream", {"message": "How do I learn SQL?"})
+        assert response.status_code == 200
+        events = _parse_sse(response.text)
+        kinds = [event for event, _ in events]
+        assert kinds.count("token") > 1
+        assert kinds[-1] == "done"
+
+        reply = "".join(payload["content"] for event, payload in events if event == "token")
+        assert events[-1][1]["response"] == reply
+        async with AsyncSessionLocal() as db:
+            saved = (await db.execute(select(QAHistory).where(QAHistory.user_id == user.id))).scalar_one()
+        assert str(saved.id) == events[-1][1]["id"]
+        assert saved.answer == reply
+
+    run(scenario())
+
+
+def test_study_buddy_stream_ends_with_the_full_reply(run):
+    async def scenario():
+        _, response = await _post_as_new_user("/api/v1/study-buddy/chat/stream", {"message": "Explain recursion"})
+        events = _parse_sse(response.text)
+        assert [event for event, _ in events][-1] == "done"
+        reply = "".join(payload["content"] for event, payload in events if event == "token")
+        assert reply and events[-1][1]["response"] == reply
+
+    run(scenario())
@@ -0,0 +1,136 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.services.idempotency import IdempotencyStore
+
+
+def _store() -> IdempotencyStore:
+    return IdempotencyStore(ttl_seconds=60, lock_seconds=30, wait_seconds=2.0, poll_interval=0.02)
+
+
+def test_retry_with_same_key_replays_the_stored_response(run):
+    store = _store()
+    user_id = str(uuid.uuid4())
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        return {"success": True, "data": {"id": calls}}
+
+    async def scenario():
+        first = await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), handler)
+        replay_response = Response()
+        replay = await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, replay_response, handler)
+        return first, replay, replay_response
+
+    first, replay, replay_response = run(scenario())
+    assert calls == 1
+    assert replay == first
+    assert replay_response.headers["Idempotent-Replayed"] == "true"
+    assert store.replays == 1
+
+
+def test_key_reused_with_a_different_body_is_rejected(run):
+    store = _store()
+    user_id = str(uuid.uuid4())
+
+    async def handler():
+        return {"success": True}
+
+    async def scenario():
+        await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), handler)
+        with pytest.raises(HTTPException) as conflict:
+            await store.run(user_id, "roadmap.generate", "key-1", {"job": "frontend"}, Response(), handler)
+        return conflict.value
+
+    assert run(scenario()).status_code == 422
+
+
+def test_concurrent_duplicates_run_the_handler_once(run):
+    store = _store()
+    user_id = str(uuid.uuid4())
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"success": True, "data": {"call": calls}}
+
+    async def scenario():
+        return await asyncio.gather(*(
+            store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), handler)
+            for _ in range(3)
+        ))
+
+    results = run(scenario())
+    assert calls == 1
+    assert all(r == {"success": True, "data": {"call": 1}} for r in results)
+
+
+def test_failed_request_releases_the_key(run):
+    store = _store()
+    user_id = str(uuid.uuid4())
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("provider down")
+        return {"success": True}
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), flaky)
+        return await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), flaky)
+
+    assert run(scenario()) == {"success": True}
+    assert attempts == 2
+
+
+def test_keys_are_scoped_per_user(run):
+    store = _store()
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        return {"call": calls}
+
+    async def scenario():
+        first = await store.run(str(uuid.uuid4()), "roadmap.generate", "key-1", {}, Response(), handler)
+        second = await store.run(str(uuid.uuid4()), "roadmap.generate", "key-1", {}, Response(), handler)
+        return first, second
+
+    assert run(scenario()) == ({"call": 1}, {"call": 2})
+
+
+def test_claim_is_extended_while_the_handler_runs(run):
+    # The handler outlives the lock several times over; a duplicate must still wait, not take over
+    store = IdempotencyStore(ttl_seconds=60, lock_seconds=0.3, wait_seconds=3.0, poll_interval=0.02)
+    user_id = str(uuid.uuid4())
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0)
+        return {"call": calls}
+
+    async def scenario():
+        first = asyncio.create_task(
+            store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), slow)
+        )
+        await asyncio.sleep(0.6)
+        # Another worker: no in-process event to wait on, only the database row
+        store._inflight.clear()
+        duplicate = await store.run(user_id, "roadmap.generate", "key-1", {"job": "backend"}, Response(), slow)
+        return await first, duplicate
+
+    assert run(scenario()) == ({"call": 1}, {"call": 1})
+    assert calls == 1
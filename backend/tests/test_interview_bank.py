@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+
+from app.db.database import AsyncSessionLocal
+from app.services import interview_bank_service as bank
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """Replace the LLM generator; records each call"""
+    calls = []
+
+    async def generate(session_type, target_role, difficulty):
+        calls.append((session_type, target_role, difficulty))
+        return [
+            {"type": session_type, "question": f"{session_type} {difficulty} question {len(calls)}.{i}"}
+            for i in range(3)
+        ]
+
+    monkeypatch.setattr(bank, "generate_interview_questions", generate)
+    monkeypatch.setattr(bank.settings, "INTERVIEW_BANK_WATERMARK", 6)
+    bank._demanded_buckets.clear()
+    yield calls
+    bank._demanded_buckets.clear()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Hard", "hard"), ("beginner", "easy"), ("advanced", "hard"), ("", "medium"),
+    ("senior: hard", "medium"), ("expert", "medium"),
+])
+def test_difficulty_is_limited_to_known_levels(value, expected):
+    assert bank.normalize_difficulty(value) == expected
+
+
+def test_free_form_input_only_creates_known_buckets(run, generator):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await bank.get_session_questions(db, str(uuid.uuid4()), "mystery: type", "Backend Engineer", "senior: hard")
+            await db.commit()
+
+    run(scenario())
+    assert bank._demanded_buckets == {"coding:backend:medium"}
+    assert generator == [("coding", "Backend Engineer", "medium")]
+
+
+def test_refill_skips_invalid_keys_and_fills_to_watermark(run, generator):
+    async def scenario():
+        bank._demanded_buckets.update({"behavioral:qa:easy", "coding:backend:senior: hard", "coding:ninja:hard"})
+        added = await bank.refill_once()
+        async with AsyncSessionLocal() as db:
+            counts = await bank._bucket_counts(db)
+        return added, counts
+
+    added, counts = run(scenario())
+    assert added == 3
+    assert counts == {"behavioral:qa:easy": 3}
+    assert bank._demanded_buckets == {"behavioral:qa:easy"}
+
+
+def test_banked_questions_are_not_repeated_for_a_user(run, generator):
+    user_id = str(uuid.uuid4())
+
+    async def session_questions():
+        async with AsyncSessionLocal() as db:
+            questions = await bank.get_session_questions(db, user_id, "coding", "Backend Engineer", "medium")
+            await db.commit()
+        return {q["question"] for q in questions}
+
+    async def scenario():
+        bank._demanded_buckets.add("coding:backend:medium")
+        await bank.refill_once()
+        await bank.refill_once()
+        first = await session_questions()
+        second = await session_questions()
+        third = await session_questions()  # Bucket exhausted for this user: generated live
+        return first, second, third
+
+    first, second, third = run(scenario())
+    assert len(first) == len(second) == 3
+    assert not first & second
+    assert len(generator) == 3
+    assert not third & (first | second)
@@ -0,0 +1,76 @@
+import pytest
+
+from app.services import jd_similarity
+from app.services.jd_similarity import JDSimilarityIndex, MinHasher, estimate_similarity, shingles
+
+POSTING = (
+    "We are hiring a backend engineer to build REST APIs in Python with FastAPI and PostgreSQL. "
+    "You will design schemas, write integration tests, run services on Docker and Kubernetes, "
+    "review pull requests and mentor junior developers across the platform team. "
+) * 2
+OTHER_POSTING = (
+    "Product designer wanted to run user research, build Figma prototypes and own the design system "
+    "for our mobile banking app, partnering closely with product managers and iOS engineers. "
+) * 2
+
+
+def test_cosmetic_edits_still_match_at_the_same_level(run):
+    index = JDSimilarityIndex(threshold=0.85)
+
+    async def scenario():
+        await index.add("r1", POSTING, "intermediate")
+        await index.add("r2", OTHER_POSTING, "intermediate")
+        reformatted = "  " + POSTING.upper().replace(". ", ".\n\n") + "  "
+        return (
+            await index.query(reformatted, "Intermediate"),
+            await index.query(POSTING, "beginner"),
+            await index.query(OTHER_POSTING + " Remote friendly.", "intermediate"),
+        )
+
+    same, other_level, other_posting = run(scenario())
+    assert same == ("r1", 1.0)
+    assert other_level is None
+    assert other_posting is not None and other_posting[0] == "r2"
+    assert index.lookups == 3 and index.matches == 2
+
+
+def test_different_posting_is_not_a_match(run):
+    index = JDSimilarityIndex(threshold=0.85)
+
+    async def scenario():
+        await index.add("r1", POSTING, "intermediate")
+        return await index.query(OTHER_POSTING, "intermediate")
+
+    assert run(scenario()) is None
+
+
+def test_removed_roadmap_is_no_longer_returned(run):
+    index = JDSimilarityIndex()
+
+    async def scenario():
+        await index.add("r1", POSTING, "intermediate")
+        index.remove("r1")
+        return await index.query(POSTING, "intermediate")
+
+    assert run(scenario()) is None
+    assert index._buckets == {}
+
+
+def test_signature_agreement_estimates_jaccard():
+    base = POSTING.split()
+    edited = " ".join(base[:40] + ["Rust", "Go", "gRPC"] + base[40:])
+    a, b = shingles(POSTING), shingles(edited)
+    jaccard = len(a & b) / len(a | b)
+
+    hasher = MinHasher(num_perm=256)
+    estimate = estimate_similarity(hasher.signature(a), hasher.signature(b))
+    assert estimate == pytest.approx(jaccard, abs=0.1)
+
+
+@pytest.mark.skipif(jd_similarity.np is None, reason="numpy not installed")
+def test_vectorized_and_pure_python_signatures_agree(monkeypatch):
+    hasher = MinHasher()
+    hashes = shingles(POSTING)
+    vectorized = hasher.signature(hashes)
+    monkeypatch.setattr(jd_similarity, "np", None)
+    assert hasher.signature(hashes) == vectorized
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from app.db.database import AsyncSessionLocal
+from app.models.jobs import BackgroundJob
+from app.services.job_queue import JobQueue, LocalQueueBackend, register_job
+
+
+@register_job("test.echo")
+async def _echo(db, user_id, payload):
+    await asyncio.sleep(payload.get("sleep", 0))
+    return {"echo": payload.get("value")}
+
+
+async def _add_job(status: str, heartbeat_age: float = 0.0, attempts: int = 0, **payload) -> uuid.UUID:
+    now = datetime.utcnow()
+    job = BackgroundJob(user_id=uuid.uuid4(), job_type="test.echo", payload=payload, status=status, attempts=attempts)
+    if status == "running":
+        job.started_at = now - timedelta(seconds=heartbeat_age)
+        job.heartbeat_at = job.started_at
+    async with AsyncSessionLocal() as db:
+        db.add(job)
+        await db.commit()
+    return job.id
+
+
+async def _status(job_id: uuid.UUID) -> BackgroundJob:
+    async with AsyncSessionLocal() as db:
+        return await db.get(BackgroundJob, job_id)
+
+
+def _drain(backend: LocalQueueBackend) -> list:
+    pushed = []
+    while not backend._queue.empty():
+        pushed.append(backend._queue.get_nowait())
+    return pushed
+
+
+def test_recover_requeues_only_expired_leases(run):
+    async def scenario():
+        backend = LocalQueueBackend()
+        queue = JobQueue(backend, lease_seconds=60)
+        queued = await _add_job("queued")
+        dead = await _add_job("running", heartbeat_age=600)
+        live = await _add_job("running", heartbeat_age=5)
+
+        recovered = await queue.recover()
+
+        assert recovered == 2
+        assert sorted(_drain(backend)) == sorted([str(queued), str(dead)])
+        assert (await _status(dead)).status == "queued"
+        assert (await _status(live)).status == "running"
+
+        await queue.run_job(str(dead))
+        job = await _status(dead)
+        assert job.status == "succeeded"
+        assert job.attempts == 1
+
+    run(scenario())
+
+
+def test_heartbeat_keeps_a_long_job_leased(run):
+    async def scenario():
+        backend = LocalQueueBackend()
+        queue = JobQueue(backend, lease_seconds=0.3)
+        job_id = await _add_job("queued", sleep=0.6, value="slow")
+
+        running = asyncio.create_task(queue.run_job(str(job_id)))
+        await asyncio.sleep(0.45)
+        assert await queue.requeue_expired() == []
+        assert (await _status(job_id)).status == "running"
+
+        await running
+        job = await _status(job_id)
+        assert job.status == "succeeded"
+        assert job.result == {"echo": "slow"}
+
+    run(scenario())
+
+
+def test_claim_runs_a_job_once(run):
+    async def scenario():
+        queue = JobQueue(LocalQueueBackend(), lease_seconds=60)
+        job_id = await _add_job("queued", value=1)
+        await asyncio.gather(*(queue.run_job(str(job_id)) for _ in range(3)))
+        assert (await _status(job_id)).attempts == 1
+
+    run(scenario())
+
+
+def test_expired_job_fails_after_max_attempts(run):
+    async def scenario():
+        backend = LocalQueueBackend()
+        queue = JobQueue(backend, lease_seconds=60, max_attempts=3)
+        retry = await _add_job("running", heartbeat_age=600, attempts=2)
+        poison = await _add_job("running", heartbeat_age=600, attempts=3)
+
+        assert await queue.requeue_expired() == [str(retry)]
+        assert _drain(backend) == [str(retry)]
+        assert (await _status(retry)).status == "queued"
+
+        job = await _status(poison)
+        assert job.status == "failed"
+        assert "3 attempts" in job.error
+        assert job.finished_at is not None
+
+    run(scenario())
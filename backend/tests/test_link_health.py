@@ -0,0 +1,87 @@
+import asyncio
+
+from aiohttp import web
+
+from app.services.link_health import LinkHealthChecker
+from benchmarks.link_health import ETAG, _stand_in
+
+
+async def _serve(scenario):
+    """Run `scenario(base_url)` against the aiohttp stand-in used by benchmarks.link_health"""
+    runner = web.AppRunner(_stand_in(latency=0.0, hang=0.5))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+
+def _checker(**kwargs) -> LinkHealthChecker:
+    return LinkHealthChecker(timeout_seconds=kwargs.pop("timeout_seconds", 2.0), **kwargs)
+
+
+def test_head_rejected_falls_back_to_ranged_get(run):
+    async def scenario(base):
+        return await _checker().check_many([("no-head", f"{base}/no-head/1", None, None)])
+
+    result = run(_serve(scenario))["no-head"]
+    assert result.is_healthy
+    assert result.http_status == 206
+
+
+def test_validators_are_sent_back_and_304_keeps_them(run):
+    checker = _checker()
+
+    async def scenario(base):
+        first = (await checker.check_many([("ok", f"{base}/ok/1", None, None)]))["ok"]
+        second = (await checker.check_many([("ok", f"{base}/ok/1", first.etag, first.last_modified)]))["ok"]
+        return first, second
+
+    first, second = run(_serve(scenario))
+    assert first.http_status == 200
+    assert first.etag == ETAG
+    assert second.http_status == 304
+    assert second.is_healthy
+    assert (second.etag, second.last_modified) == (first.etag, first.last_modified)
+
+
+def test_missing_page_is_unhealthy_without_backing_off_the_host(run):
+    checker = _checker()
+
+    async def scenario(base):
+        return await checker.check_many([
+            ("gone", f"{base}/gone/1", None, None),
+            ("ok", f"{base}/ok/2", None, None),
+        ])
+
+    results = run(_serve(scenario))
+    assert not results["gone"].is_healthy
+    assert results["gone"].error_message == "HTTP 404"
+    assert results["ok"].is_healthy
+    assert checker.backoff_remaining("127.0.0.1") == 0
+
+
+def test_failing_host_is_backed_off_and_skipped(run):
+    checker = _checker(per_host_concurrency=1, backoff_base_seconds=60)
+
+    async def scenario(base):
+        return await checker.check_many([(f"down-{i}", f"{base}/down/{i}", None, None) for i in range(3)])
+
+    results = run(_serve(scenario))
+    assert results["down-0"].http_status == 503
+    assert all(results[f"down-{i}"].skipped for i in (1, 2))
+    assert checker.backoff_remaining("127.0.0.1") > 0
+
+
+def test_timeout_is_reported(run):
+    checker = _checker(timeout_seconds=0.2)
+
+    async def scenario(base):
+        return await checker.check_many([("hang", f"{base}/hang/1", None, None)])
+
+    result = run(_serve(scenario))["hang"]
+    assert not result.is_healthy
+    assert result.error_message == "Timeout"
@@ -0,0 +1,68 @@
+import pytest
+
+from app.schemas.ai_outputs import AIInterviewQuestions, AIResumeAnalysis, AIRoadmap
+from app.services import ai_service
+from app.services.llm_output import OutputValidationError, parse_json_content, validate_output
+
+
+def _skill(name: str, resources: bool = True) -> dict:
+    resource = {"title": f"{name} docs", "url": f"https://example.com/{name}"}
+    return {"name": name, "estimated_hours": "12 hours", "resources": [resource] if resources else []}
+
+
+@pytest.fixture
+def no_repair(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "LLM_REPAIR_MAX_ROUNDS", 0)
+
+
+def test_parse_json_content_tolerates_fences_and_prose():
+    assert parse_json_content('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_content('Here you go: {"a": 1} Enjoy!') == {"a": 1}
+
+
+def test_unrepairable_fragment_is_dropped_and_reported(run, no_repair):
+    data = {
+        "job_title": "Backend Engineer",
+        "phases": [
+            {"name": "P1", "skills": [_skill("python")]},
+            {"name": "P2", "skills": []},
+            {"name": "P3", "skills": [_skill("docker"), _skill("k8s", resources=False)]},
+        ],
+    }
+
+    result = run(validate_output(AIRoadmap, data, "roadmap"))
+
+    assert [p["name"] for p in result["phases"]] == ["P1", "P3"]
+    assert [s["name"] for s in result["phases"][1]["skills"]] == ["docker"]
+    assert sorted(result.dropped) == ["phases.1", "phases.2.skills.1"]
+    # Lenient formatting is normalized
+    assert result["phases"][0]["skills"][0]["estimated_hours"] == 12
+
+
+def test_missing_required_structure_raises(run, no_repair):
+    with pytest.raises(OutputValidationError):
+        run(validate_output(AIRoadmap, {"job_title": "Backend Engineer", "phases": []}, "roadmap"))
+
+
+def test_resume_analysis_requires_skills_and_summary(run, no_repair):
+    with pytest.raises(OutputValidationError):
+        run(validate_output(AIResumeAnalysis, {"skills": [{"name": "Python"}]}, "analyze_resume"))
+    result = run(validate_output(
+        AIResumeAnalysis, {"skills": [{"name": "Python"}], "summary": "Backend engineer"}, "analyze_resume"
+    ))
+    assert result.dropped == []
+
+
+def test_interview_questions_drop_empty_entries(run, no_repair):
+    data = {"questions": [{"question": "Design a rate limiter"}, {"question": ""}]}
+    result = run(validate_output(AIInterviewQuestions, data, "generate_interview_questions"))
+    assert [q["question"] for q in result["questions"]] == ["Design a rate limiter"]
+    assert result.dropped == ["questions.1"]
+
+
+def test_generate_interview_questions_is_validated(run):
+    questions = run(ai_service.generate_interview_questions(
+        session_type="system_design", target_role="Backend Engineer", difficulty="medium"
+    ))
+    assert len(questions) == 3
+    assert all(q["type"] == "system_design" and q["id"] and q["question"] for q in questions)
@@ -0,0 +1,58 @@
+import uuid
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.db.models import User
+from app.main import app
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+
+
+async def _get(path: str, token: str = None) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+async def _user_token(email: str) -> str:
+    user = User(id=uuid.uuid4(), email=email, name=email.split("@")[0])
+    async with AsyncSessionLocal() as db:
+        db.add(user)
+        await db.commit()
+    return create_access_token({"sub": str(user.id)})
+
+
+def test_metrics_requires_the_scrape_token(run, metrics_token):
+    assert run(_get("/metrics")).status_code == 401
+    assert run(_get("/metrics", "wrong")).status_code == 401
+
+    response = run(_get("/metrics", "scrape-secret"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_metrics_closed_without_configured_token(run, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert run(_get("/metrics", "")).status_code == 401
+    assert run(_get("/metrics", "anything")).status_code == 401
+
+
+def test_ai_stats_is_admin_only(run, metrics_token):
+    async def scenario():
+        user_token = await _user_token("learner@example.com")
+        admin_token = await _user_token("admin@example.com")
+        assert (await _get("/api/v1/system/ai-stats", user_token)).status_code == 403
+        response = await _get("/api/v1/system/ai-stats", admin_token)
+        assert response.status_code == 200
+        assert "gateway" in response.json()["data"]
+
+    run(scenario())
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from app.services import ai_service
+from app.services.model_router import ModelRouter, Route, model_router
+from app.services.roadmap_cache import MemoryCacheBackend, RoadmapCache
+
+JD = "Backend engineer building Python APIs on PostgreSQL"
+
+
+def _router() -> ModelRouter:
+    return ModelRouter(
+        routes={"chat": Route("primary", slo_p95_seconds=1.0), "quiz": Route("fast")},
+        tier_models={"primary": "big", "fast": "small"},
+        min_samples=3,
+        downgrade_seconds=60.0,
+    )
+
+
+@pytest.fixture
+def fanout(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_GENERATION_MODE", "fanout")
+    monkeypatch.setattr(ai_service, "roadmap_cache", RoadmapCache(MemoryCacheBackend()))
+    monkeypatch.setattr(model_router, "_downgraded_until", {})
+
+
+def test_slo_breach_downgrades_to_fast_model():
+    router = _router()
+    for _ in range(3):
+        router.observe("chat", "big", 0.5)
+    assert router.select("chat")[1] == "big"
+
+    for _ in range(3):
+        router.observe("chat", "big", 5.0)
+    assert router.is_downgraded("chat")
+    assert router.select("chat")[1] == "small"
+    # Latencies of the fallback model do not count against the primary
+    router.observe("chat", "small", 5.0)
+    assert router.downgrades["chat"] == 1
+    assert router.select("quiz")[1] == "small"
+
+
+def test_cache_key_follows_downgraded_roadmap_features(fanout):
+    primary_key = ai_service._roadmap_cache_key(JD, "beginner", None)
+    model_router._downgraded_until["roadmap_phase_detail"] = time.monotonic() + 60
+    downgraded_key = ai_service._roadmap_cache_key(JD, "beginner", None)
+
+    assert downgraded_key != primary_key
+    model_router._downgraded_until.clear()
+    assert ai_service._roadmap_cache_key(JD, "beginner", None) == primary_key
+
+
+def test_downgrade_during_generation_skips_cache_write(run, fanout, monkeypatch):
+    generate_skeleton = ai_service._generate_roadmap_skeleton
+
+    async def skeleton_then_downgrade(*args):
+        result = await generate_skeleton(*args)
+        model_router._downgraded_until["roadmap_phase_detail"] = time.monotonic() + 60
+        return result
+
+    monkeypatch.setattr(ai_service, "_generate_roadmap_skeleton", skeleton_then_downgrade)
+    run(ai_service.generate_roadmap(JD, "beginner"))
+    assert run(ai_service.roadmap_cache.backend.size()) == 0
+
+    # Generated on the fast model throughout: cached under the downgraded key only
+    monkeypatch.setattr(ai_service, "_generate_roadmap_skeleton", generate_skeleton)
+    run(ai_service.generate_roadmap(JD, "beginner"))
+    assert run(ai_service.roadmap_cache.backend.size()) == 1
+    model_router._downgraded_until.clear()
+    assert run(ai_service.roadmap_cache.get(ai_service._roadmap_cache_key(JD, "beginner", None))) is None
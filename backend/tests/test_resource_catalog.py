@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import select
+
+from app.db.database import AsyncSessionLocal
+from app.models.resources import LearningResource
+from app.services.resource_catalog import bump_catalog_version, refresh_catalog, seed_catalog
+from app.services.resource_search import resource_search_index
+from app.services.resource_service_v2 import VERIFIED_RESOURCES, get_catalog, install_catalog
+
+
+@pytest.fixture
+def restore_catalog():
+    previous = get_catalog()
+    yield
+    install_catalog({c: list(r) for c, r in previous.resources_by_category.items()}, previous.version)
+
+
+def _first_resource():
+    category, resources = next(iter(VERIFIED_RESOURCES.items()))
+    return category, resources[0]
+
+
+def test_builtin_catalog_is_served_until_the_table_is_seeded(run, restore_catalog):
+    assert run(refresh_catalog()) is False
+    assert get_catalog().version == 0
+
+
+def test_seeded_catalog_is_loaded_and_reloaded_on_version_change(run, restore_catalog):
+    category, resource = _first_resource()
+
+    async def scenario():
+        counts = await seed_catalog()
+        assert counts["inserted"] == sum(len(r) for r in VERIFIED_RESOURCES.values())
+        assert await refresh_catalog() is True
+        seeded = get_catalog()
+        assert seeded.version == counts["version"]
+        assert seeded.by_id[resource["id"]]["url"] == resource["url"]
+        assert await refresh_catalog() is False  # Same version: nothing to do
+
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(
+                select(LearningResource).where(LearningResource.slug == resource["id"])
+            )).scalar_one()
+            row.title = "Renamed in the admin UI"
+            await bump_catalog_version(session)
+            await session.commit()
+
+        assert await refresh_catalog() is True
+        assert get_catalog().version == seeded.version + 1
+        assert get_catalog().by_id[resource["id"]]["title"] == "Renamed in the admin UI"
+        assert get_catalog().resources_by_category[category][0]["id"] == resource["id"]
+        # The search index follows the installed snapshot
+        assert any(r["id"] == resource["id"] for _, r, _ in resource_search_index.search("renamed admin"))
+
+    run(scenario())
+
+
+def test_deactivated_rows_leave_the_catalog(run, restore_catalog):
+    _, resource = _first_resource()
+
+    async def scenario():
+        await seed_catalog()
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(
+                select(LearningResource).where(LearningResource.slug == resource["id"])
+            )).scalar_one()
+            row.is_active = False
+            await bump_catalog_version(session)
+            await session.commit()
+        await refresh_catalog()
+        return get_catalog()
+
+    assert resource["id"] not in run(scenario()).by_id
+
+
+def test_reseeding_keeps_edits_unless_overwriting(run, restore_catalog):
+    _, resource = _first_resource()
+
+    async def title():
+        async with AsyncSessionLocal() as session:
+            return (await session.execute(
+                select(LearningResource.title).where(LearningResource.slug == resource["id"])
+            )).scalar_one()
+
+    async def scenario():
+        await seed_catalog()
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(
+                select(LearningResource).where(LearningResource.slug == resource["id"])
+            )).scalar_one()
+            row.title = "Edited"
+            await session.commit()
+        counts = await seed_catalog()
+        assert counts["inserted"] == 0 and counts["updated"] == 0
+        assert await title() == "Edited"
+        await seed_catalog(overwrite=True)
+        assert await title() == resource.get("title", resource["id"])
+
+    run(scenario())
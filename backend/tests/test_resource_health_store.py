@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from app.services.redis_memory import InMemoryRedis
+from app.services.resource_health_store import ResourceHealthStore
+from app.services.resource_service_v2 import get_resource_health
+
+UNHEALTHY = {"is_healthy": False, "error_message": "HTTP 404", "consecutive_failures": 2}
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_change_published_by_another_worker_is_applied(run):
+    redis = InMemoryRedis()
+    publisher = ResourceHealthStore(redis, namespace="test-pubsub")
+    listener = ResourceHealthStore(redis, namespace="test-pubsub")
+
+    async def scenario():
+        stop = asyncio.Event()
+        listening = asyncio.create_task(listener.run(stop))
+        await _until(lambda: listener.resyncs == 1)
+
+        # _publish only: the change reaches this process through the channel
+        await publisher._publish({"pubsub-res": UNHEALTHY})
+        await _until(lambda: listener.received == 1)
+
+        stop.set()
+        await listening
+
+    run(scenario())
+    assert get_resource_health("pubsub-res") == UNHEALTHY
+    assert listener.stats()["version"] == 1
+
+
+def test_missed_message_triggers_a_full_resync(run):
+    redis = InMemoryRedis()
+    listener = ResourceHealthStore(redis, namespace="test-resync")
+
+    async def scenario():
+        stop = asyncio.Event()
+        listening = asyncio.create_task(listener.run(stop))
+        await _until(lambda: listener.resyncs == 1)
+
+        # Version 1 was written while the listener was not subscribed; only version 2 arrives
+        await redis.hset(listener.hash_key, mapping={"missed-res": json.dumps(UNHEALTHY)})
+        await redis.incr(listener.version_key)
+        await redis.hset(listener.hash_key, mapping={"seen-res": json.dumps({"is_healthy": True})})
+        version = await redis.incr(listener.version_key)
+        await redis.publish(listener.channel, json.dumps({"version": version, "states": {"seen-res": {"is_healthy": True}}}))
+        await _until(lambda: listener.resyncs == 2)
+
+        stop.set()
+        await listening
+
+    run(scenario())
+    assert get_resource_health("missed-res") == UNHEALTHY
+    assert get_resource_health("seen-res") == {"is_healthy": True}
+    assert listener.stats()["version"] == 2
+
+
+def test_memory_backend_applies_locally_without_publishing(run):
+    store = ResourceHealthStore(None)
+
+    async def scenario():
+        await store.set("local-res", UNHEALTHY)
+
+    run(scenario())
+    assert get_resource_health("local-res") == UNHEALTHY
+    assert store.published == 0
@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.resources import ResourceReport
+from app.services import resource_service_v2
+from app.services.resource_reports import list_reports, submit_report
+from app.services.resource_service_v2 import VERIFIED_RESOURCES, get_resource_health
+
+CATEGORY, RESOURCE = next(
+    (category, r) for category, resources in VERIFIED_RESOURCES.items() for r in resources if r.get("fallback_id")
+)
+
+
+@pytest.fixture
+def isolated_health(monkeypatch):
+    monkeypatch.setattr(resource_service_v2, "_resource_health_cache", {})
+    monkeypatch.setattr(resource_service_v2, "_health_version", resource_service_v2._health_version)
+    monkeypatch.setattr(settings, "RESOURCE_REPORT_DEMOTION_THRESHOLD", 2)
+
+
+async def _report(user_id: str, resource: dict = RESOURCE):
+    async with AsyncSessionLocal() as db:
+        return await submit_report(db, user_id, resource["id"], resource["url"], "broken_link")
+
+
+def test_distinct_reporters_demote_the_resource(run, isolated_health):
+    first_user, second_user = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def scenario():
+        _, row = await _report(first_user)
+        assert row.report_count == 1
+        _, row = await _report(first_user)
+        assert row.report_count == 1  # Same user again: stored, not counted
+        assert get_resource_health(RESOURCE["id"]) is None
+
+        _, row = await _report(second_user)
+        assert row.report_count == 2
+
+    run(scenario())
+    health = get_resource_health(RESOURCE["id"])
+    assert health["is_healthy"] is False and health["user_reported"] is True
+    # Served as its fallback from now on
+    served = resource_service_v2._resolve_view(CATEGORY, "premium", None, True)
+    substitutes = [r for r in served if r.get("original_id") == RESOURCE["id"]]
+    assert [r["id"] for r in substitutes] == [RESOURCE["fallback_id"]]
+
+
+def test_unknown_resource_is_not_stored(run, isolated_health):
+    unknown = {"id": "no-such-resource", "url": "https://example.com/nowhere"}
+    assert run(_report(str(uuid.uuid4()), unknown)) is None
+
+
+def test_review_queue_pages_newest_first_without_gaps(run, isolated_health):
+    async def scenario():
+        _, row = await _report(str(uuid.uuid4()))
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            # Two reports share a timestamp: the id breaks the tie
+            for created_at in (now, now, now - timedelta(minutes=1), now - timedelta(minutes=2)):
+                db.add(ResourceReport(
+                    resource_id=row.id, user_id=uuid.uuid4(), report_type="outdated",
+                    status="pending", created_at=created_at,
+                ))
+            await db.commit()
+
+        seen, cursor = [], None
+        async with AsyncSessionLocal() as db:
+            while True:
+                page, cursor = await list_reports(db, limit=2, cursor=cursor)
+                assert len(page) <= 2
+                seen.extend(page)
+                if cursor is None:
+                    break
+            all_reports, _ = await list_reports(db, limit=100)
+            with pytest.raises(ValueError):
+                await list_reports(db, cursor="not-a-cursor")
+        return seen, all_reports
+
+    seen, all_reports = run(scenario())
+    assert len(seen) == 5
+    assert len({r["id"] for r in seen}) == 5
+    assert seen == all_reports
+    assert [r["created_at"] for r in seen] == sorted((r["created_at"] for r in seen), reverse=True)
+    assert seen[0]["resource_id"] == RESOURCE["id"]
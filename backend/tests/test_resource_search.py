@@ -0,0 +1,77 @@
+import pytest
+
+from app.services.resource_search import ResourceSearchIndex, tokenize
+from app.services.resource_service_v2 import ResourceCatalog
+
+CATALOG = {
+    "kubernetes": [
+        {"id": "k8s-docs", "title": "Kubernetes Documentation", "provider": "CNCF", "quality_score": 0.9},
+        {"id": "k8s-course", "title": "Kubernetes Deep Dive", "provider": "Udemy", "quality_score": 0.8,
+         "tier_required": "premium"},
+    ],
+    "python": [
+        {"id": "py-tutorial", "title": "The Python Tutorial", "provider": "Python.org", "quality_score": 0.95},
+        {"id": "py-testing", "title": "Testing Python Applications with pytest", "provider": "Real Python",
+         "quality_score": 0.8},
+    ],
+    "machine_learning": [
+        {"id": "ml-course", "title": "Machine Learning Specialization", "provider": "Coursera", "quality_score": 0.9},
+    ],
+    "version_control": [
+        {"id": "learn-git", "title": "Learn Git Branching", "provider": "GitHub", "quality_score": 0.7},
+    ],
+}
+ALIASES = {"k8s": "kubernetes", "py": "python", "ml": "machine_learning"}
+
+
+@pytest.fixture
+def index() -> ResourceSearchIndex:
+    return ResourceSearchIndex.from_catalog(CATALOG, ALIASES)
+
+
+def _ids(results) -> list:
+    return [resource["id"] for _, resource, _ in results]
+
+
+def test_tokenizer_keeps_language_names_whole():
+    assert tokenize("C++, C# and Node.js databases testing") == ["c++", "c#", "and", "node.js", "database", "test"]
+
+
+def test_title_match_ranks_first_and_aliases_are_searchable(index):
+    assert _ids(index.search("python testing"))[0] == "py-testing"
+    assert set(_ids(index.search("k8s"))) == {"k8s-docs"}
+
+
+def test_short_queries_require_every_term(index):
+    # "learning" alone matches both; with "machine" only the ML course qualifies
+    assert set(_ids(index.search("learning"))) == {"ml-course", "learn-git"}
+    assert _ids(index.search("machine learning")) == ["ml-course"]
+
+
+def test_long_queries_require_most_terms(index):
+    # Four terms: three must match. Git branching matches only "learn" and "git".
+    assert _ids(index.search("learn git branching tutorial")) == ["learn-git"]
+    assert _ids(index.search("learn git kubernetes python")) == []
+
+
+def test_prefix_and_typo_matches(index):
+    assert _ids(index.search("kube")) == ["k8s-docs"]
+    assert _ids(index.search("pyhton tutorial"))[0] == "py-tutorial"
+
+
+def test_tier_filtering_happens_before_scoring(index):
+    assert "k8s-course" not in _ids(index.search("kubernetes"))
+    assert "k8s-course" in _ids(index.search("kubernetes", user_tier="premium"))
+
+
+def test_sync_reindexes_only_the_changed_snapshot(index):
+    old = ResourceCatalog(CATALOG)
+    changed = {
+        **CATALOG,
+        "python": [{**CATALOG["python"][0], "title": "Official Python Handbook"}],
+    }
+    index.sync(old, ResourceCatalog(changed))
+
+    assert _ids(index.search("handbook")) == ["py-tutorial"]
+    assert _ids(index.search("pytest")) == []
+    assert len(index) == 5
@@ -0,0 +1,73 @@
+import pytest
+
+from app.services import resource_service_v2 as resources
+from app.services.resource_service_v2 import (
+    get_catalog,
+    get_resources_for_skill,
+    get_skill_category,
+    install_catalog,
+    mark_resource_unhealthy,
+)
+
+CATEGORY = get_skill_category("Python")
+
+
+def _resource(resource_id: str, quality: float, **fields) -> dict:
+    return {"id": resource_id, "title": resource_id, "url": f"https://example.com/{resource_id}", "quality_score": quality, **fields}
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    monkeypatch.setattr(resources, "_resource_health_cache", {})
+    monkeypatch.setattr(resources, "_health_version", 0)
+    previous = get_catalog()
+    install_catalog({CATEGORY: [
+        _resource("intro", 0.7, difficulty="beginner"),
+        _resource("docs", 0.6, difficulty="beginner", is_official=True),
+        _resource("course", 0.95, difficulty="advanced", tier_required="premium"),
+        _resource("book", 0.9, difficulty="intermediate", tier_required="standard", fallback_id="mirror"),
+        _resource("mirror", 0.5, difficulty="intermediate"),
+    ]}, version=9001)
+    yield get_catalog()
+    install_catalog({c: list(r) for c, r in previous.resources_by_category.items()}, previous.version)
+
+
+def _ids(view) -> list:
+    return [r["id"] for r in view]
+
+
+def test_views_hold_what_each_tier_can_access_best_first(catalog):
+    assert _ids(catalog.view(CATEGORY, "free")) == ["docs", "intro", "mirror"]
+    assert _ids(catalog.view(CATEGORY, "premium")) == ["docs", "course", "book", "intro", "mirror"]
+    assert catalog.view(CATEGORY, "platinum") == catalog.view(CATEGORY, "free")
+
+
+def test_difficulty_without_matches_falls_back_to_the_unfiltered_view(catalog):
+    assert _ids(catalog.view(CATEGORY, "free", "beginner")) == ["docs", "intro"]
+    # Only a premium resource is advanced, so free users get the whole free view
+    assert catalog.view(CATEGORY, "free", "advanced") == catalog.view(CATEGORY, "free")
+    assert catalog.view(CATEGORY, "free", "expert") == catalog.view(CATEGORY, "free")
+
+
+def test_views_are_read_only(catalog):
+    with pytest.raises(TypeError):
+        catalog.view(CATEGORY, "free")[0]["url"] = "https://evil.example.com"
+
+
+def test_unhealthy_resource_is_swapped_for_its_fallback(catalog):
+    assert _ids(get_resources_for_skill("Python", "standard", "intermediate")) == ["book", "mirror"]
+
+    mark_resource_unhealthy("book", "HTTP 404")
+    served = get_resources_for_skill("Python", "standard", "intermediate")
+    assert served[0]["id"] == "mirror" and served[0]["is_fallback"] and served[0]["original_id"] == "book"
+    # Without fallbacks the view is served as compiled
+    assert _ids(get_resources_for_skill("Python", "standard", "intermediate", include_fallbacks=False)) == ["book", "mirror"]
+
+    resources._set_resource_health("book", {"is_healthy": True})
+    assert _ids(get_resources_for_skill("Python", "standard", "intermediate")) == ["book", "mirror"]
+
+
+def test_results_are_capped_per_tier(catalog):
+    assert len(get_resources_for_skill("Python", "free")) == resources.TIER_RESOURCE_LIMITS["free"]
+    assert len(get_resources_for_skill("Python", "premium")) == 5
+    assert get_resources_for_skill("Underwater basket weaving")[0]["type"] == "search"
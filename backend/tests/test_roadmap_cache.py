@@ -0,0 +1,109 @@
+import pytest
+
+from app.services import ai_service, roadmap_cache as roadmap_cache_module
+from app.services.redis_memory import InMemoryRedis
+from app.services.roadmap_cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    RoadmapCache,
+    make_roadmap_cache_key,
+    reassign_roadmap_ids,
+)
+
+JD = "Backend engineer building Python APIs on PostgreSQL"
+
+
+class Clock:
+    """Stands in for the cache module's `time`, leaving the event loop's clock alone"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    time = monotonic
+
+
+def test_key_ignores_cosmetic_differences_only():
+    key = make_roadmap_cache_key(JD, "Beginner", None, "gpt-4o", "v1")
+    assert make_roadmap_cache_key(f"  {JD.upper()}\n", "beginner ", "", "gpt-4o", "v1") == key
+    assert make_roadmap_cache_key(JD, "advanced", None, "gpt-4o", "v1") != key
+    assert make_roadmap_cache_key(JD, "beginner", None, "gpt-4o-mini", "v1") != key
+    assert make_roadmap_cache_key(JD, "beginner", None, "gpt-4o", "v2") != key
+
+
+def test_memory_backend_expires_after_ttl(run, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(roadmap_cache_module, "time", clock)
+    backend = MemoryCacheBackend()
+
+    async def scenario():
+        await backend.set("k", "v", ttl=60)
+        clock.now += 59
+        assert await backend.get("k") == "v"
+        clock.now += 2
+        assert await backend.get("k") is None
+        assert await backend.size() == 0
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("make_backend", [
+    lambda: MemoryCacheBackend(max_entries=2),
+    lambda: RedisCacheBackend(InMemoryRedis(), max_entries=2),
+])
+def test_least_recently_used_entry_is_evicted(run, monkeypatch, make_backend):
+    clock = Clock()
+    monkeypatch.setattr(roadmap_cache_module, "time", clock)
+    backend = make_backend()
+
+    async def scenario():
+        await backend.set("a", "1", ttl=60)
+        clock.now += 1
+        await backend.set("b", "2", ttl=60)
+        clock.now += 1
+        assert await backend.get("a") == "1"  # "b" is now the least recently used
+        clock.now += 1
+        await backend.set("c", "3", ttl=60)
+        assert await backend.get("b") is None
+        assert await backend.get("a") == "1"
+        assert await backend.get("c") == "3"
+        assert await backend.size() == 2
+
+    run(scenario())
+
+
+def test_reassigned_ids_are_fresh_and_the_original_untouched():
+    roadmap = {
+        "phases": [{"id": "p", "skills": [{"id": "s", "resources": [{"id": "r"}]}]}],
+        "projects": [{"id": "x"}],
+    }
+    fresh = reassign_roadmap_ids(roadmap)
+    skill = fresh["phases"][0]["skills"][0]
+    assert {fresh["phases"][0]["id"], skill["id"], skill["resources"][0]["id"], fresh["projects"][0]["id"]}.isdisjoint(
+        {"p", "s", "r", "x"}
+    )
+    assert roadmap["phases"][0]["id"] == "p"
+
+
+def test_repeat_request_is_served_from_cache(run, monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_GENERATION_MODE", "single")
+    monkeypatch.setattr(ai_service, "roadmap_cache", RoadmapCache(MemoryCacheBackend()))
+    calls = 0
+    generate_single = ai_service._generate_roadmap_single
+
+    async def counted(*args):
+        nonlocal calls
+        calls += 1
+        return await generate_single(*args)
+
+    monkeypatch.setattr(ai_service, "_generate_roadmap_single", counted)
+
+    first = run(ai_service.generate_roadmap(JD, "beginner"))
+    second = run(ai_service.generate_roadmap(f"{JD.lower()}  ", "Beginner"))
+
+    assert calls == 1
+    assert ai_service.roadmap_cache.hits == 1
+    assert [p["name"] for p in second["phases"]] == [p["name"] for p in first["phases"]]
+    assert second["phases"][0]["id"] != first["phases"][0]["id"]
@@ -0,0 +1,120 @@
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import update
+
+from app.api.v1.endpoints import roadmap as roadmap_endpoint
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.db.models import Progress, User
+from app.main import app
+from app.schemas.roadmap import RoadmapGenerateRequest
+from app.services import resource_service_v2
+from app.services.local_roadmap_service import build_local_roadmap
+from app.services.roadmap_detail_cache import RoadmapDetailCache, etag_matches
+
+JD = "Backend engineer building REST APIs in Python with FastAPI, PostgreSQL and Docker. " * 3
+
+
+@pytest.fixture
+def detail_cache(monkeypatch):
+    cache = RoadmapDetailCache()
+    monkeypatch.setattr(roadmap_endpoint, "roadmap_detail_cache", cache)
+    monkeypatch.setattr(roadmap_endpoint.settings, "ROADMAP_DEDUP_ENABLED", False)
+    return cache
+
+
+async def _user_with_roadmap() -> tuple:
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="learner")
+    request = RoadmapGenerateRequest(job_description=JD, skill_level="beginner")
+    async with AsyncSessionLocal() as db:
+        db.add(user)
+        await db.commit()
+        roadmap = await roadmap_endpoint._save_roadmap(
+            db, str(user.id), request, build_local_roadmap(JD, "beginner", None), generation="local"
+        )
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    return roadmap, headers
+
+
+async def _call(method: str, path: str, headers: dict, **kwargs) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, path, headers=headers, **kwargs)
+
+
+def test_etag_comparison_is_weak_and_accepts_lists():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+
+
+def test_unchanged_roadmap_answers_304(run, detail_cache):
+    async def scenario():
+        roadmap, headers = await _user_with_roadmap()
+        path = f"/api/v1/roadmaps/{roadmap.id}"
+        first = await _call("GET", path, headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        again = await _call("GET", path, {**headers, "If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["ETag"] == etag
+        assert again.content == b""
+        assert detail_cache.hits == 1
+
+        _, other_headers = await _user_with_roadmap()
+        assert (await _call("GET", path, other_headers)).status_code == 404
+
+    run(scenario())
+
+
+def test_progress_changes_the_etag(run, detail_cache):
+    async def scenario():
+        roadmap, headers = await _user_with_roadmap()
+        path = f"/api/v1/roadmaps/{roadmap.id}"
+        skill_id = roadmap.phases[0]["skills"][0]["id"]
+        etag = (await _call("GET", path, headers)).headers["ETag"]
+
+        await _call("POST", "/api/v1/roadmaps/progress", headers, json={
+            "roadmap_id": str(roadmap.id), "skill_id": skill_id, "status": "completed",
+        })
+        updated = await _call("GET", path, {**headers, "If-None-Match": etag})
+        assert updated.status_code == 200
+        assert updated.headers["ETag"] != etag
+        skill = updated.json()["data"]["phases"][0]["skills"][0]
+        assert skill["progress"]["status"] == "completed"
+
+        # Written by another worker: no invalidate() here, the progress fingerprint still moves
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Progress).where(Progress.roadmap_id == roadmap.id, Progress.skill_id == skill_id)
+                .values(time_spent_minutes=45)
+            )
+            await db.commit()
+        elsewhere = await _call("GET", path, {**headers, "If-None-Match": updated.headers["ETag"]})
+        assert elsewhere.status_code == 200
+        assert elsewhere.json()["data"]["phases"][0]["skills"][0]["progress"]["time_spent_minutes"] == 45
+
+    run(scenario())
+
+
+def test_resource_health_change_drops_rendered_details(run, detail_cache, monkeypatch):
+    monkeypatch.setattr(resource_service_v2, "_resource_health_cache", {})
+    monkeypatch.setattr(resource_service_v2, "_health_version", resource_service_v2._health_version)
+
+    async def scenario():
+        roadmap, headers = await _user_with_roadmap()
+        path = f"/api/v1/roadmaps/{roadmap.id}"
+        await _call("GET", path, headers)
+        assert detail_cache.stats()["entries"] == 1
+
+        resource_service_v2.mark_resource_unhealthy("some-resource", "HTTP 404")
+        await _call("GET", path, headers)
+        assert detail_cache.hits == 0
+        assert detail_cache.misses == 2
+
+    run(scenario())
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+
+from app.api.v1.endpoints import roadmap as roadmap_endpoint
+from app.db.database import AsyncSessionLocal, add_missing_columns
+from app.db.models import Roadmap
+from app.schemas.roadmap import RoadmapGenerateRequest
+from app.services.admission import AdmissionController
+from app.services.jd_similarity import JDSimilarityIndex
+from app.services.local_roadmap_service import build_local_roadmap
+
+JOB_DESCRIPTION = (
+    "Backend engineer building REST APIs in Python with FastAPI, PostgreSQL, Redis and Docker. "
+    "You will own services end to end, write tests and review code. "
+) * 3
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    index = JDSimilarityIndex(threshold=0.85)
+    monkeypatch.setattr(roadmap_endpoint, "jd_similarity_index", index)
+    return index
+
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    monkeypatch.setattr(roadmap_endpoint.settings, "ROADMAP_LLM_LATENCY_BUDGET_SECONDS", 0.05)
+
+    async def generate_roadmap(job_description, skill_level, industry):
+        await asyncio.sleep(0.2)
+        return build_local_roadmap(job_description, skill_level, industry)
+
+    monkeypatch.setattr(roadmap_endpoint, "generate_roadmap", generate_roadmap)
+
+
+def _request() -> RoadmapGenerateRequest:
+    return RoadmapGenerateRequest(job_description=JOB_DESCRIPTION, skill_level="intermediate", industry="tech")
+
+
+def test_rebuild_indexes_only_llm_roadmaps(run):
+    index = JDSimilarityIndex()
+
+    async def scenario():
+        ids = {}
+        async with AsyncSessionLocal() as db:
+            for generation in ("llm", "local", None):
+                row = Roadmap(
+                    user_id=uuid.uuid4(), job_title="Backend", job_description=f"{JOB_DESCRIPTION} {generation}",
+                    skill_level="intermediate", generation=generation,
+                )
+                db.add(row)
+                await db.flush()
+                ids[generation] = str(row.id)
+            await db.commit()
+        await index.rebuild_from_db(AsyncSessionLocal, limit=100, time_budget_seconds=10)
+        return ids
+
+    ids = run(scenario())
+    # NULL rows predate the generation column and were LLM output
+    assert set(index._signatures) == {ids["llm"], ids[None]}
+
+
+def test_local_fallback_is_not_a_clone_source_until_upgraded(run, fresh_index, slow_llm):
+    controller = AdmissionController(capacity=1, max_queue_depth=1, max_wait_seconds={"free": 1.0})
+
+    async def scenario():
+        ticket = await controller.acquire("free")
+        async with AsyncSessionLocal() as db:
+            data = await roadmap_endpoint._generate_and_save(db, str(uuid.uuid4()), _request(), admission=ticket)
+        roadmap_id = uuid.UUID(data["id"])
+        async with AsyncSessionLocal() as db:
+            saved = await db.get(Roadmap, roadmap_id)
+        before = (data["generation"], saved.generation, len(fresh_index._signatures), controller.in_flight)
+
+        await asyncio.gather(*roadmap_endpoint._upgrade_tasks)
+        async with AsyncSessionLocal() as db:
+            upgraded = await db.get(Roadmap, roadmap_id)
+        return before, upgraded.generation, set(fresh_index._signatures), data["id"], controller.in_flight
+
+    before, generation, indexed, roadmap_id, in_flight = run(scenario())
+    # Admission slot is held by the pending upgrade
+    assert before == ("local", "local", 0, 1)
+    assert generation == "llm"
+    assert indexed == {roadmap_id}
+    assert in_flight == 0
+
+
+def test_cancelled_llm_task_serves_the_local_roadmap(run, fresh_index, monkeypatch):
+    async def cancelled(job_description, skill_level, industry):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(roadmap_endpoint, "generate_roadmap", cancelled)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            return await roadmap_endpoint._generate_and_save(db, str(uuid.uuid4()), _request())
+
+    data = run(scenario())
+    assert data["generation"] == "local"
+    assert data["upgrade_pending"] is False
+
+
+def test_add_missing_columns_upgrades_an_old_roadmaps_table():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE roadmaps (id CHAR(36) PRIMARY KEY, user_id CHAR(36) NOT NULL, job_title VARCHAR(255) NOT NULL, "
+            "job_description TEXT NOT NULL, skill_level VARCHAR(50) NOT NULL, status VARCHAR(50))"
+        ))
+        added = add_missing_columns(conn)
+        columns = {c["name"] for c in inspect(conn).get_columns("roadmaps")}
+        conn.execute(text("INSERT INTO roadmaps (id, user_id, job_title, job_description, skill_level) VALUES ('1', '2', 't', 'd', 's')"))
+        legacy = conn.execute(select(Roadmap.generation)).scalar_one()
+
+    assert "roadmaps.generation" in added
+    assert "generation" in columns
+    assert legacy is None
+    with engine.connect() as conn:
+        assert add_missing_columns(conn) == []
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from app.services import ai_service
+from app.services.roadmap_cache import MemoryCacheBackend, RoadmapCache
+
+JD = "Backend engineer building Python APIs on PostgreSQL"
+
+
+@pytest.fixture
+def fanout(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_GENERATION_MODE", "fanout")
+    monkeypatch.setattr(ai_service, "roadmap_cache", RoadmapCache(MemoryCacheBackend()))
+
+
+def _wrap_phase_calls(monkeypatch, before_call):
+    """Run `before_call(prompt)` ahead of every phase-detail completion"""
+    complete = ai_service.llm_gateway.complete
+
+    async def wrapped(feature="unknown", **kwargs):
+        if feature == "roadmap_phase_detail":
+            await before_call(kwargs["messages"][-1]["content"])
+        return await complete(feature=feature, **kwargs)
+
+    monkeypatch.setattr(ai_service.llm_gateway, "complete", wrapped)
+
+
+def test_detail_is_merged_by_name_then_position():
+    phase = {"skills": [{"name": "SQL"}, {"name": "Docker"}, {"name": "Git"}]}
+    detail = {"skills": [
+        {"name": "docker", "description": "containers", "resources": [{"title": "Docs"}]},
+        {"name": "Structured Query Language", "description": "queries"},
+    ]}
+    merged = ai_service._merge_phase_detail(phase, detail)["skills"]
+    assert merged[0]["description"] == "containers"  # No name match: detail at the same position
+    assert merged[1]["resources"] == [{"title": "Docs"}]
+    assert merged[2] == {"name": "Git", "resources": []}
+
+
+def test_failed_phase_keeps_its_outline_and_the_roadmap_is_not_cached(run, fanout, monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_PHASE_MAX_ATTEMPTS", 2)
+    attempts = 0
+
+    async def fail_foundations(prompt):
+        nonlocal attempts
+        if "Foundations" in prompt:
+            attempts += 1
+            raise RuntimeError("provider hiccup")
+
+    _wrap_phase_calls(monkeypatch, fail_foundations)
+    roadmap = run(ai_service.generate_roadmap(JD, "beginner"))
+
+    assert attempts == 2
+    phases = {phase["name"]: phase for phase in roadmap["phases"]}
+    assert all(skill["resources"] == [] for skill in phases["Foundations"]["skills"])
+    assert any(skill["resources"] for phase in roadmap["phases"] if phase["name"] != "Foundations" for skill in phase["skills"])
+    assert [phase["order"] for phase in roadmap["phases"]] == sorted(phase["order"] for phase in roadmap["phases"])
+    assert run(ai_service.roadmap_cache.backend.size()) == 0
+
+
+def test_phase_calls_respect_the_concurrency_limit(run, fanout, monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_FANOUT_CONCURRENCY", 1)
+    in_flight = peak = 0
+
+    async def track(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+
+    _wrap_phase_calls(monkeypatch, track)
+    roadmap = run(ai_service.generate_roadmap(JD, "beginner"))
+
+    assert len(roadmap["phases"]) > 1
+    assert peak == 1
+    assert run(ai_service.roadmap_cache.backend.size()) == 1
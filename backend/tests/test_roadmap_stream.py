@@ -0,0 +1,81 @@
+import json
+import uuid
+
+import httpx
+import pytest
+
+from app.api.v1.endpoints import roadmap as roadmap_endpoint
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.db.models import Roadmap, User
+from app.main import app
+from app.services import ai_service
+from app.services.jd_similarity import JDSimilarityIndex
+
+JD = "Backend engineer building Python APIs on PostgreSQL"
+
+
+@pytest.fixture
+def uncached(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_CACHE_ENABLED", False)
+    monkeypatch.setattr(roadmap_endpoint, "jd_similarity_index", JDSimilarityIndex())
+
+
+def _parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.parametrize("mode", ["single", "fanout"])
+def test_phases_stream_before_the_final_roadmap(run, uncached, monkeypatch, mode):
+    monkeypatch.setattr(ai_service.settings, "ROADMAP_GENERATION_MODE", mode)
+
+    async def collect():
+        return [(event, payload) async for event, payload in ai_service.stream_roadmap(JD, "beginner")]
+
+    events = run(collect())
+    kinds = [event for event, _ in events]
+    assert kinds[-1] == "roadmap"
+    assert kinds.index("project") > max(i for i, kind in enumerate(kinds) if kind == "phase")
+
+    roadmap = events[-1][1]
+    streamed_ids = {payload["id"] for event, payload in events if event == "phase"}
+    assert streamed_ids == {phase["id"] for phase in roadmap["phases"]}
+    assert len(streamed_ids) == len(roadmap["phases"]) > 0
+
+
+def test_stream_endpoint_sends_phases_then_the_saved_roadmap(run, uncached):
+    async def scenario():
+        user = User(id=uuid.uuid4(), email="stream@example.com", name="stream")
+        async with AsyncSessionLocal() as db:
+            db.add(user)
+            await db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/roadmaps/generate/stream",
+                json={"job_description": JD * 3, "skill_level": "beginner"},
+                headers=headers,
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse_sse(response.text)
+        kinds = [event for event, _ in events]
+        assert kinds[0] == "phase"
+        assert kinds[-1] == "complete"
+        saved = events[-1][1]
+        # Fanout streams phases in completion order; the saved roadmap keeps outline order
+        assert sorted(p["id"] for e, p in events if e == "phase") == sorted(p["id"] for p in saved["phases"])
+
+        async with AsyncSessionLocal() as db:
+            roadmap = await db.get(Roadmap, uuid.UUID(saved["id"]))
+            assert roadmap.user_id == user.id
+            assert len(roadmap.phases) == len(saved["phases"])
+
+    run(scenario())
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call(run):
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"phases": [{"name": "Basics"}]}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("roadmap", "key", fetch) for _ in range(5)))
+
+    results = run(scenario())
+
+    assert calls == 1
+    assert all(r == {"phases": [{"name": "Basics"}]} for r in results)
+    # Every caller, the leader included, gets its own copy
+    results[0]["phases"].append({"name": "Mutated"})
+    assert all(len(r["phases"]) == 1 for r in results[1:])
+    assert flight.stats()["by_function"]["roadmap"] == {"calls": 5, "executed": 1, "collapsed": 4}
+
+
+def test_different_keys_run_separately(run):
+    flight = SingleFlight()
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do("roadmap", "a", lambda: asyncio.sleep(0.01, result="a")),
+            flight.do("roadmap", "b", lambda: asyncio.sleep(0.01, result="b")),
+        )
+
+    assert run(scenario()) == ["a", "b"]
+    assert flight.stats()["total_collapsed"] == 0
+
+
+def test_failure_reaches_every_caller_and_is_not_kept(run):
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("ns", "k", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await flight.do("ns", "k", failing)
+
+    run(scenario())
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call(run):
+    flight = SingleFlight()
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("ns", "k", slow))
+        await started.wait()
+        second = asyncio.create_task(flight.do("ns", "k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run(scenario()) == "done"
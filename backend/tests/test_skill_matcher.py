@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.resource_service_v2 import get_skill_category
+from app.services.skill_matcher import SkillMatcher
+
+ALIASES = [
+    ("aws", "cloud"),
+    ("amazon web services", "cloud"),
+    ("react", "react"),
+    ("react hooks", "react_advanced"),
+    ("node.js", "node"),
+    ("js", "javascript"),
+    ("c", "c"),
+    ("c++", "cpp"),
+    ("es6", "javascript"),
+    ("api", "api"),
+    ("distributed systems", "systems"),
+]
+
+
+@pytest.fixture
+def matcher() -> SkillMatcher:
+    return SkillMatcher(ALIASES)
+
+
+def test_longest_alias_wins_overlaps(matcher):
+    text = "Amazon Web Services and React Hooks experience"
+    assert [(m.alias, m.value) for m in matcher.find_all(text)] == [
+        ("amazon web services", "cloud"),
+        ("react hooks", "react_advanced"),
+    ]
+
+
+def test_only_whole_words_match(matcher):
+    assert [m.alias for m in matcher.find_all("Node.js, C++ and C; reactive js.")] == ["node.js", "c++", "c", "js"]
+    assert matcher.find_all("cs majors only") == []
+
+
+def test_version_floor_and_plural_suffixes(matcher):
+    assert [m.alias for m in matcher.find_all("ES6+ features, REST APIs")] == ["es6", "api"]
+    assert matcher.lookup("c++") == "cpp"
+
+
+def test_lookup_falls_back_to_contained_alias_then_fragment(matcher):
+    assert matcher.lookup("  Advanced REACT   hooks ") == "react_advanced"
+    assert matcher.lookup("distributed") == "systems"
+    assert matcher.lookup("rust") is None
+    matcher.lookup("rust")
+    assert matcher.lookup.cache_info().hits >= 1
+
+
+def test_resource_categories_use_the_compiled_matcher():
+    assert get_skill_category("Python") is not None
+    assert get_skill_category("Advanced Python programming") == get_skill_category("Python")
+    assert get_skill_category("") is None
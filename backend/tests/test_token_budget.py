@@ -0,0 +1,57 @@
+from app.services.token_budget import (
+    TokenBudgeter,
+    compact_json,
+    count_message_tokens,
+    count_tokens,
+    truncate_text,
+)
+
+
+def _turns(n: int) -> list:
+    history = []
+    for i in range(n):
+        history.append({"role": "user", "content": f"Question {i} about topic {i}. " + "detail " * 60})
+        history.append({"role": "assistant", "content": f"Answer {i}. " + "explanation " * 60})
+    return history
+
+
+def test_compact_json_drops_empty_fields_but_keeps_falsy_values():
+    data = {"name": "SQL", "notes": "", "tags": [], "meta": {"source": None}, "hours": 0, "done": False}
+    assert compact_json(data) == '{"name":"SQL","hours":0,"done":false}'
+
+
+def test_truncated_text_keeps_head_and_tail_within_budget():
+    text = "HEAD requirements. " + "filler line of text\n" * 500 + "TAIL closing details."
+    fitted = truncate_text(text, 200)
+
+    assert fitted.startswith("HEAD")
+    assert fitted.endswith("TAIL closing details.")
+    assert "tokens omitted" in fitted
+    assert count_tokens(fitted) <= 200 * 1.1
+    assert truncate_text("short", 200) == "short"
+
+
+def test_chat_fits_budget_keeping_newest_turns_and_summarizing_the_rest():
+    budgeter = TokenBudgeter()
+    history = _turns(10)
+
+    messages = budgeter.fit_chat("chat", "You are a mentor.", history, "What next?", max_tokens=600)
+
+    assert count_message_tokens(messages) <= 600
+    assert messages[0]["role"] == "system" and messages[-1] == {"role": "user", "content": "What next?"}
+    kept = messages[1:-1]
+    assert kept and kept == history[-len(kept):]
+    # Dropped questions survive as a summary in the system prompt
+    assert "Earlier in this conversation the user asked about" in messages[0]["content"]
+    assert "Question 0 about topic 0." in messages[0]["content"]
+
+    stats = budgeter.stats()["by_feature"]["chat"]
+    assert stats["calls"] == 1
+    assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"] > 0
+
+
+def test_history_that_fits_is_passed_through_unchanged():
+    budgeter = TokenBudgeter()
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}]
+    messages = budgeter.fit_chat("chat", "You are a mentor.", history, "Thanks", max_tokens=1000)
+    assert messages == [{"role": "system", "content": "You are a mentor."}, *history, {"role": "user", "content": "Thanks"}]